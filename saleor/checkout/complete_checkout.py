@@ -37,6 +37,8 @@ from ..payment.utils import fetch_customer_id, store_customer_id
 from ..product.models import ProductTranslation, ProductVariantTranslation
 from ..warehouse.availability import check_stock_quantity_bulk
 from ..warehouse.management import allocate_stocks
+from ..warehouse.models import Reservation
+from ..warehouse.reservations import is_reservation_enabled
 from . import AddressType
 from .checkout_cleaner import clean_checkout_payment, clean_checkout_shipping
 from .models import Checkout
@@ -258,6 +260,7 @@ def _create_lines_for_order(
         quantities,
         checkout_info.channel.slug,
         additional_warehouse_lookup,
+        checkout=checkout_info.checkout,
     )
 
     return [
@@ -415,6 +418,10 @@ def _create_order(
 
     OrderLine.objects.bulk_create(order_lines)
 
+    if is_reservation_enabled():
+        # stock reserved for the checkout is allocated for the order instead
+        Reservation.objects.filter(checkout_line__checkout=checkout).delete()
+
     country_code = checkout_info.get_country()
     additional_warehouse_lookup = (
         checkout_info.delivery_method_info.get_warehouse_filter_lookup()
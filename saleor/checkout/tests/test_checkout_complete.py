@@ -2,6 +2,7 @@ from unittest import mock
 
 import pytest
 from django.contrib.auth.models import AnonymousUser
+from django.db.models import Sum
 from django.test import override_settings
 
 from ...account import CustomerEvents
@@ -15,6 +16,7 @@ from ...order.notifications import get_default_order_payload
 from ...plugins.manager import get_plugins_manager
 from ...product.models import ProductTranslation, ProductVariantTranslation
 from ...tests.utils import flush_post_commit_hooks
+from ...warehouse.models import Reservation
 from .. import calculations
 from ..complete_checkout import _create_order, _prepare_order_data
 from ..fetch import fetch_checkout_info, fetch_checkout_lines
@@ -589,6 +591,40 @@ def test_create_order_doesnt_duplicate_order(
     assert order_1.pk == order_2.pk
 
 
+@override_settings(RESERVE_STOCK_DURATION=5)
+def test_create_order_with_reservations(
+    checkout_line_with_reservation_in_many_stocks, customer_user, shipping_method
+):
+    checkout_line = checkout_line_with_reservation_in_many_stocks
+    checkout_line.quantity = 7
+    checkout_line.save(update_fields=["quantity"])
+    checkout = checkout_line.checkout
+    checkout.billing_address = customer_user.default_billing_address
+    checkout.shipping_address = customer_user.default_billing_address
+    checkout.shipping_method = shipping_method
+    checkout.save()
+
+    manager = get_plugins_manager()
+    lines = fetch_checkout_lines(checkout)
+    checkout_info = fetch_checkout_info(checkout, lines, [], manager)
+    order_data = _prepare_order_data(
+        manager=manager, checkout_info=checkout_info, lines=lines, discounts=None
+    )
+    order = _create_order(
+        checkout_info=checkout_info,
+        order_data=order_data,
+        user=customer_user,
+        app=None,
+        manager=manager,
+    )
+
+    order_line = order.lines.get()
+    assert order_line.allocations.aggregate(Sum("quantity_allocated")) == {
+        "quantity_allocated__sum": 7
+    }
+    assert not Reservation.objects.exists()
+
+
 @pytest.mark.parametrize("is_anonymous_user", (True, False))
 def test_create_order_with_gift_card(
     checkout_with_gift_card, customer_user, shipping_method, is_anonymous_user
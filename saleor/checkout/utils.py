@@ -9,6 +9,7 @@ from prices import Money
 from ..account.models import User
 from ..core.exceptions import ProductNotPublished
 from ..core.taxes import zero_taxed_money
+from ..core.tracing import traced_atomic_transaction
 from ..core.utils.promo_code import (
     InvalidPromoCode,
     promo_code_is_gift_card,
@@ -29,6 +30,7 @@ from ..product import models as product_models
 from ..shipping.models import ShippingMethod
 from ..warehouse.availability import check_stock_quantity, check_stock_quantity_bulk
 from ..warehouse.models import Warehouse
+from ..warehouse.reservations import is_reservation_enabled, reserve_stocks
 from . import AddressType, calculations
 from .error_codes import CheckoutErrorCode
 from .fetch import (
@@ -72,7 +74,7 @@ def check_variant_in_stock(
 
     if new_quantity > 0 and check_quantity:
         check_stock_quantity(
-            variant, checkout.get_country(), channel_slug, new_quantity
+            variant, checkout.get_country(), channel_slug, new_quantity, checkout
         )
 
     return new_quantity, line
@@ -109,14 +111,21 @@ def add_variant_to_checkout(
     if line is None:
         line = checkout.lines.filter(variant=variant).first()
 
-    if new_quantity == 0:
-        if line is not None:
-            line.delete()
-    elif line is None:
-        checkout.lines.create(checkout=checkout, variant=variant, quantity=new_quantity)
-    elif new_quantity > 0:
-        line.quantity = new_quantity
-        line.save(update_fields=["quantity"])
+    with traced_atomic_transaction():
+        if new_quantity == 0:
+            if line is not None:
+                line.delete()
+                line = None
+        elif line is None:
+            line = checkout.lines.create(
+                checkout=checkout, variant=variant, quantity=new_quantity
+            )
+        elif new_quantity > 0:
+            line.quantity = new_quantity
+            line.save(update_fields=["quantity"])
+
+        if line is not None and is_reservation_enabled():
+            reserve_stocks([line], checkout.get_country(), checkout_info.channel.slug)
 
     return checkout
 
@@ -133,12 +142,16 @@ def add_variants_to_checkout(
     If a variant is not placed in checkout, a new checkout line will be created.
     If quantity is set to 0, checkout line will be deleted.
     Otherwise, quantity will be added or replaced (if replace argument is True).
+    When stock reservations are enabled, quantity of the added and updated lines
+    is reserved.
     """
 
     # check quantities
     country_code = checkout.get_country()
     if not skip_stock_check:
-        check_stock_quantity_bulk(variants, country_code, quantities, channel_slug)
+        check_stock_quantity_bulk(
+            variants, country_code, quantities, channel_slug, checkout=checkout
+        )
 
     channel_listings = product_models.ProductChannelListing.objects.filter(
         channel_id=checkout.channel.id,
@@ -171,12 +184,15 @@ def add_variants_to_checkout(
             to_create.append(
                 CheckoutLine(checkout=checkout, variant=variant, quantity=quantity)
             )
-    if to_delete:
-        CheckoutLine.objects.filter(pk__in=[line.pk for line in to_delete]).delete()
-    if to_update:
-        CheckoutLine.objects.bulk_update(to_update, ["quantity"])
-    if to_create:
-        CheckoutLine.objects.bulk_create(to_create)
+    with traced_atomic_transaction():
+        if to_delete:
+            CheckoutLine.objects.filter(pk__in=[line.pk for line in to_delete]).delete()
+        if to_update:
+            CheckoutLine.objects.bulk_update(to_update, ["quantity"])
+        if to_create:
+            CheckoutLine.objects.bulk_create(to_create)
+        if is_reservation_enabled():
+            reserve_stocks(to_update + to_create, country_code, channel_slug)
     return checkout
 
 
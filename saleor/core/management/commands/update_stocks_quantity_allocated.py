@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from ....warehouse.management import recalculate_stocks_quantity_allocated
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalculates the allocated quantity of stocks from their allocations "
+        "and fixes the stocks which are out of sync."
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Updating "quantity_allocated" field of all the stocks.')
+        count = recalculate_stocks_quantity_allocated()
+        self.stdout.write(f"Updated {count} stocks.")
@@ -134,6 +134,26 @@ def test_create_address(db):
     assert Address.objects.all().count() == 1
 
 
+@patch("saleor.core.utils.random_data.random.randrange", Mock(return_value=0))
+@patch("saleor.core.utils.random_data.random.choice", Mock(return_value=True))
+def test_create_fulfillments_decreases_stocks_quantity_allocated(order_with_lines):
+    # given
+    order = order_with_lines
+    stocks = [line.allocations.get().stock for line in order.lines.all()]
+    quantities_allocated = [stock.quantity_allocated for stock in stocks]
+
+    # when
+    random_data.create_fulfillments(order)
+
+    # then
+    for stock, quantity_allocated in zip(stocks, quantities_allocated):
+        stock.refresh_from_db()
+        assert stock.quantity_allocated == quantity_allocated - 1
+        assert stock.quantity_allocated == sum(
+            allocation.quantity_allocated for allocation in stock.allocations.all()
+        )
+
+
 def test_create_fake_order(db, monkeypatch, image, media_root, warehouse):
     # Tests shouldn't depend on images present in placeholder folder
     monkeypatch.setattr(
@@ -83,7 +83,7 @@ from ...shipping.models import (
     ShippingZone,
 )
 from ...warehouse import WarehouseClickAndCollectOption
-from ...warehouse.management import increase_stock
+from ...warehouse.management import increase_stock, update_stocks_quantity_allocated
 from ...warehouse.models import Stock, Warehouse
 
 fake = Factory.create()
@@ -661,6 +661,7 @@ def create_fulfillments(order):
 
             allocation.quantity_allocated = F("quantity_allocated") - quantity
             allocation.save(update_fields=["quantity_allocated"])
+            update_stocks_quantity_allocated({allocation.stock_id: -quantity})
 
     update_order_status(order)
 
@@ -24,6 +24,32 @@ class ExportEvents:
     ]
 
 
+class ImportEvents:
+    """The different csv import events types."""
+
+    IMPORT_PENDING = "import_pending"
+    IMPORT_PROGRESS = "import_progress"
+    IMPORT_SUCCESS = "import_success"
+    IMPORT_FAILED = "import_failed"
+
+    CHOICES = [
+        (IMPORT_PENDING, "Data import was started."),
+        (IMPORT_PROGRESS, "Batch of imported rows was processed."),
+        (IMPORT_SUCCESS, "Data import was completed successfully."),
+        (IMPORT_FAILED, "Data import failed."),
+    ]
+
+
+class ImportTypes:
+    PRODUCT_MAX_MIN = "product_max_min"
+    PRODUCT_CLASS_RECOMMENDATION = "product_class_recommendation"
+
+    CHOICES = [
+        (PRODUCT_MAX_MIN, "Product max and min levels."),
+        (PRODUCT_CLASS_RECOMMENDATION, "Product class recommendations."),
+    ]
+
+
 class FileTypes:
     CSV = "csv"
     XLSX = "xlsx"
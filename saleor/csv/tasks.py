@@ -3,9 +3,10 @@ from typing import Dict, Union
 from ..celeryconf import app
 from ..core import JobStatus
 from . import events
-from .models import ExportFile
+from .models import ExportFile, ImportFile
 from .notifications import send_export_failed_info
 from .utils.export import export_products, export_products_max_min
+from .utils.imports import IMPORT_HANDLERS
 
 
 def on_task_failure(self, exc, task_id, args, kwargs, einfo):
@@ -60,3 +61,37 @@ def export_products_max_min_task(
 ):
     export_file = ExportFile.objects.get(pk=export_file_id)
     export_products_max_min(export_file, scope, export_info, file_type, delimiter)
+
+
+def on_import_task_failure(self, exc, task_id, args, kwargs, einfo):
+    import_file_id = args[0]
+    import_file = ImportFile.objects.get(pk=import_file_id)
+
+    import_file.status = JobStatus.FAILED
+    import_file.message = str(exc)[:255]
+    import_file.save(update_fields=["status", "message", "updated_at"])
+
+    events.import_failed_event(
+        import_file=import_file,
+        user=import_file.user,
+        app=import_file.app,
+        message=str(exc),
+        error_type=str(einfo.type),
+    )
+
+
+def on_import_task_success(self, retval, task_id, args, kwargs):
+    import_file_id = args[0]
+
+    import_file = ImportFile.objects.get(pk=import_file_id)
+    import_file.status = JobStatus.SUCCESS
+    import_file.save(update_fields=["status", "updated_at"])
+    events.import_success_event(
+        import_file=import_file, user=import_file.user, app=import_file.app
+    )
+
+
+@app.task(on_success=on_import_task_success, on_failure=on_import_task_failure)
+def import_file_task(import_file_id: int, delimiter: str = ";"):
+    import_file = ImportFile.objects.get(pk=import_file_id)
+    IMPORT_HANDLERS[import_file.type](import_file, delimiter)
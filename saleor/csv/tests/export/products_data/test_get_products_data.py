@@ -7,10 +7,11 @@ from .....attribute.models import Attribute, AttributeValue
 from .....attribute.utils import associate_attribute_values_to_instance
 from .....channel.models import Channel
 from .....product.models import Product, ProductVariant, VariantMedia
+from .....product_max_min.models import ProductMaxMin
 from .....warehouse.models import Warehouse
 from ....utils import ProductExportFields, product_max_min
 from ....utils.export import get_product_max_min_queryset
-from ....utils.products_data import get_products_data
+from ....utils.products_data import get_products_attributes_data, get_products_data
 from .utils import (
     add_channel_to_expected_product_data,
     add_channel_to_expected_variant_data,
@@ -425,17 +426,38 @@ def test_get_products_max_min_data(
         },
     }
     # then
-    queryset, previous_products_max_min = get_product_max_min_queryset(data)
-    export_data = product_max_min.prepare_data_for_export(
-        queryset, previous_products_max_min
-    )
+    queryset = get_product_max_min_queryset(data)
+    export_data = product_max_min.prepare_data_for_export(queryset)
     # when
+    products_max_min = ProductMaxMin.objects.all().order_by("-created_at")
     export_data = export_data[0]
     assert export_data["channel_slug"] == "main"
     assert export_data["channel_name"] == "Main Channel"
     assert export_data["variant_sku"] == "SKU_A"
     assert export_data["product_name"] == "Test product"
-    assert int(export_data["previous_min_level"]) == 3
-    assert int(export_data["previous_max_level"]) == 9
-    assert int(export_data["current_min_level"]) == 4
-    assert int(export_data["current_max_level"]) == 10
+    assert export_data["previous_min_level"] == products_max_min[1].min_level
+    assert export_data["previous_max_level"] == products_max_min[1].max_level
+    assert export_data["current_min_level"] == products_max_min[0].min_level
+    assert export_data["current_max_level"] == products_max_min[0].max_level
+
+
+def test_get_products_attributes_data(
+    product, product_with_image, django_assert_num_queries
+):
+    # given
+    product_ids = {product.pk, product_with_image.pk}
+    attribute = product.attributes.get().assignment.attribute
+
+    # when
+    with django_assert_num_queries(1):
+        result_data = get_products_attributes_data(
+            product_ids, [attribute.slug, "missing-slug"], ["input_type", "unit"]
+        )
+
+    # then
+    assert result_data[product.pk] == {
+        attribute.slug: {"input_type": attribute.input_type, "unit": attribute.unit}
+    }
+    for product_id, attributes_data in result_data.items():
+        assert product_id in product_ids
+        assert set(attributes_data) <= {attribute.slug}
@@ -14,13 +14,17 @@ from freezegun import freeze_time
 from ....core import JobStatus
 from ....graphql.csv.enums import ProductFieldEnum
 from ....product.models import Product, ProductChannelListing
+from ....product_max_min.models import ProductMaxMin
 from ... import FileTypes
+from ...utils import product_max_min
 from ...utils.export import (
     append_to_file,
     create_file_with_headers,
     export_products,
     export_products_in_batches,
+    export_products_max_min_in_batches,
     get_filename,
+    get_product_max_min_queryset,
     get_product_queryset,
     parse_input,
     save_csv_file_in_export_file,
@@ -596,6 +600,55 @@ def test_export_products_in_batches_for_xlsx(
     shutil.rmtree(tmpdir)
 
 
+def test_export_products_max_min_in_batches_for_csv(
+    products_max_min, user_export_file, tmpdir, media_root
+):
+    # given
+    qs = get_product_max_min_queryset({"all": ""})
+    export_fields = ["variant_sku", "previous_min_level", "current_min_level"]
+
+    table = etl.wrap([export_fields])
+
+    temp_file = NamedTemporaryFile()
+    etl.tocsv(table, temp_file.name, delimiter=";")
+
+    # when
+    export_products_max_min_in_batches(qs, export_fields, ";", temp_file, FileTypes.CSV)
+
+    # then
+    current, previous = ProductMaxMin.objects.order_by("-created_at", "-pk")[:2]
+    file_content = temp_file.read().decode().split("\r\n")
+
+    assert ";".join(export_fields) in file_content
+    assert (
+        ";".join(
+            [
+                current.listing.variant.sku,
+                str(previous.min_level),
+                str(current.min_level),
+            ]
+        )
+        in file_content
+    )
+    assert len([row for row in file_content if row]) == 2
+
+    shutil.rmtree(tmpdir)
+
+
+def test_prepare_products_max_min_data_for_export_query_count(
+    products_max_min, django_assert_max_num_queries
+):
+    # given
+    qs = get_product_max_min_queryset({"all": ""})
+
+    # when
+    with django_assert_max_num_queries(3):
+        export_data = product_max_min.prepare_data_for_export(qs)
+
+    # then
+    assert len(export_data) == 1
+
+
 def test_parse_input():
     data = {
         "collections": None,
@@ -0,0 +1,168 @@
+import pytest
+from django.core.files.base import ContentFile
+from django.test import override_settings
+
+from ...core import JobStatus
+from ...product_class.models import (
+    ProductClassRecommendation,
+    ProductClassRecommendationCurrentPrevious,
+)
+from ...product_max_min.models import ProductMaxMin, ProductMaxMinCurrentPrevious
+from .. import ImportEvents, ImportTypes
+from ..models import ImportEvent, ImportFile
+from ..tasks import import_file_task
+from ..utils.imports import (
+    IMPORT_PRODUCT_CLASS_RECOMMENDATION_HEADERS,
+    IMPORT_PRODUCT_MAX_MIN_HEADERS,
+    check_headers,
+    get_table,
+)
+
+
+def create_import_file(user, import_type, headers, rows, name="import.csv"):
+    lines = [";".join(headers)] + [";".join(row) for row in rows]
+    import_file = ImportFile(user=user, type=import_type)
+    import_file.content_file.save(
+        name, ContentFile("\n".join(lines).encode("utf-8")), save=False
+    )
+    import_file.save()
+    return import_file
+
+
+def test_import_products_max_min(staff_user, channel_variant_metadata, media_root):
+    # given
+    slug = channel_variant_metadata.channel.slug
+    sku = channel_variant_metadata.variant.sku
+    import_file = create_import_file(
+        staff_user,
+        ImportTypes.PRODUCT_MAX_MIN,
+        IMPORT_PRODUCT_MAX_MIN_HEADERS.values(),
+        [
+            (slug, sku, "2", "8"),
+            (slug, "missing-sku", "2", "8"),
+            (slug, sku, "8", "2"),
+            (slug, sku, "-1", "abc"),
+        ],
+    )
+
+    # when
+    import_file_task(import_file.pk)
+
+    # then
+    import_file.refresh_from_db()
+    assert import_file.processed_rows == 4
+    assert import_file.imported_rows == 1
+    assert import_file.failed_rows == 3
+
+    product_max_min = ProductMaxMin.objects.get()
+    assert product_max_min.listing_id == channel_variant_metadata.pk
+    assert product_max_min.min_level == 2
+    assert product_max_min.max_level == 8
+    assert product_max_min.created_by == staff_user
+    assert ProductMaxMinCurrentPrevious.objects.get().current == product_max_min
+
+    error_rows = import_file.error_file.read().decode("utf-8").splitlines()
+    assert error_rows[0].startswith("Row;Channel Slug;Variant SKU")
+    assert [row.split(";")[0] for row in error_rows[1:]] == ["3", "4", "5"]
+    assert "missing-sku" in error_rows[1]
+
+    event = ImportEvent.objects.get(type=ImportEvents.IMPORT_PROGRESS)
+    assert event.parameters == {
+        "processed_rows": 4,
+        "imported_rows": 1,
+        "failed_rows": 3,
+    }
+
+
+@override_settings(CSV_IMPORT_BATCH_SIZE=1)
+def test_import_products_max_min_in_batches(
+    staff_user, channel_variant_metadata, media_root
+):
+    # given
+    slug = channel_variant_metadata.channel.slug
+    sku = channel_variant_metadata.variant.sku
+    import_file = create_import_file(
+        staff_user,
+        ImportTypes.PRODUCT_MAX_MIN,
+        IMPORT_PRODUCT_MAX_MIN_HEADERS.values(),
+        [(slug, sku, "2", "8"), (slug, sku, "3", "9")],
+    )
+
+    # when
+    import_file_task(import_file.pk)
+
+    # then
+    import_file.refresh_from_db()
+    assert import_file.imported_rows == 2
+    assert not import_file.error_file
+    assert ImportEvent.objects.filter(type=ImportEvents.IMPORT_PROGRESS).count() == 2
+    pointer = ProductMaxMinCurrentPrevious.objects.get()
+    assert pointer.current.min_level == 3
+    assert pointer.previous.min_level == 2
+
+
+def test_import_product_class_recommendations(
+    staff_user, channel_variant_metadata, media_root
+):
+    # given
+    slug = channel_variant_metadata.channel.slug
+    sku = channel_variant_metadata.variant.sku
+    import_file = create_import_file(
+        staff_user,
+        ImportTypes.PRODUCT_CLASS_RECOMMENDATION,
+        IMPORT_PRODUCT_CLASS_RECOMMENDATION_HEADERS.values(),
+        [(slug, sku, "A", "B", "C"), ("", sku, "A", "B", "C")],
+    )
+
+    # when
+    import_file_task(import_file.pk)
+
+    # then
+    import_file.refresh_from_db()
+    assert import_file.imported_rows == 1
+    assert import_file.failed_rows == 1
+
+    product_class = ProductClassRecommendation.objects.get()
+    assert product_class.listing_id == channel_variant_metadata.pk
+    assert product_class.product_class_qty == "A"
+    assert product_class.product_class_value == "B"
+    assert product_class.product_class_recommendation == "C"
+    assert ProductClassRecommendationCurrentPrevious.objects.filter(
+        current=product_class
+    ).exists()
+
+
+def test_check_headers_missing_columns(tmpdir):
+    # given
+    file_path = tmpdir.join("import.csv")
+    file_path.write("Channel Slug;Variant SKU\nmain;SKU_A\n")
+    table = get_table(str(file_path), ";")
+
+    # when
+    with pytest.raises(ValueError) as e:
+        check_headers(table, IMPORT_PRODUCT_MAX_MIN_HEADERS)
+
+    # then
+    assert str(e.value) == (
+        "Missing columns in the imported file: Current Max Level, Current Min Level."
+    )
+
+
+def test_import_file_task_marks_job_as_successful(
+    staff_user, channel_variant_metadata, media_root
+):
+    # given
+    import_file = create_import_file(
+        staff_user,
+        ImportTypes.PRODUCT_MAX_MIN,
+        IMPORT_PRODUCT_MAX_MIN_HEADERS.values(),
+        [],
+    )
+
+    # when
+    import_file_task.delay(import_file.pk)
+
+    # then
+    import_file.refresh_from_db()
+    assert import_file.status == JobStatus.SUCCESS
+    assert ImportEvent.objects.filter(type=ImportEvents.IMPORT_SUCCESS).exists()
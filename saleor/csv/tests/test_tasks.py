@@ -5,9 +5,14 @@ import pytz
 from freezegun import freeze_time
 
 from ...core import JobStatus
-from .. import ExportEvents, FileTypes
-from ..models import ExportEvent
-from ..tasks import export_products_task, on_task_failure, on_task_success
+from .. import ExportEvents, FileTypes, ImportEvents, ImportTypes
+from ..models import ExportEvent, ImportEvent, ImportFile
+from ..tasks import (
+    export_products_task,
+    on_import_task_failure,
+    on_task_failure,
+    on_task_success,
+)
 
 
 @patch("saleor.csv.tasks.export_products")
@@ -131,3 +136,24 @@ def test_on_task_success(user_export_file):
         user=user_export_file.user,
         type=ExportEvents.EXPORT_SUCCESS,
     )
+
+
+def test_on_import_task_failure(staff_user):
+    # given
+    import_file = ImportFile.objects.create(
+        user=staff_user, type=ImportTypes.PRODUCT_MAX_MIN, content_file="test.csv"
+    )
+    exc = Exception("Missing columns in the imported file: Variant SKU.")
+    info = Mock(type="ValueError")
+
+    # when
+    on_import_task_failure(None, exc, "task_id", [import_file.pk], {}, info)
+
+    # then
+    import_file.refresh_from_db()
+    assert import_file.status == JobStatus.FAILED
+    assert import_file.message == str(exc)
+    event = ImportEvent.objects.get(
+        import_file=import_file, type=ImportEvents.IMPORT_FAILED
+    )
+    assert event.parameters == {"message": str(exc), "error_type": "ValueError"}
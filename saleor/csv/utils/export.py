@@ -58,29 +58,15 @@ def export_products(
     send_export_download_link_notification(export_file)
 
 
-def get_product_max_min_queryset(filters):
-    current_product_max_min_ids = []
-    previous_products_max_min = []
-    qs_group_partition = ProductMaxMin.objects.qs_group_partition()
-    for item in qs_group_partition:
-        if item.row_number > 2:
-            continue
-        if item.row_number == 1:
-            current_product_max_min_ids.append(item.id)
-        if item.row_number == 2:
-            previous_products_max_min.append(item)
-
-    queryset = ProductMaxMin.objects.qs_filter_current_previous().filter(
-        id__in=current_product_max_min_ids
-    )
-    ids = filters.get("ids")
-    filters = filters.get("filters")
-    if ids:
-        queryset = queryset.filter(pk__in=ids)
-    if filters:
-        queryset = ProductMaxMinFilter(data=filters, queryset=queryset).qs
+def get_product_max_min_queryset(scope: Dict[str, Union[str, dict]]) -> "QuerySet":
+    """Get current products max min queryset based on a scope."""
+    queryset = ProductMaxMin.objects.qs_current()
+    if "ids" in scope:
+        queryset = queryset.filter(pk__in=scope["ids"])
+    elif "filter" in scope:
+        queryset = ProductMaxMinFilter(data=scope["filter"], queryset=queryset).qs
 
-    return queryset.distinct().order_by("-created_at"), list(previous_products_max_min)
+    return queryset.distinct().order_by("pk")
 
 
 def product_max_min_filter_to_export_headers(export_info):
@@ -106,19 +92,14 @@ def export_products_max_min(
     delimiter: str = ";",
 ):
     file_name = get_filename("product_max_min", file_type)
-    queryset, previous_products_max_min = get_product_max_min_queryset(scope)
+    queryset = get_product_max_min_queryset(scope)
     export_fields, file_headers = product_max_min_filter_to_export_headers(export_info)
     temporary_file = create_file_with_headers(file_headers, delimiter, file_type)
-    export_data = product_max_min.prepare_data_for_export(
-        queryset, previous_products_max_min
-    )
-    append_to_file(
-        export_data,
-        export_fields,
-        temporary_file,
-        file_type,
-        delimiter,
+
+    export_products_max_min_in_batches(
+        queryset, export_fields, delimiter, temporary_file, file_type
     )
+
     save_csv_file_in_export_file(export_file, temporary_file, file_name)
     temporary_file.close()
 
@@ -225,6 +206,23 @@ def export_products_in_batches(
         append_to_file(export_data, headers, temporary_file, file_type, delimiter)
 
 
+def export_products_max_min_in_batches(
+    queryset: "QuerySet",
+    export_fields: List[str],
+    delimiter: str,
+    temporary_file: Any,
+    file_type: str,
+):
+    for batch_pks in queryset_in_batches(queryset):
+        product_max_min_batch = ProductMaxMin.objects.filter(pk__in=batch_pks).order_by(
+            "pk"
+        )
+
+        export_data = product_max_min.prepare_data_for_export(product_max_min_batch)
+
+        append_to_file(export_data, export_fields, temporary_file, file_type, delimiter)
+
+
 def create_file_with_headers(file_headers: List[str], delimiter: str, file_type: str):
     table = etl.wrap([file_headers])
 
@@ -0,0 +1,299 @@
+import os
+from tempfile import NamedTemporaryFile
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Tuple
+
+import petl as etl
+from django.conf import settings
+from django.db import transaction
+
+from ...product.models import ProductVariantChannelListing
+from ...product_class import ProductClassRecommendationStatus
+from ...product_class.models import ProductClassRecommendation
+from ...product_class.utils import update_product_classes_current_previous
+from ...product_max_min.models import ProductMaxMin
+from ...product_max_min.utils import update_products_max_min_current_previous
+from .. import FileTypes, ImportTypes
+from ..events import import_progress_event
+from .export import append_to_file, create_file_with_headers, get_filename
+from .product_max_min import EXPORT_PRODUCT_MAX_MIN_FIELDS
+
+if TYPE_CHECKING:
+    # flake8: noqa
+    from ..models import ImportFile
+
+
+# columns are matched by the headers used in the export file, so an exported
+# file can be edited and uploaded back
+IMPORT_PRODUCT_MAX_MIN_HEADERS = {
+    "channel_slug": EXPORT_PRODUCT_MAX_MIN_FIELDS["fields"]["channel_slug"],
+    "variant_sku": EXPORT_PRODUCT_MAX_MIN_FIELDS["fields"]["variant_sku"],
+    "min_level": EXPORT_PRODUCT_MAX_MIN_FIELDS["fields"]["current_min_level"],
+    "max_level": EXPORT_PRODUCT_MAX_MIN_FIELDS["fields"]["current_max_level"],
+}
+
+IMPORT_PRODUCT_CLASS_RECOMMENDATION_HEADERS = {
+    "channel_slug": EXPORT_PRODUCT_MAX_MIN_FIELDS["fields"]["channel_slug"],
+    "variant_sku": EXPORT_PRODUCT_MAX_MIN_FIELDS["fields"]["variant_sku"],
+    "product_class_qty": "Product Class Qty",
+    "product_class_value": "Product Class Value",
+    "product_class_recommendation": "Product Class Recommendation",
+}
+
+PRODUCT_CLASS_FIELD_MAX_LENGTH = 256
+
+Row = Tuple[int, Dict[str, str]]
+RowError = Tuple[int, Dict[str, str], str]
+
+
+def import_products_max_min(import_file: "ImportFile", delimiter: str = ";"):
+    import_file_in_batches(
+        import_file,
+        IMPORT_PRODUCT_MAX_MIN_HEADERS,
+        clean_products_max_min_rows,
+        save_products_max_min,
+        delimiter,
+    )
+
+
+def import_product_class_recommendations(
+    import_file: "ImportFile", delimiter: str = ";"
+):
+    import_file_in_batches(
+        import_file,
+        IMPORT_PRODUCT_CLASS_RECOMMENDATION_HEADERS,
+        clean_product_class_recommendation_rows,
+        save_product_class_recommendations,
+        delimiter,
+    )
+
+
+def import_file_in_batches(
+    import_file: "ImportFile",
+    headers: Dict[str, str],
+    clean_rows: Callable[[List[Row], "ImportFile"], Tuple[list, List[RowError]]],
+    save_instances: Callable[[list], None],
+    delimiter: str,
+):
+    """Import rows of the uploaded file in batches of `CSV_IMPORT_BATCH_SIZE`.
+
+    Each batch is validated with a constant number of queries and saved in its
+    own transaction. Rows that cannot be imported are written to an error
+    report, which is attached to the import file at the end.
+    """
+    content_file = copy_to_temporary_file(import_file)
+    table = get_table(content_file.name, delimiter)
+    check_headers(table, headers)
+
+    error_file = None
+    batch: List[Row] = []
+    rows = etl.dicts(table)
+    # the first row of the file holds the headers
+    for row_number, row in enumerate(rows, start=2):
+        batch.append(
+            (row_number, {field: clean_value(row[h]) for field, h in headers.items()})
+        )
+        if len(batch) < settings.CSV_IMPORT_BATCH_SIZE:
+            continue
+        error_file = import_batch(
+            import_file, batch, headers, clean_rows, save_instances, error_file
+        )
+        batch = []
+
+    if batch:
+        error_file = import_batch(
+            import_file, batch, headers, clean_rows, save_instances, error_file
+        )
+    content_file.close()
+
+    if error_file:
+        file_name = get_filename(f"{import_file.type}_errors", FileTypes.CSV)
+        import_file.error_file.save(file_name, error_file)
+        error_file.close()
+
+
+def import_batch(
+    import_file: "ImportFile",
+    batch: List[Row],
+    headers: Dict[str, str],
+    clean_rows: Callable[[List[Row], "ImportFile"], Tuple[list, List[RowError]]],
+    save_instances: Callable[[list], None],
+    error_file: Any,
+):
+    with transaction.atomic():
+        instances, errors = clean_rows(batch, import_file)
+        save_instances(instances)
+
+    if errors:
+        if not error_file:
+            error_file = create_file_with_headers(
+                ["Row", *headers.values(), "Errors"], ";", FileTypes.CSV
+            )
+        error_data = [
+            {"row": row_number, **row, "errors": message}
+            for row_number, row, message in errors
+        ]
+        append_to_file(
+            error_data, ["row", *headers.keys(), "errors"], error_file, "csv", ";"
+        )
+
+    import_file.processed_rows += len(batch)
+    import_file.imported_rows += len(instances)
+    import_file.failed_rows += len(errors)
+    import_file.save(
+        update_fields=["processed_rows", "imported_rows", "failed_rows", "updated_at"]
+    )
+    import_progress_event(
+        import_file=import_file,
+        user=import_file.user,
+        app=import_file.app,
+        processed_rows=import_file.processed_rows,
+        imported_rows=import_file.imported_rows,
+        failed_rows=import_file.failed_rows,
+    )
+    return error_file
+
+
+def copy_to_temporary_file(import_file: "ImportFile"):
+    """Copy uploaded file to a local one, as the storage may be remote."""
+    _, extension = os.path.splitext(import_file.content_file.name)
+    temporary_file = NamedTemporaryFile("wb+", suffix=extension)
+    for chunk in import_file.content_file.chunks():
+        temporary_file.write(chunk)
+    temporary_file.flush()
+    return temporary_file
+
+
+def get_table(file_name: str, delimiter: str):
+    if file_name.endswith(f".{FileTypes.XLSX}"):
+        return etl.io.xlsx.fromxlsx(file_name, read_only=True)
+    return etl.fromcsv(file_name, delimiter=delimiter, encoding="utf-8-sig")
+
+
+def check_headers(table, headers: Dict[str, str]):
+    missing_headers = set(headers.values()) - set(etl.header(table))
+    if missing_headers:
+        raise ValueError(
+            "Missing columns in the imported file: %s."
+            % ", ".join(sorted(missing_headers))
+        )
+
+
+def clean_value(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def get_listings_by_channel_and_sku(rows: List[Row]) -> Dict[Tuple[str, str], int]:
+    channel_slugs = {row["channel_slug"] for _, row in rows}
+    skus = {row["variant_sku"] for _, row in rows}
+    listings = ProductVariantChannelListing.objects.filter(
+        channel__slug__in=channel_slugs, variant__sku__in=skus
+    ).values_list("channel__slug", "variant__sku", "id")
+    return {(slug, sku): listing_id for slug, sku, listing_id in listings}
+
+
+def clean_listing_id(row: Dict[str, str], listings: Dict[Tuple[str, str], int]):
+    if not row["channel_slug"] or not row["variant_sku"]:
+        raise ValueError("Channel slug and variant SKU are required.")
+    listing_id = listings.get((row["channel_slug"], row["variant_sku"]))
+    if not listing_id:
+        raise ValueError(
+            "Variant %s is not available in channel %s."
+            % (row["variant_sku"], row["channel_slug"])
+        )
+    return listing_id
+
+
+def clean_level(value: str, header: str) -> int:
+    try:
+        level = float(value)
+    except ValueError:
+        level = -1
+    if level < 0 or not level.is_integer():
+        raise ValueError(f"{header} must be a positive integer.")
+    return int(level)
+
+
+def clean_products_max_min_rows(rows: List[Row], import_file: "ImportFile"):
+    listings = get_listings_by_channel_and_sku(rows)
+    instances, errors = [], []
+    for row_number, row in rows:
+        try:
+            listing_id = clean_listing_id(row, listings)
+            min_level = clean_level(
+                row["min_level"], IMPORT_PRODUCT_MAX_MIN_HEADERS["min_level"]
+            )
+            max_level = clean_level(
+                row["max_level"], IMPORT_PRODUCT_MAX_MIN_HEADERS["max_level"]
+            )
+            if max_level < min_level:
+                raise ValueError("The max level must larger than the min level.")
+        except ValueError as e:
+            errors.append((row_number, row, str(e)))
+            continue
+        instances.append(
+            ProductMaxMin(
+                listing_id=listing_id,
+                min_level=min_level,
+                max_level=max_level,
+                created_by=import_file.user,
+            )
+        )
+    return instances, errors
+
+
+def save_products_max_min(instances: List[ProductMaxMin]):
+    ProductMaxMin.objects.bulk_create(instances)
+    update_products_max_min_current_previous(
+        {instance.listing_id for instance in instances}
+    )
+
+
+def clean_product_class_recommendation_rows(rows: List[Row], import_file: "ImportFile"):
+    listings = get_listings_by_channel_and_sku(rows)
+    fields = [
+        "product_class_qty",
+        "product_class_value",
+        "product_class_recommendation",
+    ]
+    instances, errors = [], []
+    for row_number, row in rows:
+        try:
+            listing_id = clean_listing_id(row, listings)
+            for field in fields:
+                if len(row[field]) > PRODUCT_CLASS_FIELD_MAX_LENGTH:
+                    raise ValueError(
+                        "%s must have at most %s characters."
+                        % (
+                            IMPORT_PRODUCT_CLASS_RECOMMENDATION_HEADERS[field],
+                            PRODUCT_CLASS_FIELD_MAX_LENGTH,
+                        )
+                    )
+        except ValueError as e:
+            errors.append((row_number, row, str(e)))
+            continue
+        instances.append(
+            ProductClassRecommendation(
+                listing_id=listing_id,
+                status=ProductClassRecommendationStatus.DRAFT,
+                created_by=import_file.user,
+                **{field: row[field] or None for field in fields},
+            )
+        )
+    return instances, errors
+
+
+def save_product_class_recommendations(instances: List[ProductClassRecommendation]):
+    ProductClassRecommendation.objects.bulk_create(instances)
+    update_product_classes_current_previous(
+        {instance.listing_id for instance in instances}
+    )
+
+
+IMPORT_HANDLERS = {
+    ImportTypes.PRODUCT_MAX_MIN: import_products_max_min,
+    ImportTypes.PRODUCT_CLASS_RECOMMENDATION: import_product_class_recommendations,
+}
@@ -1,9 +1,11 @@
 import json
 
-from saleor.graphql.product.constants import (
+from ...graphql.product.constants import (
     PRODUCT_ATTRIBUTE_ITEM_TYPE,
     PRODUCT_ATTRIBUTE_SELLING_UNIT,
 )
+from ...product_max_min.models import ProductMaxMin
+from .products_data import get_products_attributes_data
 
 EXPORT_PRODUCT_MAX_MIN_FIELDS = {
     "fields": {
@@ -23,36 +25,47 @@ EXPORT_PRODUCT_MAX_MIN_FIELDS = {
 }
 
 
-def prepare_data_for_export(queryset, previous_products_max_min):
-    data = []
-    for item in queryset:
-        data.append(prepare_data_for_one_row(item, previous_products_max_min))
+def prepare_data_for_export(queryset):
+    """Prepare export rows for a batch of current products max min.
 
-    return data
+    Related objects, previous levels and attribute values are fetched once for
+    the whole batch, so the number of queries does not depend on its size.
+    """
+    products_max_min = list(
+        queryset.select_related("listing__channel", "listing__variant__product")
+    )
+    listing_ids = {item.listing_id for item in products_max_min}
+    product_ids = {item.listing.variant.product_id for item in products_max_min}
+
+    previous_levels = get_previous_levels(listing_ids)
+    attributes_data = get_products_attributes_data(
+        product_ids,
+        [PRODUCT_ATTRIBUTE_SELLING_UNIT, PRODUCT_ATTRIBUTE_ITEM_TYPE],
+        ["unit", "entity_type"],
+    )
 
+    return [
+        prepare_data_for_one_row(item, previous_levels, attributes_data)
+        for item in products_max_min
+    ]
 
-def prepare_data_for_one_row(item, previous_products_max_min):
-    previous_min_level = 0
-    previous_max_level = 0
-    listing = item.listing
 
-    for product_max_min in previous_products_max_min:
-        if product_max_min.listing_id == item.listing_id:
-            previous_min_level = product_max_min.min_level
-            previous_max_level = product_max_min.max_level
-            break
+def prepare_data_for_one_row(item, previous_levels, attributes_data):
+    listing = item.listing
+    product_attributes = attributes_data.get(listing.variant.product_id, {})
+    selling_unit = product_attributes.get(PRODUCT_ATTRIBUTE_SELLING_UNIT, {})
+    item_type = product_attributes.get(PRODUCT_ATTRIBUTE_ITEM_TYPE, {})
+    previous_min_level, previous_max_level = previous_levels.get(
+        item.listing_id, (0, 0)
+    )
 
     obj = {
         "channel_slug": listing.channel.slug,
         "channel_name": listing.channel.name,
         "variant_sku": listing.variant.sku,
         "product_name": listing.variant.product.name,
-        "selling_unit": get_product_attribute_value(
-            listing.variant, "unit", PRODUCT_ATTRIBUTE_SELLING_UNIT
-        ),
-        "item_type": get_product_attribute_value(
-            listing.variant, "entity_type", PRODUCT_ATTRIBUTE_ITEM_TYPE
-        ),
+        "selling_unit": selling_unit.get("unit") or "",
+        "item_type": item_type.get("entity_type") or "",
         "current_product_class": get_product_class_metadata(
             listing.metadata, "current"
         ),
@@ -68,6 +81,19 @@ def prepare_data_for_one_row(item, previous_products_max_min):
     return obj
 
 
+def get_previous_levels(listing_ids):
+    """Return previous min and max levels indexed by listing id."""
+    previous_products_max_min = (
+        ProductMaxMin.objects.qs_previous()
+        .filter(listing_id__in=listing_ids)
+        .values_list("listing_id", "min_level", "max_level")
+    )
+    return {
+        listing_id: (min_level, max_level)
+        for listing_id, min_level, max_level in previous_products_max_min
+    }
+
+
 def get_product_class_metadata(metadata, type_content):
     product_class = metadata.get("product_class")
     if not product_class:
@@ -76,15 +102,3 @@ def get_product_class_metadata(metadata, type_content):
     if not data:
         return ""
     return json.dumps(data)
-
-
-def get_product_attribute_value(variant, field_attribute, attribute_key):
-    product = variant.product
-    attribute = (
-        product.attributes.values(field_attribute)
-        .filter(assignment__attribute__slug=attribute_key)
-        .first()
-    )
-    if not attribute:
-        return ""
-    return attribute[field_attribute]
@@ -10,6 +10,7 @@ from django.db.models import When
 from django.db.models.functions import Cast, Concat
 
 from ...attribute import AttributeInputType
+from ...attribute.models import AssignedProductAttribute
 from ...core.utils import build_absolute_uri
 from ...core.utils.editorjs import clean_editor_js
 from . import ProductExportFields
@@ -307,6 +308,26 @@ AttributeData = namedtuple(
 )
 
 
+def get_products_attributes_data(
+    product_ids: Set[int], attribute_slugs: List[str], fields: List[str]
+) -> Dict[int, Dict[str, dict]]:
+    """Return attribute fields of the given products in a single query.
+
+    The result is indexed by product id and attribute slug, e.g.
+    `{product_id: {"selling_unit_code": {"unit": "kg"}}}`. Products without
+    the attribute assigned are missing in the result.
+    """
+    lookups = [f"assignment__attribute__{field}" for field in fields]
+    assigned_attributes = AssignedProductAttribute.objects.filter(
+        product_id__in=product_ids, assignment__attribute__slug__in=attribute_slugs
+    ).values_list("product_id", "assignment__attribute__slug", *lookups)
+
+    result_data: Dict[int, Dict[str, dict]] = defaultdict(dict)
+    for product_id, slug, *values in assigned_attributes:
+        result_data[product_id][slug] = dict(zip(fields, values))
+    return result_data
+
+
 def handle_attribute_data(
     pk: int,
     data: dict,
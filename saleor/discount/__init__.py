@@ -1,5 +1,7 @@
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Dict, Iterable, List, Set, Union
+from functools import cached_property
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Union
 
 from django.conf import settings
 
@@ -7,6 +9,8 @@ if TYPE_CHECKING:
     # flake8: noqa
     from .models import Sale, SaleChannelListing, Voucher
 
+default_app_config = "saleor.discount.apps.DiscountAppConfig"
+
 
 class DiscountValueType:
     FIXED = "fixed"
@@ -43,3 +47,40 @@ class DiscountInfo:
     product_ids: Union[List[int], Set[int]]
     category_ids: Union[List[int], Set[int]]
     collection_ids: Union[List[int], Set[int]]
+
+
+class DiscountInfoList(list):
+    """List of discounts indexed by products, categories and collections on sale.
+
+    The index is pickled with the list, so it's built once for cached discounts.
+    """
+
+    @cached_property
+    def index(self) -> Dict[str, Dict[int, List[int]]]:
+        index: Dict[str, Dict[int, List[int]]] = {
+            "product": defaultdict(list),
+            "category": defaultdict(list),
+            "collection": defaultdict(list),
+        }
+        for position, discount in enumerate(self):
+            for product_id in discount.product_ids:
+                index["product"][product_id].append(position)
+            for category_id in discount.category_ids:
+                index["category"][category_id].append(position)
+            for collection_id in discount.collection_ids:
+                index["collection"][collection_id].append(position)
+        return {key: dict(positions) for key, positions in index.items()}
+
+    def for_product(
+        self,
+        product_id: int,
+        category_id: Optional[int],
+        collection_ids: Iterable[int],
+    ) -> List[DiscountInfo]:
+        """Return discounts of sales which include the product."""
+        positions = set(self.index["product"].get(product_id, []))
+        if category_id is not None:
+            positions.update(self.index["category"].get(category_id, []))
+        for collection_id in collection_ids:
+            positions.update(self.index["collection"].get(collection_id, []))
+        return [self[position] for position in sorted(positions)]
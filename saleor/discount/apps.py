@@ -0,0 +1,24 @@
+from django.apps import AppConfig
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+
+class DiscountAppConfig(AppConfig):
+    name = "saleor.discount"
+
+    def ready(self):
+        from .models import Sale, SaleChannelListing
+        from .signals import invalidate_discounts_cache_on_change
+
+        for sender in [Sale, SaleChannelListing]:
+            for name, signal in [("save", post_save), ("delete", post_delete)]:
+                signal.connect(
+                    invalidate_discounts_cache_on_change,
+                    sender=sender,
+                    dispatch_uid=f"invalidate_discounts_{name}_{sender.__name__}",
+                )
+        for field in ["products", "categories", "collections"]:
+            m2m_changed.connect(
+                invalidate_discounts_cache_on_change,
+                sender=getattr(Sale, field).through,
+                dispatch_uid=f"invalidate_discounts_sale_{field}",
+            )
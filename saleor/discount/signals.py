@@ -0,0 +1,10 @@
+from django.db import transaction
+
+from .utils import invalidate_discounts_cache
+
+
+def invalidate_discounts_cache_on_change(sender, instance, **kwargs):
+    # invalidate again after commit, as other processes could fetch the old
+    # discounts before the transaction was committed
+    invalidate_discounts_cache()
+    transaction.on_commit(invalidate_discounts_cache)
@@ -1,5 +1,6 @@
 from datetime import timedelta
 from decimal import Decimal
+from unittest.mock import patch
 
 import pytest
 from django.utils import timezone
@@ -9,7 +10,7 @@ from ...checkout.fetch import fetch_checkout_info, fetch_checkout_lines
 from ...checkout.utils import get_voucher_discount_for_checkout
 from ...plugins.manager import get_plugins_manager
 from ...product.models import Product, ProductVariant, ProductVariantChannelListing
-from .. import DiscountInfo, DiscountValueType, VoucherType
+from .. import DiscountInfo, DiscountInfoList, DiscountValueType, VoucherType
 from ..models import (
     NotApplicable,
     Sale,
@@ -22,7 +23,9 @@ from ..templatetags.voucher import discount_as_negative
 from ..utils import (
     add_voucher_usage_by_customer,
     decrease_voucher_usage,
+    fetch_discounts,
     get_product_discount_on_sale,
+    get_product_discounts,
     increase_voucher_usage,
     remove_voucher_usage_by_customer,
     validate_voucher,
@@ -631,3 +634,114 @@ def test_get_not_applicable_sale_discount(sale, channel_PLN):
 
     with pytest.raises(NotApplicable):
         sale.get_discount(None)
+
+
+def test_fetch_discounts_uses_cache(sale, product, django_assert_num_queries, settings):
+    settings.DISCOUNTS_CACHE_TIMEOUT = 60
+    date = timezone.now()
+    discounts = fetch_discounts(date)
+
+    with django_assert_num_queries(0):
+        cached_discounts = fetch_discounts(date + timedelta(hours=1))
+
+    assert [discount.sale for discount in cached_discounts] == [sale]
+    assert cached_discounts[0].product_ids == discounts[0].product_ids == {product.pk}
+
+
+def test_fetch_discounts_not_cached_by_default(sale, product):
+    date = timezone.now()
+    fetch_discounts(date)
+
+    with patch("saleor.discount.utils.cache") as cache_mock:
+        discounts = fetch_discounts(date)
+
+    cache_mock.get_many.assert_not_called()
+    cache_mock.set.assert_not_called()
+    assert [discount.sale for discount in discounts] == [sale]
+
+
+def test_fetch_discounts_invalidated_by_sale_changes(sale, product_list, settings):
+    settings.DISCOUNTS_CACHE_TIMEOUT = 60
+    date = timezone.now()
+    fetch_discounts(date)
+
+    sale.products.add(product_list[0])
+    discounts = fetch_discounts(date)
+    assert product_list[0].pk in discounts[0].product_ids
+
+    sale.channel_listings.all().delete()
+    discounts = fetch_discounts(date)
+    assert discounts[0].channel_listings == {}
+
+    sale.delete()
+    assert fetch_discounts(date) == []
+
+
+def test_fetch_discounts_cache_expires_when_sale_starts_or_ends(
+    sale, channel_USD, settings
+):
+    settings.DISCOUNTS_CACHE_TIMEOUT = 60
+    date = timezone.now()
+    sale.end_date = date + timedelta(days=1)
+    sale.save(update_fields=["end_date"])
+    next_sale = Sale.objects.create(
+        name="Next sale", start_date=date + timedelta(hours=1)
+    )
+    assert [discount.sale for discount in fetch_discounts(date)] == [sale]
+
+    discounts = fetch_discounts(date + timedelta(hours=2))
+    assert {discount.sale for discount in discounts} == {sale, next_sale}
+
+    discounts = fetch_discounts(date + timedelta(days=2))
+    assert [discount.sale for discount in discounts] == [next_sale]
+
+    assert [discount.sale for discount in fetch_discounts(date)] == [sale]
+
+
+def test_discount_info_list_for_product():
+    discounts = DiscountInfoList(
+        DiscountInfo(
+            sale=Sale(name=f"Sale {i}"),
+            channel_listings={},
+            product_ids=product_ids,
+            category_ids=category_ids,
+            collection_ids=collection_ids,
+        )
+        for i, (product_ids, category_ids, collection_ids) in enumerate(
+            [({1}, set(), set()), (set(), {10}, set()), ({1}, set(), {20, 21})]
+        )
+    )
+
+    assert discounts.for_product(1, None, []) == [discounts[0], discounts[2]]
+    assert discounts.for_product(2, 10, [21]) == [discounts[1], discounts[2]]
+    assert discounts.for_product(2, 11, [22]) == []
+
+
+def test_get_product_discounts_uses_discounts_index(
+    sale, product, collection, channel_USD
+):
+    discounts = fetch_discounts(timezone.now())
+    assert isinstance(discounts, DiscountInfoList)
+
+    prices = list(
+        get_product_discounts(
+            product=product,
+            collections=[collection],
+            discounts=discounts,
+            channel=channel_USD,
+        )
+    )
+    expected_prices = list(
+        get_product_discounts(
+            product=product,
+            collections=[collection],
+            discounts=list(discounts),
+            channel=channel_USD,
+        )
+    )
+
+    price = Money(20, "USD")
+    assert [discount(price) for discount in prices] == [
+        discount(price) for discount in expected_prices
+    ]
+    assert len(prices) == 1
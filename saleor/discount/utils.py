@@ -1,15 +1,18 @@
 import datetime
+import time
 from collections import defaultdict
 from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set
 
-from django.db.models import F
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Min, Q
 from django.utils import timezone
 from prices import Money, TaxedMoney
 
 from ..channel.models import Channel
 from ..checkout import calculations
 from ..core.taxes import zero_money
-from . import DiscountInfo
+from . import DiscountInfo, DiscountInfoList
 from .models import NotApplicable, Sale, SaleChannelListing, VoucherCustomer
 
 if TYPE_CHECKING:
@@ -21,6 +24,9 @@ if TYPE_CHECKING:
     from ..product.models import Collection, Product
     from .models import Voucher
 
+DISCOUNTS_CACHE_KEY = "discounts"
+DISCOUNTS_VERSION_CACHE_KEY = "discounts-version"
+
 
 def increase_voucher_usage(voucher: "Voucher") -> None:
     """Increase voucher uses by 1."""
@@ -78,6 +84,10 @@ def get_product_discounts(
 ) -> Money:
     """Return discount values for all discounts applicable to a product."""
     product_collections = set(pc.id for pc in collections)
+    if isinstance(discounts, DiscountInfoList):
+        discounts = discounts.for_product(
+            product.id, product.category_id, product_collections
+        )
     for discount in discounts or []:
         try:
             yield get_product_discount_on_sale(
@@ -236,7 +246,68 @@ def fetch_sale_channel_listings(
     return channel_listings_map
 
 
+def invalidate_discounts_cache():
+    """Make all processes fetch active discounts from the database."""
+    try:
+        cache.incr(DISCOUNTS_VERSION_CACHE_KEY)
+    except ValueError:
+        get_discounts_cache_version()
+
+
+def get_discounts_cache_version() -> int:
+    version = cache.get(DISCOUNTS_VERSION_CACHE_KEY)
+    if version is None:
+        # versions start from the current time, so a version evicted from the cache
+        # is not reused by discounts cached before
+        cache.add(DISCOUNTS_VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+        version = cache.get(DISCOUNTS_VERSION_CACHE_KEY)
+    return version
+
+
+def get_discounts_valid_until(date: datetime.date) -> Optional[datetime.date]:
+    """Return the date when the first sale starts or ends after the given date."""
+    boundaries = Sale.objects.aggregate(
+        next_start_date=Min("start_date", filter=Q(start_date__gt=date)),
+        next_end_date=Min("end_date", filter=Q(end_date__gte=date)),
+    )
+    dates = [value for value in boundaries.values() if value is not None]
+    return min(dates) if dates else None
+
+
 def fetch_discounts(date: datetime.date) -> List[DiscountInfo]:
+    """Return discounts of the sales active on the given date.
+
+    When `DISCOUNTS_CACHE_TIMEOUT` is set, discounts are cached until the first
+    sale starts or ends, and invalidated when sales are changed.
+    """
+    if not settings.DISCOUNTS_CACHE_TIMEOUT:
+        return fetch_discounts_from_db(date)
+
+    cached_values = cache.get_many([DISCOUNTS_CACHE_KEY, DISCOUNTS_VERSION_CACHE_KEY])
+    version = cached_values.get(DISCOUNTS_VERSION_CACHE_KEY)
+    if version is None:
+        version = get_discounts_cache_version()
+    if DISCOUNTS_CACHE_KEY in cached_values:
+        cached_version, valid_from, valid_until, discounts = cached_values[
+            DISCOUNTS_CACHE_KEY
+        ]
+        if (
+            cached_version == version
+            and valid_from <= date
+            and (valid_until is None or date < valid_until)
+        ):
+            return discounts
+
+    discounts = fetch_discounts_from_db(date)
+    cache.set(
+        DISCOUNTS_CACHE_KEY,
+        (version, date, get_discounts_valid_until(date), discounts),
+        settings.DISCOUNTS_CACHE_TIMEOUT,
+    )
+    return discounts
+
+
+def fetch_discounts_from_db(date: datetime.date) -> List[DiscountInfo]:
     sales = list(Sale.objects.active(date))
     pks = {s.pk for s in sales}
     collections = fetch_collections(pks)
@@ -244,7 +315,7 @@ def fetch_discounts(date: datetime.date) -> List[DiscountInfo]:
     products = fetch_products(pks)
     categories = fetch_categories(pks)
 
-    return [
+    discounts = DiscountInfoList(
         DiscountInfo(
             sale=sale,
             category_ids=categories[sale.pk],
@@ -253,7 +324,10 @@ def fetch_discounts(date: datetime.date) -> List[DiscountInfo]:
             product_ids=products[sale.pk],
         )
         for sale in sales
-    ]
+    )
+    # build the index before discounts are cached
+    discounts.index
+    return discounts
 
 
 def fetch_active_discounts() -> List[DiscountInfo]:
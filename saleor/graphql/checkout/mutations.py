@@ -118,7 +118,12 @@ def update_checkout_shipping_method_if_invalid(
 
 
 def check_lines_quantity(
-    variants, quantities, country, channel_slug, allow_zero_quantity=False
+    variants,
+    quantities,
+    country,
+    channel_slug,
+    allow_zero_quantity=False,
+    checkout=None,
 ):
     """Clean quantities and check if stock is sufficient for each checkout line.
 
@@ -126,6 +131,7 @@ def check_lines_quantity(
     but if this validation is used for updating existing checkout lines,
     allow_zero_quantities can be set to True
     and checkout lines with this quantity can be later removed.
+    Stock reserved by the given checkout is available for its lines.
     """
 
     for quantity in quantities:
@@ -160,7 +166,9 @@ def check_lines_quantity(
                 }
             )
     try:
-        check_stock_quantity_bulk(variants, country, quantities, channel_slug)
+        check_stock_quantity_bulk(
+            variants, country, quantities, channel_slug, checkout=checkout
+        )
     except InsufficientStock as e:
         errors = [
             ValidationError(
@@ -441,8 +449,12 @@ class CheckoutLinesAdd(BaseMutation):
         error_type_field = "checkout_errors"
 
     @classmethod
-    def validate_checkout_lines(cls, variants, quantities, country, channel_slug):
-        check_lines_quantity(variants, quantities, country, channel_slug)
+    def validate_checkout_lines(
+        cls, variants, quantities, country, channel_slug, checkout=None
+    ):
+        check_lines_quantity(
+            variants, quantities, country, channel_slug, checkout=checkout
+        )
 
     @classmethod
     def clean_input(
@@ -450,7 +462,7 @@ class CheckoutLinesAdd(BaseMutation):
     ):
         channel_slug = checkout_info.channel.slug
         cls.validate_checkout_lines(
-            variants, quantities, checkout.get_country(), channel_slug
+            variants, quantities, checkout.get_country(), channel_slug, checkout
         )
         variants_db_ids = {variant.id for variant in variants}
         validate_variants_available_for_purchase(variants_db_ids, checkout.channel_id)
@@ -470,6 +482,9 @@ class CheckoutLinesAdd(BaseMutation):
                     skip_stock_check=True,  # already checked by validate_checkout_lines
                     replace=replace,
                 )
+            except InsufficientStock as exc:
+                error = prepare_insufficient_stock_checkout_validation_error(exc)
+                raise ValidationError({"lines": error})
             except ProductNotPublished as exc:
                 raise ValidationError(
                     "Can't add unpublished product.",
@@ -546,9 +561,16 @@ class CheckoutLinesUpdate(CheckoutLinesAdd):
         error_type_field = "checkout_errors"
 
     @classmethod
-    def validate_checkout_lines(cls, variants, quantities, country, channel_slug):
+    def validate_checkout_lines(
+        cls, variants, quantities, country, channel_slug, checkout=None
+    ):
         check_lines_quantity(
-            variants, quantities, country, channel_slug, allow_zero_quantity=True
+            variants,
+            quantities,
+            country,
+            channel_slug,
+            allow_zero_quantity=True,
+            checkout=checkout,
         )
 
     @classmethod
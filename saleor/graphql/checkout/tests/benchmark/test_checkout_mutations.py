@@ -1,6 +1,7 @@
 from unittest.mock import patch
 
 import pytest
+from django.db.models import F
 from graphene import Node
 
 from .....checkout import calculations
@@ -956,7 +957,7 @@ def test_complete_checkout_with_out_of_stock_webhook(
     response = get_graphql_content(api_client.post_graphql(query, variables))
     assert not response["data"]["checkoutComplete"]["errors"]
     product_variant_out_of_stock_webhook_mock.assert_called_once_with(
-        Stock.objects.last()
+        Stock.objects.get(quantity_allocated=F("quantity"))
     )
 
 
@@ -4,6 +4,7 @@ from unittest import mock
 
 import graphene
 import pytest
+from django.test import override_settings
 
 from ....checkout.error_codes import CheckoutErrorCode
 from ....checkout.fetch import fetch_checkout_info, fetch_checkout_lines
@@ -371,6 +372,44 @@ def test_checkout_lines_add_check_lines_quantity(user_api_client, checkout, stoc
     assert data["errors"][0]["field"] == "quantity"
 
 
+@override_settings(RESERVE_STOCK_DURATION=5)
+def test_checkout_lines_add_reserves_stocks(user_api_client, checkout, stock):
+    variant = stock.product_variant
+    variant_id = graphene.Node.to_global_id("ProductVariant", variant.pk)
+
+    variables = {
+        "token": checkout.token,
+        "lines": [{"variantId": variant_id, "quantity": 3}],
+    }
+    response = user_api_client.post_graphql(MUTATION_CHECKOUT_LINES_ADD, variables)
+    content = get_graphql_content(response)
+    data = content["data"]["checkoutLinesAdd"]
+    assert not data["errors"]
+    reservation = checkout.lines.get().reservations.get()
+    assert reservation.stock == stock
+    assert reservation.quantity_reserved == 3
+
+
+@override_settings(RESERVE_STOCK_DURATION=5)
+def test_checkout_lines_add_with_other_checkout_reservations(
+    user_api_client, checkout, checkout_line_with_reservation_in_many_stocks
+):
+    variant = checkout_line_with_reservation_in_many_stocks.variant
+    variant_id = graphene.Node.to_global_id("ProductVariant", variant.pk)
+
+    variables = {
+        "token": checkout.token,
+        "lines": [{"variantId": variant_id, "quantity": 5}],
+    }
+    response = user_api_client.post_graphql(MUTATION_CHECKOUT_LINES_ADD, variables)
+    content = get_graphql_content(response)
+    data = content["data"]["checkoutLinesAdd"]
+    assert data["errors"][0]["message"] == (
+        f"Could not add items {variant}. Only 4 remaining in stock."
+    )
+    assert not checkout.lines.exists()
+
+
 def test_checkout_lines_invalid_variant_id(user_api_client, checkout, stock):
     variant = stock.product_variant
     variant_id = graphene.Node.to_global_id("ProductVariant", variant.pk)
@@ -595,6 +634,27 @@ def test_checkout_lines_update_check_lines_quantity(
     assert data["errors"][0]["field"] == "quantity"
 
 
+@override_settings(RESERVE_STOCK_DURATION=5)
+def test_checkout_lines_update_with_own_reservations(
+    user_api_client, checkout_line_with_reservation_in_many_stocks
+):
+    line = checkout_line_with_reservation_in_many_stocks
+    checkout = line.checkout
+    variant_id = graphene.Node.to_global_id("ProductVariant", line.variant.pk)
+
+    variables = {
+        "token": checkout.token,
+        "lines": [{"variantId": variant_id, "quantity": 7}],
+    }
+    response = user_api_client.post_graphql(MUTATION_CHECKOUT_LINES_UPDATE, variables)
+    content = get_graphql_content(response)
+
+    data = content["data"]["checkoutLinesUpdate"]
+    assert not data["errors"]
+    reservations = line.reservations.all()
+    assert sum(reservation.quantity_reserved for reservation in reservations) == 7
+
+
 def test_checkout_lines_update_with_chosen_shipping(
     user_api_client, checkout, stock, address, shipping_method
 ):
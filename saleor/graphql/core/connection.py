@@ -1,7 +1,12 @@
+import hashlib
 import json
-from typing import Any, Dict, Iterable, List, Tuple, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import graphene
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
 from django.db.models import Model as DjangoModel
 from django.db.models import Q, QuerySet
 from graphene.relay.connection import Connection
@@ -261,16 +266,81 @@ class NonNullConnection(Connection):
         )
 
 
+def get_cached_count(qs: QuerySet) -> int:
+    """Return the number of rows matching the queryset, cached by its SQL.
+
+    Querysets built from the same filters produce the same SQL, so a count
+    computed for one page is reused for next pages until the cache expires.
+    """
+    try:
+        sql, params = qs.query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    query_hash = hashlib.md5(f"{sql}{params}".encode("utf-8")).hexdigest()
+    key = f"connection-total-count-{query_hash}"
+    count = cache.get(key)
+    if count is None:
+        count = qs.count()
+        cache.set(key, count, settings.CONNECTION_TOTAL_COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def get_estimated_count(qs: QuerySet) -> Optional[int]:
+    """Return the number of rows matching the queryset estimated by the planner.
+
+    The estimate is based on table statistics, so it's returned only for large
+    results, for which an exact count would be expensive. None is returned for
+    smaller results, which should be counted exactly.
+    """
+    try:
+        sql, params = qs.order_by().query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    with connections[qs.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    estimate = int(plan[0]["Plan"]["Plan Rows"])
+    if estimate < settings.CONNECTION_APPROXIMATE_COUNT_THRESHOLD:
+        return None
+    return estimate
+
+
 class CountableConnection(NonNullConnection):
     class Meta:
         abstract = True
 
-    total_count = graphene.Int(description="A total count of items in the collection.")
+    total_count = graphene.Int(
+        cached=graphene.Boolean(
+            description=(
+                "Return a count computed for the same filters within the last "
+                "CONNECTION_TOTAL_COUNT_CACHE_TIMEOUT seconds instead of counting "
+                "the items again. The count may not include the latest changes."
+            ),
+            default_value=False,
+        ),
+        approximate=graphene.Boolean(
+            description=(
+                "Return the number of items estimated by the database when it "
+                "exceeds CONNECTION_APPROXIMATE_COUNT_THRESHOLD instead of counting "
+                "them. The estimate can differ from the exact count."
+            ),
+            default_value=False,
+        ),
+        description="A total count of items in the collection.",
+    )
 
     @staticmethod
-    def resolve_total_count(root, *_args, **_kwargs):
+    def resolve_total_count(root, *_args, cached=False, approximate=False, **_kwargs):
         if isinstance(root.iterable, list):
             return len(root.iterable)
+        if approximate:
+            estimated_count = get_estimated_count(root.iterable)
+            if estimated_count is not None:
+                return estimated_count
+        if cached:
+            return get_cached_count(root.iterable)
         return root.iterable.count()
 
 
@@ -1,3 +1,4 @@
+import time
 from typing import Generic, Iterable, List, TypeVar, Union
 
 import opentracing
@@ -38,7 +39,15 @@ class DataLoader(BaseLoader, Generic[K, R]):
         ) as scope:
             span = scope.span
             span.set_tag(opentracing.tags.COMPONENT, "dataloaders")
+            instrumentation = getattr(self.context, "instrumentation", None)
+            start = time.perf_counter()
             results = self.batch_load(keys)
+            if instrumentation is not None:
+                instrumentation.record_dataloader_batch(
+                    self.__class__.__name__,
+                    len(list(keys)),
+                    time.perf_counter() - start,
+                )
             if not isinstance(results, Promise):
                 return Promise.resolve(results)
             return results
@@ -2,6 +2,7 @@ import json
 from functools import partial
 
 import graphene
+from django.db.models import Exists, OuterRef
 from graphene.relay import PageInfo
 from graphene_django.fields import DjangoConnectionField
 from graphql.error import GraphQLError
@@ -9,8 +10,8 @@ from graphql_relay.connection.arrayconnection import connection_from_list_slice
 from promise import Promise
 
 from ...channel.exceptions import ChannelNotDefined, NoDefaultChannel
-from ...product_class.models import ProductClassRecommendation
-from ...product_max_min.models import ProductMaxMin
+from ...product_class import ProductClassCurrentPreviousType
+from ...product_class.models import ProductClassRecommendationCurrentPrevious
 from ..channel import ChannelContext, ChannelQsContext
 from ..channel.utils import get_default_channel_slug_or_graphql_error
 from ..product.utils import check_permission_product_class_approved
@@ -251,60 +252,16 @@ class ChannelContextFilterConnectionField(FilterInputConnectionField):
 
 class CurrentPreviousFilterConnectionField(FilterInputConnectionField):
     # Custom to filter both current and previous product class
-    # remove id in 1 obj current previous
+    # remove previous product class when current one of the listing is listed
     @classmethod
     def filter_iterable(cls, iterable, filterset_class, filters_name, info, **args):
-        group_data_by_listing = {}
         iterable = super().filter_iterable(
             iterable, filterset_class, filters_name, info, **args
         )
         list_status = check_permission_product_class_approved(info)
-        iterable_ids = [item.id for item in iterable]
-        product_classes = ProductClassRecommendation.objects.qs_group_current_previous(
-            order_by="created_at desc",
-            filter_row_number="<= 2",
-            list_status=list_status,
+        listed_previous = ProductClassRecommendationCurrentPrevious.objects.filter(
+            type=ProductClassCurrentPreviousType.from_statuses(list_status),
+            previous_id=OuterRef("pk"),
+            current_id__in=iterable.values("pk"),
         )
-        for item in product_classes:
-            if item.listing_id not in group_data_by_listing.keys():
-                group_data_by_listing[item.listing_id] = [item.id]
-            else:
-                group_data_by_listing[item.listing_id].append(item.id)
-
-        iterable_ids = remove_id_obj_current_previous(
-            group_data_by_listing, iterable_ids
-        )
-        iterable = iterable.filter(id__in=iterable_ids)
-        return iterable
-
-
-class CurrentPreviousProductMaxMinFilterConnectionField(FilterInputConnectionField):
-    # Custom to filter both current and previous product max min
-    # remove id in 1 obj current previous
-    @classmethod
-    def filter_iterable(cls, iterable, filterset_class, filters_name, info, **args):
-        iterable = super().filter_iterable(
-            iterable, filterset_class, filters_name, info, **args
-        )
-        iterable_ids = [item.id for item in iterable]
-        (
-            _,
-            group_data_by_listing,
-        ) = ProductMaxMin.objects.get_data_after_group_partition()
-        iterable_ids = remove_id_obj_current_previous(
-            group_data_by_listing, iterable_ids
-        )
-        iterable = iterable.filter(id__in=iterable_ids)
-        return iterable
-
-
-def remove_id_obj_current_previous(group_data_by_listing, iterable_ids):
-    for _, values in group_data_by_listing.items():
-        arr_tmp = []
-        if values[0] in iterable_ids:
-            arr_tmp.append(values[0])
-        if len(values) > 1 and values[1] in iterable_ids:
-            arr_tmp.append(values[1])
-        if len(arr_tmp) > 1:
-            iterable_ids.remove(values[1])
-    return iterable_ids
+        return iterable.filter(~Exists(listed_previous))
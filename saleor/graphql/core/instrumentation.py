@@ -0,0 +1,221 @@
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection
+
+from ...core.auth import get_token_from_request
+
+INSTRUMENTATION_HEADER = "HTTP_X_SALEOR_INSTRUMENTATION"
+
+# number of the slowest fields and data loaders returned in response extensions
+SUMMARY_SIZE = 20
+
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+SIZE_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class Histogram:
+    """Histogram of observed values, aggregated in memory of the process.
+
+    It's rendered in the Prometheus text format, so each worker process can be
+    scraped without additional dependencies.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Iterable[float],
+        label: Optional[str] = None,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.label = label
+        self._lock = threading.Lock()
+        self._values: Dict[str, Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, label_value: str = ""):
+        with self._lock:
+            counts, total, count = self._values.get(
+                label_value, ([0] * len(self.buckets), 0.0, 0)
+            )
+            for index, bucket in enumerate(self.buckets):
+                if value <= bucket:
+                    counts[index] += 1
+            self._values[label_value] = (counts, total + value, count + 1)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            values = sorted(self._values.items())
+        for label_value, (counts, total, count) in values:
+            labels = f'{self.label}="{label_value}",' if self.label else ""
+            for bucket, bucket_count in zip(self.buckets, counts):
+                lines.append(
+                    f'{self.name}_bucket{{{labels}le="{bucket}"}} {bucket_count}'
+                )
+            lines.append(f'{self.name}_bucket{{{labels}le="+Inf"}} {count}')
+            labels = f"{{{labels[:-1]}}}" if labels else ""
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+FIELD_DURATION = Histogram(
+    "saleor_graphql_field_duration_seconds",
+    "Time spent in resolvers of a field during a single operation.",
+    DURATION_BUCKETS,
+    label="field",
+)
+DATALOADER_BATCH_SIZE = Histogram(
+    "saleor_graphql_dataloader_batch_size",
+    "Number of keys loaded in a single batch of a data loader.",
+    SIZE_BUCKETS,
+    label="loader",
+)
+OPERATION_SQL_QUERIES = Histogram(
+    "saleor_graphql_operation_sql_queries",
+    "Number of SQL queries executed by a single operation.",
+    SIZE_BUCKETS,
+)
+OPERATION_SQL_DURATION = Histogram(
+    "saleor_graphql_operation_sql_duration_seconds",
+    "Time spent in SQL queries executed by a single operation.",
+    DURATION_BUCKETS,
+)
+METRICS = [
+    FIELD_DURATION,
+    DATALOADER_BATCH_SIZE,
+    OPERATION_SQL_QUERIES,
+    OPERATION_SQL_DURATION,
+]
+
+
+class OperationInstrumentation:
+    """Resolver, data loader and SQL statistics of a single operation."""
+
+    def __init__(self):
+        # field: [calls, duration]
+        self.fields: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])
+        self.dataloader_batch_sizes: Dict[str, List[int]] = defaultdict(list)
+        self.dataloader_durations: Dict[str, float] = defaultdict(float)
+        self.sql_queries = 0
+        self.sql_duration = 0.0
+
+    def record_field(self, field: str, duration: float):
+        stats = self.fields[field]
+        stats[0] += 1
+        stats[1] += duration
+
+    def record_dataloader_batch(self, loader: str, size: int, duration: float):
+        self.dataloader_batch_sizes[loader].append(size)
+        self.dataloader_durations[loader] += duration
+
+    def sql_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_queries += 1
+            self.sql_duration += time.perf_counter() - start
+
+    def export_metrics(self):
+        for field, (_, duration) in self.fields.items():
+            FIELD_DURATION.observe(duration, field)
+        for loader, sizes in self.dataloader_batch_sizes.items():
+            for size in sizes:
+                DATALOADER_BATCH_SIZE.observe(size, loader)
+        OPERATION_SQL_QUERIES.observe(self.sql_queries)
+        OPERATION_SQL_DURATION.observe(self.sql_duration)
+
+    def get_summary(self) -> dict:
+        fields = sorted(self.fields.items(), key=lambda item: -item[1][1])
+        dataloaders = sorted(
+            self.dataloader_durations.items(), key=lambda item: -item[1]
+        )
+        return {
+            "sql": {
+                "queries": self.sql_queries,
+                "duration": round(self.sql_duration, 6),
+            },
+            "fields": [
+                {"field": field, "calls": calls, "duration": round(duration, 6)}
+                for field, (calls, duration) in fields[:SUMMARY_SIZE]
+            ],
+            "dataloaders": [
+                {
+                    "loader": loader,
+                    "batches": len(self.dataloader_batch_sizes[loader]),
+                    "keys": sum(self.dataloader_batch_sizes[loader]),
+                    "duration": round(duration, 6),
+                }
+                for loader, duration in dataloaders[:SUMMARY_SIZE]
+            ],
+        }
+
+
+def is_summary_requested(request) -> bool:
+    """Check if the requestor asked for the instrumentation summary.
+
+    The summary is returned only to staff users, which has to be checked after
+    the operation is executed and the user is authenticated.
+    """
+    return bool(
+        request.META.get(INSTRUMENTATION_HEADER) and get_token_from_request(request)
+    )
+
+
+@contextmanager
+def instrument_operation(request):
+    """Collect statistics of the operation executed in the context.
+
+    Statistics are exported to the metrics of the process when the operation is
+    finished. Yields None when the instrumentation is disabled.
+    """
+    if not settings.GRAPHQL_INSTRUMENTATION:
+        yield None
+        return
+
+    instrumentation = OperationInstrumentation()
+    request.instrumentation = instrumentation
+    try:
+        with connection.execute_wrapper(instrumentation.sql_wrapper):
+            yield instrumentation
+    finally:
+        del request.instrumentation
+    instrumentation.export_metrics()
+
+
+class InstrumentationMiddleware:
+    """Record time spent in resolvers of the instrumented operation."""
+
+    def resolve(self, next_, root, info, **kwargs):
+        instrumentation = getattr(info.context, "instrumentation", None)
+        if instrumentation is None:
+            return next_(root, info, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            return next_(root, info, **kwargs)
+        finally:
+            instrumentation.record_field(
+                f"{info.parent_type.name}.{info.field_name}",
+                time.perf_counter() - start,
+            )
+
+
+def render_metrics() -> str:
+    lines = [line for metric in METRICS for line in metric.render()]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,179 @@
+from typing import Any, Dict, Optional, Set
+
+from graphql.language import ast
+from graphql.type.definition import get_named_type
+
+# Cost of resolving a field, by "<Type>.<field>". Fields which are not listed
+# cost 1 when they return an object and nothing when they return a scalar.
+FIELD_COSTS = {
+    "Checkout.availableCollectionPoints": 5,
+    "Checkout.availablePaymentGateways": 5,
+    "Checkout.availableShippingMethods": 5,
+    "Product.attributes": 2,
+    "Product.isAvailable": 2,
+    "Product.pricing": 5,
+    "Product.variants": 2,
+    "ProductVariant.attributes": 2,
+    "ProductVariant.pricing": 5,
+    "ProductVariant.quantityAvailable": 2,
+    "ProductVariant.stocks": 2,
+}
+
+PAGINATION_ARGUMENTS = ["first", "last"]
+
+
+def calculate_query_cost(
+    schema,
+    document_ast: ast.Document,
+    variables: Optional[Dict[str, Any]] = None,
+    operation_name: Optional[str] = None,
+) -> int:
+    """Return the estimated cost of executing the operation of a document.
+
+    The cost of a field is its weight plus the cost of its selections,
+    multiplied by the number of requested items when `first` or `last` is
+    given. Introspection fields are not counted.
+    """
+    operation = get_operation(document_ast, operation_name)
+    if operation is None:
+        return 0
+
+    root_type = {
+        "query": schema.get_query_type,
+        "mutation": schema.get_mutation_type,
+        "subscription": schema.get_subscription_type,
+    }[operation.operation]()
+    if root_type is None:
+        return 0
+
+    fragments = {
+        definition.name.value: definition
+        for definition in document_ast.definitions
+        if isinstance(definition, ast.FragmentDefinition)
+    }
+    variable_values = get_default_variable_values(operation)
+    variable_values.update(variables or {})
+    return get_selection_set_cost(
+        schema, root_type, operation.selection_set, fragments, variable_values, set()
+    )
+
+
+def get_operation(
+    document_ast: ast.Document, operation_name: Optional[str]
+) -> Optional[ast.OperationDefinition]:
+    operations = [
+        definition
+        for definition in document_ast.definitions
+        if isinstance(definition, ast.OperationDefinition)
+    ]
+    if not operation_name:
+        return operations[0] if len(operations) == 1 else None
+    for operation in operations:
+        if operation.name and operation.name.value == operation_name:
+            return operation
+    return None
+
+
+def get_default_variable_values(operation: ast.OperationDefinition) -> Dict[str, Any]:
+    variable_values = {}
+    for definition in operation.variable_definitions or []:
+        if isinstance(definition.default_value, ast.IntValue):
+            variable_values[definition.variable.name.value] = int(
+                definition.default_value.value
+            )
+    return variable_values
+
+
+def get_selection_set_cost(
+    schema,
+    parent_type,
+    selection_set: ast.SelectionSet,
+    fragments: Dict[str, ast.FragmentDefinition],
+    variable_values: Dict[str, Any],
+    visited_fragments: Set[str],
+) -> int:
+    cost = 0
+    for selection in selection_set.selections:
+        if isinstance(selection, ast.Field):
+            cost += get_field_cost(
+                schema,
+                parent_type,
+                selection,
+                fragments,
+                variable_values,
+                visited_fragments,
+            )
+        elif isinstance(selection, ast.FragmentSpread):
+            name = selection.name.value
+            fragment = fragments.get(name)
+            # skip unknown and cyclic fragments, they are rejected by validation
+            if fragment is None or name in visited_fragments:
+                continue
+            fragment_type = schema.get_type(fragment.type_condition.name.value)
+            cost += get_selection_set_cost(
+                schema,
+                fragment_type,
+                fragment.selection_set,
+                fragments,
+                variable_values,
+                visited_fragments | {name},
+            )
+        elif isinstance(selection, ast.InlineFragment):
+            fragment_type = parent_type
+            if selection.type_condition:
+                fragment_type = schema.get_type(selection.type_condition.name.value)
+            cost += get_selection_set_cost(
+                schema,
+                fragment_type,
+                selection.selection_set,
+                fragments,
+                variable_values,
+                visited_fragments,
+            )
+    return cost
+
+
+def get_field_cost(
+    schema,
+    parent_type,
+    field: ast.Field,
+    fragments: Dict[str, ast.FragmentDefinition],
+    variable_values: Dict[str, Any],
+    visited_fragments: Set[str],
+) -> int:
+    field_name = field.name.value
+    if field_name.startswith("__"):
+        return 0
+    field_definition = getattr(parent_type, "fields", {}).get(field_name)
+    if field_definition is None:
+        return 0
+
+    default_cost = 1 if field.selection_set else 0
+    cost = FIELD_COSTS.get(f"{parent_type.name}.{field_name}", default_cost)
+    if field.selection_set:
+        cost += get_selection_set_cost(
+            schema,
+            get_named_type(field_definition.type),
+            field.selection_set,
+            fragments,
+            variable_values,
+            visited_fragments,
+        )
+    return cost * get_field_multiplier(field, variable_values)
+
+
+def get_field_multiplier(field: ast.Field, variable_values: Dict[str, Any]) -> int:
+    multiplier = 1
+    for argument in field.arguments or []:
+        if argument.name.value not in PAGINATION_ARGUMENTS:
+            continue
+        value: Any = argument.value
+        if isinstance(value, ast.Variable):
+            value = variable_values.get(value.name.value)
+        elif isinstance(value, ast.IntValue):
+            value = value.value
+        try:
+            multiplier = max(multiplier, int(value))
+        except (TypeError, ValueError):
+            continue
+    return multiplier
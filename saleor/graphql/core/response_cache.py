@@ -0,0 +1,91 @@
+import hashlib
+import json
+from typing import Any, Dict, Iterable, Optional, Set
+from uuid import uuid4
+
+from django.core.cache import cache
+from graphql import GraphQLDocument
+from graphql.language import ast
+
+from .query_cost import get_operation
+
+# Root query fields whose anonymous responses can be cached, with the tags
+# used to invalidate them. Categories and collections include products, so
+# their responses are invalidated by product changes as well.
+CACHEABLE_ROOT_FIELDS = {
+    "product": ["products"],
+    "products": ["products"],
+    "category": ["categories", "products"],
+    "categories": ["categories", "products"],
+    "collection": ["collections", "products"],
+    "collections": ["collections", "products"],
+    "menu": ["menus"],
+    "menus": ["menus"],
+}
+
+TAG_VERSION_KEY_PREFIX = "response-cache-tag"
+RESPONSE_KEY_PREFIX = "response-cache"
+
+
+def get_response_cache_tags(
+    document_ast: ast.Document, operation_name: Optional[str]
+) -> Optional[Set[str]]:
+    """Return tags of the operation, or None if its response can't be cached."""
+    operation = get_operation(document_ast, operation_name)
+    if operation is None or operation.operation != "query":
+        return None
+    tags: Set[str] = set()
+    for selection in operation.selection_set.selections:
+        if not isinstance(selection, ast.Field):
+            return None
+        field_name = selection.name.value
+        if field_name == "__typename":
+            continue
+        if field_name not in CACHEABLE_ROOT_FIELDS:
+            return None
+        tags.update(CACHEABLE_ROOT_FIELDS[field_name])
+    return tags or None
+
+
+def get_tag_versions(tags: Iterable[str]) -> Dict[str, str]:
+    keys = {tag: f"{TAG_VERSION_KEY_PREFIX}-{tag}" for tag in tags}
+    versions = cache.get_many(keys.values())
+    for key in set(keys.values()) - set(versions):
+        # a missing version gets a new random value, so responses cached before
+        # the version was evicted are never served again
+        cache.add(key, uuid4().hex, timeout=None)
+        versions[key] = cache.get(key)
+    return {tag: versions[key] for tag, key in keys.items()}
+
+
+def get_response_cache_key(
+    document: GraphQLDocument,
+    variables: Optional[Dict[str, Any]],
+    operation_name: Optional[str],
+) -> Optional[str]:
+    """Return the cache key of the query response, or None if it's not cacheable.
+
+    The channel and language are passed to the catalog queries as arguments, so
+    responses are cached separately for each of them. The key also contains the
+    current versions of the response tags, which are changed on invalidation.
+    """
+    tags = get_response_cache_tags(document.document_ast, operation_name)
+    if not tags:
+        return None
+    key_data = {
+        "query": hashlib.sha256(document.document_string.encode("utf-8")).hexdigest(),
+        "operation_name": operation_name,
+        "variables": variables,
+        "tags": get_tag_versions(tags),
+    }
+    try:
+        key = json.dumps(key_data, sort_keys=True)
+    except TypeError:
+        return None
+    return f"{RESPONSE_KEY_PREFIX}-{hashlib.md5(key.encode('utf-8')).hexdigest()}"
+
+
+def invalidate_response_cache_tags(*tags: str):
+    cache.set_many(
+        {f"{TAG_VERSION_KEY_PREFIX}-{tag}": uuid4().hex for tag in tags}, timeout=None
+    )
@@ -0,0 +1,201 @@
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+
+from ...tests.utils import get_graphql_content
+from ..instrumentation import (
+    METRICS,
+    Histogram,
+    OperationInstrumentation,
+    render_metrics,
+)
+
+PRODUCTS_QUERY = """
+    query Products($channel: String) {
+        products(first: 10, channel: $channel) {
+            edges {
+                node {
+                    name
+                    variants {
+                        id
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    for metric in METRICS:
+        metric.clear()
+    yield
+    for metric in METRICS:
+        metric.clear()
+
+
+def test_histogram_render():
+    # given
+    histogram = Histogram("test_metric", "Test metric.", (1, 5), label="name")
+
+    # when
+    histogram.observe(0.5, "a")
+    histogram.observe(3, "a")
+    histogram.observe(10, "b")
+
+    # then
+    assert histogram.render() == [
+        "# HELP test_metric Test metric.",
+        "# TYPE test_metric histogram",
+        'test_metric_bucket{name="a",le="1"} 1',
+        'test_metric_bucket{name="a",le="5"} 2',
+        'test_metric_bucket{name="a",le="+Inf"} 2',
+        'test_metric_sum{name="a"} 3.5',
+        'test_metric_count{name="a"} 2',
+        'test_metric_bucket{name="b",le="1"} 0',
+        'test_metric_bucket{name="b",le="5"} 0',
+        'test_metric_bucket{name="b",le="+Inf"} 1',
+        'test_metric_sum{name="b"} 10.0',
+        'test_metric_count{name="b"} 1',
+    ]
+
+
+def test_operation_instrumentation_summary():
+    # given
+    instrumentation = OperationInstrumentation()
+
+    # when
+    instrumentation.record_field("Query.products", 0.5)
+    instrumentation.record_field("Product.name", 0.1)
+    instrumentation.record_field("Product.name", 0.1)
+    instrumentation.record_dataloader_batch("ProductByIdLoader", 3, 0.2)
+
+    # then
+    summary = instrumentation.get_summary()
+    assert summary["fields"] == [
+        {"field": "Query.products", "calls": 1, "duration": 0.5},
+        {"field": "Product.name", "calls": 2, "duration": 0.2},
+    ]
+    assert summary["dataloaders"] == [
+        {"loader": "ProductByIdLoader", "batches": 1, "keys": 3, "duration": 0.2}
+    ]
+
+
+@override_settings(GRAPHQL_INSTRUMENTATION=True)
+def test_instrumentation_summary_for_staff_user(staff_api_client, product, channel_USD):
+    # when
+    response = staff_api_client.post_graphql(
+        PRODUCTS_QUERY,
+        {"channel": channel_USD.slug},
+        HTTP_X_SALEOR_INSTRUMENTATION="1",
+    )
+
+    # then
+    content = get_graphql_content(response)
+    summary = content["extensions"]["instrumentation"]
+    assert summary["sql"]["queries"] > 0
+    fields = [field["field"] for field in summary["fields"]]
+    assert "Query.products" in fields
+    assert "Product.variants" in fields
+    assert summary["dataloaders"]
+
+
+@override_settings(GRAPHQL_INSTRUMENTATION=True)
+def test_instrumentation_summary_not_returned_without_header(
+    staff_api_client, product, channel_USD
+):
+    # when
+    response = staff_api_client.post_graphql(
+        PRODUCTS_QUERY, {"channel": channel_USD.slug}
+    )
+
+    # then
+    content = get_graphql_content(response)
+    assert "instrumentation" not in content.get("extensions", {})
+
+
+@override_settings(GRAPHQL_INSTRUMENTATION=True)
+def test_instrumentation_summary_not_returned_to_customer(
+    user_api_client, product, channel_USD
+):
+    # when
+    response = user_api_client.post_graphql(
+        PRODUCTS_QUERY,
+        {"channel": channel_USD.slug},
+        HTTP_X_SALEOR_INSTRUMENTATION="1",
+    )
+
+    # then
+    content = get_graphql_content(response)
+    assert "instrumentation" not in content.get("extensions", {})
+
+
+def test_instrumentation_disabled(staff_api_client, product, channel_USD):
+    # when
+    response = staff_api_client.post_graphql(
+        PRODUCTS_QUERY,
+        {"channel": channel_USD.slug},
+        HTTP_X_SALEOR_INSTRUMENTATION="1",
+    )
+
+    # then
+    content = get_graphql_content(response)
+    assert "instrumentation" not in content.get("extensions", {})
+    assert "saleor_graphql_operation_sql_queries_count" not in render_metrics()
+
+
+@override_settings(
+    GRAPHQL_INSTRUMENTATION=True, GRAPHQL_INSTRUMENTATION_METRICS_TOKEN="secret"
+)
+def test_instrumentation_metrics(api_client, client, product, channel_USD):
+    # given
+    api_client.post_graphql(PRODUCTS_QUERY, {"channel": channel_USD.slug})
+
+    # when
+    response = client.get(
+        reverse("api-instrumentation-metrics"), HTTP_AUTHORIZATION="Bearer secret"
+    )
+
+    # then
+    assert response.status_code == 200
+    metrics = response.content.decode()
+    field_count = 'saleor_graphql_field_duration_seconds_count{field="Query.products"}'
+    assert f"{field_count} 1" in metrics
+    assert "saleor_graphql_operation_sql_queries_count 1" in metrics
+    assert "saleor_graphql_dataloader_batch_size_count{loader=" in metrics
+
+
+def test_instrumentation_metrics_disabled(client):
+    # when
+    response = client.get(reverse("api-instrumentation-metrics"))
+
+    # then
+    assert response.status_code == 404
+
+
+@override_settings(GRAPHQL_INSTRUMENTATION=True)
+def test_instrumentation_metrics_without_token_configured(client):
+    # when
+    response = client.get(
+        reverse("api-instrumentation-metrics"), HTTP_AUTHORIZATION="Bearer secret"
+    )
+
+    # then
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("auth_header", [None, "Bearer invalid"])
+@override_settings(
+    GRAPHQL_INSTRUMENTATION=True, GRAPHQL_INSTRUMENTATION_METRICS_TOKEN="secret"
+)
+def test_instrumentation_metrics_invalid_token(auth_header, client):
+    # given
+    headers = {"HTTP_AUTHORIZATION": auth_header} if auth_header else {}
+
+    # when
+    response = client.get(reverse("api-instrumentation-metrics"), **headers)
+
+    # then
+    assert response.status_code == 403
+    assert "saleor_graphql" not in response.content.decode()
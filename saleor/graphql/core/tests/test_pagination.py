@@ -2,6 +2,9 @@ import math
 
 import graphene
 import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 
 from ....tests.models import Book
 from ..connection import CountableDjangoObjectType
@@ -218,3 +221,47 @@ def test_pagination_backward_last_page_info(books):
     page_info = content["books"]["pageInfo"]
     assert page_info["hasNextPage"]
     assert page_info["hasPreviousPage"] is False
+
+
+QUERY_BOOKS_TOTAL_COUNT = """
+    query BooksTotalCount($approximate: Boolean) {
+        books(first: 1) {
+            totalCount(approximate: $approximate)
+        }
+    }
+"""
+
+
+@override_settings(CONNECTION_APPROXIMATE_COUNT_THRESHOLD=10000)
+def test_approximate_total_count_below_threshold(books):
+    # when
+    result = schema.execute(QUERY_BOOKS_TOTAL_COUNT, variables={"approximate": True})
+
+    # then
+    assert not result.errors
+    assert result.data["books"]["totalCount"] == len(books)
+
+
+@override_settings(CONNECTION_APPROXIMATE_COUNT_THRESHOLD=0)
+def test_approximate_total_count_uses_estimate(books):
+    # when
+    with CaptureQueriesContext(connection) as queries:
+        result = schema.execute(
+            QUERY_BOOKS_TOTAL_COUNT, variables={"approximate": True}
+        )
+
+    # then
+    assert not result.errors
+    assert isinstance(result.data["books"]["totalCount"], int)
+    assert not any("COUNT(" in query["sql"] for query in queries.captured_queries)
+    assert any(query["sql"].startswith("EXPLAIN") for query in queries.captured_queries)
+
+
+@override_settings(CONNECTION_APPROXIMATE_COUNT_THRESHOLD=0)
+def test_exact_total_count(books):
+    # when
+    result = schema.execute(QUERY_BOOKS_TOTAL_COUNT, variables={"approximate": False})
+
+    # then
+    assert not result.errors
+    assert result.data["books"]["totalCount"] == len(books)
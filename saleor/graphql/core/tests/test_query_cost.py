@@ -0,0 +1,151 @@
+from django.test import override_settings
+from graphql import parse
+
+from ...api import schema
+from ...tests.utils import get_graphql_content, get_graphql_content_from_response
+from ..query_cost import calculate_query_cost
+
+PRODUCTS_QUERY = """
+    query Products($first: Int, $channel: String) {
+        products(first: $first, channel: $channel) {
+            edges {
+                node {
+                    name
+                    ...ProductPricing
+                }
+            }
+        }
+    }
+
+    fragment ProductPricing on Product {
+        pricing {
+            onSale
+        }
+    }
+"""
+
+
+def test_calculate_query_cost_scalar_fields_are_free():
+    query = "{ shop { name description } }"
+    cost = calculate_query_cost(schema, parse(query))
+    assert cost == 1
+
+
+def test_calculate_query_cost_multiplies_by_first():
+    query = """
+        {
+            products(first: 10) {
+                edges {
+                    node {
+                        name
+                    }
+                }
+            }
+        }
+    """
+    # products, edges and node cost 1 each, multiplied by the page size
+    cost = calculate_query_cost(schema, parse(query))
+    assert cost == 30
+
+
+def test_calculate_query_cost_uses_variables_and_fragments():
+    document = parse(PRODUCTS_QUERY)
+
+    cost = calculate_query_cost(schema, document, {"first": 20})
+
+    # products, edges and node cost 1 each and pricing has a weight of 5
+    assert cost == 20 * (1 + 1 + 1 + 5)
+
+
+def test_calculate_query_cost_uses_variable_default_values():
+    query = """
+        query Products($last: Int = 5) {
+            products(last: $last) {
+                totalCount
+            }
+        }
+    """
+    cost = calculate_query_cost(schema, parse(query))
+    assert cost == 5
+
+
+def test_calculate_query_cost_nested_connections():
+    query = """
+        {
+            categories(first: 10) {
+                edges {
+                    node {
+                        products(first: 10) {
+                            edges {
+                                node {
+                                    name
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    """
+    cost = calculate_query_cost(schema, parse(query))
+    assert cost == 10 * (1 + 1 + 1 + 10 * 3)
+
+
+def test_calculate_query_cost_skips_introspection_fields():
+    query = "{ __schema { types { name } } shop { __typename } }"
+    cost = calculate_query_cost(schema, parse(query))
+    assert cost == 1
+
+
+def test_calculate_query_cost_selects_operation_by_name():
+    query = """
+        query Shop { shop { name } }
+        query Products { products(first: 2) { totalCount } }
+    """
+    document = parse(query)
+
+    assert calculate_query_cost(schema, document, operation_name="Shop") == 1
+    assert calculate_query_cost(schema, document, operation_name="Products") == 2
+    assert calculate_query_cost(schema, document) == 0
+
+
+@override_settings(GRAPHQL_QUERY_MAX_COST=50000)
+def test_query_cost_in_response_extensions(api_client, product, channel_USD):
+    variables = {"first": 10, "channel": channel_USD.slug}
+
+    response = api_client.post_graphql(PRODUCTS_QUERY, variables)
+
+    content = get_graphql_content(response)
+    assert content["extensions"]["cost"] == {
+        "requestedQueryCost": 80,
+        "maximumAvailable": 50000,
+    }
+    assert content["data"]["products"]["edges"]
+
+
+@override_settings(GRAPHQL_QUERY_MAX_COST=50)
+def test_query_over_max_cost_is_rejected(api_client, product, channel_USD):
+    variables = {"first": 10, "channel": channel_USD.slug}
+
+    response = api_client.post_graphql(PRODUCTS_QUERY, variables)
+
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == (
+        "The query exceeds the maximum cost of 50, requested cost is 80."
+    )
+    assert content["extensions"]["cost"] == {
+        "requestedQueryCost": 80,
+        "maximumAvailable": 50,
+    }
+    assert "data" not in content
+
+
+@override_settings(GRAPHQL_QUERY_MAX_COST=0)
+def test_query_cost_analysis_disabled(api_client, product, channel_USD):
+    variables = {"first": 10, "channel": channel_USD.slug}
+
+    response = api_client.post_graphql(PRODUCTS_QUERY, variables)
+
+    content = get_graphql_content(response)
+    assert "extensions" not in content
@@ -0,0 +1,125 @@
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from graphql import parse
+
+from ....product.models import Product
+from ...tests.utils import get_graphql_content
+from ..response_cache import (
+    get_response_cache_tags,
+    get_tag_versions,
+    invalidate_response_cache_tags,
+)
+
+PRODUCTS_QUERY = """
+    query Products($channel: String) {
+        products(first: 10, channel: $channel) {
+            edges {
+                node {
+                    name
+                }
+            }
+        }
+    }
+"""
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.parametrize(
+    "query, tags",
+    [
+        ("{ products(first: 1) { totalCount } }", {"products"}),
+        (
+            "{ categories(first: 1) { totalCount } menus(first: 1) { totalCount } }",
+            {"categories", "menus", "products"},
+        ),
+        ("{ __typename menu(id: 1) { name } }", {"menus"}),
+        ("{ products(first: 1) { totalCount } shop { name } }", None),
+        ("{ ...Fragment } fragment Fragment on Query { menus { totalCount } }", None),
+        ("mutation { tokenRefresh { token } }", None),
+    ],
+)
+def test_get_response_cache_tags(query, tags):
+    assert get_response_cache_tags(parse(query), None) == tags
+
+
+def test_invalidate_response_cache_tags():
+    versions = get_tag_versions(["products", "menus"])
+    assert get_tag_versions(["products", "menus"]) == versions
+
+    invalidate_response_cache_tags("products")
+
+    new_versions = get_tag_versions(["products", "menus"])
+    assert new_versions["products"] != versions["products"]
+    assert new_versions["menus"] == versions["menus"]
+
+
+@override_settings(GRAPHQL_RESPONSE_CACHE_TIMEOUT=60)
+def test_anonymous_query_response_is_cached(
+    api_client, product, channel_USD, django_assert_num_queries
+):
+    variables = {"channel": channel_USD.slug}
+    response = api_client.post_graphql(PRODUCTS_QUERY, variables)
+    content = get_graphql_content(response)
+    Product.objects.update(name="New name")
+
+    with django_assert_num_queries(0):
+        response = api_client.post_graphql(PRODUCTS_QUERY, variables)
+
+    assert get_graphql_content(response)["data"] == content["data"]
+    assert content["data"]["products"]["edges"][0]["node"]["name"] == product.name
+
+
+@override_settings(GRAPHQL_RESPONSE_CACHE_TIMEOUT=60)
+def test_response_cache_is_invalidated_by_tag(api_client, product, channel_USD):
+    variables = {"channel": channel_USD.slug}
+    api_client.post_graphql(PRODUCTS_QUERY, variables)
+    Product.objects.update(name="New name")
+
+    invalidate_response_cache_tags("products")
+    response = api_client.post_graphql(PRODUCTS_QUERY, variables)
+
+    content = get_graphql_content(response)
+    assert content["data"]["products"]["edges"][0]["node"]["name"] == "New name"
+
+
+@override_settings(GRAPHQL_RESPONSE_CACHE_TIMEOUT=60)
+def test_response_cache_is_separate_for_channels(
+    api_client, product, channel_USD, channel_PLN
+):
+    response = api_client.post_graphql(PRODUCTS_QUERY, {"channel": channel_USD.slug})
+    assert get_graphql_content(response)["data"]["products"]["edges"]
+
+    response = api_client.post_graphql(PRODUCTS_QUERY, {"channel": channel_PLN.slug})
+    assert not get_graphql_content(response)["data"]["products"]["edges"]
+
+
+@override_settings(GRAPHQL_RESPONSE_CACHE_TIMEOUT=60)
+def test_authenticated_query_response_is_not_cached(
+    staff_api_client, product, channel_USD
+):
+    variables = {"channel": channel_USD.slug}
+    staff_api_client.post_graphql(PRODUCTS_QUERY, variables)
+    Product.objects.update(name="New name")
+
+    response = staff_api_client.post_graphql(PRODUCTS_QUERY, variables)
+
+    content = get_graphql_content(response)
+    assert content["data"]["products"]["edges"][0]["node"]["name"] == "New name"
+
+
+def test_response_cache_disabled(api_client, product, channel_USD):
+    variables = {"channel": channel_USD.slug}
+    api_client.post_graphql(PRODUCTS_QUERY, variables)
+    Product.objects.update(name="New name")
+
+    response = api_client.post_graphql(PRODUCTS_QUERY, variables)
+
+    content = get_graphql_content(response)
+    assert content["data"]["products"]["edges"][0]["node"]["name"] == "New name"
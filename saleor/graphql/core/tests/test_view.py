@@ -1,8 +1,14 @@
+import hashlib
+import json
 from unittest import mock
 
 import graphene
 import pytest
+from django.core.cache import cache
+from django.db import connection
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from graphql import parse, validate
 from graphql.execution.base import ExecutionResult
 
 from .... import __version__ as saleor_version
@@ -15,7 +21,7 @@ from ...tests.fixtures import (
     API_PATH,
 )
 from ...tests.utils import get_graphql_content, get_graphql_content_from_response
-from ...views import generate_cache_key
+from ...views import GraphQLDocumentCache, document_cache, generate_cache_key
 
 
 def test_batch_queries(category, product, api_client, channel_USD):
@@ -64,6 +70,99 @@ def test_batch_queries(category, product, api_client, channel_USD):
     assert data["category"]["name"] == category.name
 
 
+VARIANT_PRODUCT_QUERY = """
+    query GetVariant($id: ID!, $channel: String) {
+        productVariant(id: $id, channel: $channel) {
+            product {
+                name
+            }
+        }
+    }
+"""
+
+
+def test_batch_queries_share_dataloaders(api_client, variant, channel_USD):
+    variables = {
+        "id": graphene.Node.to_global_id("ProductVariant", variant.pk),
+        "channel": channel_USD.slug,
+    }
+    operation = {"query": VARIANT_PRODUCT_QUERY, "variables": variables}
+
+    with CaptureQueriesContext(connection) as single_queries:
+        api_client.post(operation)
+    with CaptureQueriesContext(connection) as batch_queries:
+        response = api_client.post([operation, operation])
+
+    batch_content = get_graphql_content(response)
+    assert batch_content[0] == batch_content[1]
+    # the product loaded by the first operation is reused by the second one
+    assert len(batch_queries) < 2 * len(single_queries)
+
+
+def test_batch_mutation_clears_dataloaders(
+    staff_api_client, variant, channel_USD, permission_manage_products
+):
+    staff_api_client.user.user_permissions.add(permission_manage_products)
+    product = variant.product
+    variables = {
+        "id": graphene.Node.to_global_id("ProductVariant", variant.pk),
+        "channel": channel_USD.slug,
+    }
+    mutation = """
+        mutation UpdateProduct($id: ID!, $name: String) {
+            productUpdate(id: $id, input: {name: $name}) {
+                errors {
+                    field
+                }
+            }
+        }
+    """
+    data = [
+        {"query": VARIANT_PRODUCT_QUERY, "variables": variables},
+        {
+            "query": mutation,
+            "variables": {
+                "id": graphene.Node.to_global_id("Product", product.pk),
+                "name": "New name",
+            },
+        },
+        {"query": VARIANT_PRODUCT_QUERY, "variables": variables},
+    ]
+
+    response = staff_api_client.post(data)
+
+    batch_content = get_graphql_content(response)
+    assert batch_content[0]["data"]["productVariant"]["product"]["name"] == (
+        product.name
+    )
+    assert batch_content[1]["data"]["productUpdate"]["errors"] == []
+    assert batch_content[2]["data"]["productVariant"]["product"]["name"] == ("New name")
+
+
+@override_settings(GRAPHQL_BATCH_MAX_OPERATIONS=2)
+def test_batch_queries_over_limit(api_client):
+    data = [{"query": "{ shop { name } }"}] * 3
+
+    response = api_client.post(data)
+
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == (
+        "Batch can contain at most 2 operations."
+    )
+
+
+def test_batch_queries_with_invalid_operation(api_client, site_settings):
+    data = [{"query": "{ shop { name } }"}, "{ shop { name } }"]
+
+    response = api_client.post(data)
+
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    assert content[0]["data"]["shop"]["name"] == site_settings.site.name
+    assert content[1]["errors"][0]["message"] == "Operation must be an object."
+
+
 def test_graphql_view_query_with_invalid_object_type(
     staff_api_client, product, permission_manage_orders, graphql_log_handler
 ):
@@ -416,3 +515,212 @@ def test_introspection_query_is_not_cached_in_debug_mode(
 def test_generate_cache_key_use_saleor_version():
     cache_key = generate_cache_key(INTROSPECTION_QUERY)
     assert saleor_version in cache_key
+
+
+DOCUMENT_CACHE_QUERY = "{ shop { name } }"
+
+
+@mock.patch("saleor.graphql.views.validate", wraps=validate)
+@mock.patch("graphql.backend.core.parse", wraps=parse)
+def test_document_cache_skips_parse_and_validate(
+    parse_mock, validate_mock, api_client, site_settings
+):
+    # given
+    document_cache.clear()
+
+    # when
+    for _ in range(3):
+        response = api_client.post_graphql(DOCUMENT_CACHE_QUERY)
+        content = get_graphql_content(response)
+        assert content["data"]["shop"]["name"] == site_settings.site.name
+
+    # then
+    parse_mock.assert_called_once()
+    validate_mock.assert_called_once()
+    assert document_cache.misses == 1
+    assert document_cache.hits == 2
+
+
+def test_document_cache_does_not_store_invalid_documents(api_client):
+    # given
+    document_cache.clear()
+
+    # when
+    for _ in range(2):
+        response = api_client.post_graphql("{ shop { invalidField } }")
+        assert response.status_code == 400
+
+    # then
+    assert len(document_cache) == 0
+    assert document_cache.misses == 2
+
+
+@override_settings(GRAPHQL_DOCUMENT_CACHE_SIZE=0)
+@mock.patch("graphql.backend.core.parse", wraps=parse)
+def test_document_cache_disabled(parse_mock, api_client, site_settings):
+    # given
+    document_cache.clear()
+
+    # when
+    for _ in range(2):
+        response = api_client.post_graphql(DOCUMENT_CACHE_QUERY)
+        get_graphql_content(response)
+
+    # then
+    assert parse_mock.call_count == 2
+    assert len(document_cache) == 0
+
+
+@override_settings(GRAPHQL_DOCUMENT_CACHE_SIZE=2)
+def test_document_cache_evicts_least_recently_used():
+    # given
+    cache = GraphQLDocumentCache()
+    cache.set("a", "document-a")
+    cache.set("b", "document-b")
+    cache.get("a")
+
+    # when
+    cache.set("c", "document-c")
+
+    # then
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == "document-a"
+    assert cache.get("c") == "document-c"
+
+
+PERSISTED_QUERY = "{ shop { name } }"
+PERSISTED_QUERY_HASH = hashlib.sha256(PERSISTED_QUERY.encode("utf-8")).hexdigest()
+
+
+def get_persisted_query_extensions(query_hash=PERSISTED_QUERY_HASH):
+    return {"persistedQuery": {"version": 1, "sha256Hash": query_hash}}
+
+
+def post_persisted_query(client, data):
+    return client.post(API_PATH, json.dumps(data), content_type="application/json")
+
+
+def test_persisted_query_not_found(client):
+    # given
+    cache.clear()
+    data = {"extensions": get_persisted_query_extensions()}
+
+    # when
+    response = post_persisted_query(client, data)
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "PersistedQueryNotFound"
+    assert content["errors"][0]["extensions"]["exception"]["code"] == (
+        "PersistedQueryNotFound"
+    )
+
+
+def test_persisted_query_registered_and_executed_by_hash(client, site_settings):
+    # given
+    cache.clear()
+    extensions = get_persisted_query_extensions()
+    response = post_persisted_query(
+        client, {"query": PERSISTED_QUERY, "extensions": extensions}
+    )
+    assert get_graphql_content(response)["data"]["shop"]["name"]
+
+    # when
+    response = post_persisted_query(client, {"extensions": extensions})
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["shop"]["name"] == site_settings.site.name
+
+
+def test_persisted_query_hash_mismatch(client):
+    # given
+    cache.clear()
+    data = {
+        "query": PERSISTED_QUERY,
+        "extensions": get_persisted_query_extensions("invalid-hash"),
+    }
+
+    # when
+    response = post_persisted_query(client, data)
+
+    # then
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == (
+        "Provided sha256Hash does not match the query."
+    )
+    assert cache.get("persisted-query-invalid-hash") is None
+
+
+@pytest.mark.parametrize(
+    "persisted_query",
+    [
+        "abc",
+        [1],
+        {"version": 1},
+        {"version": 1, "sha256Hash": 123},
+        {"version": 1, "sha256Hash": ["abc"]},
+    ],
+)
+def test_persisted_query_invalid_extension(persisted_query, client):
+    # given
+    data = {"query": PERSISTED_QUERY, "extensions": {"persistedQuery": persisted_query}}
+
+    # when
+    response = post_persisted_query(client, data)
+
+    # then
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "Invalid persisted query."
+
+
+@override_settings(GRAPHQL_PERSISTED_QUERY_ALLOW_GET=True)
+def test_persisted_query_with_get_request(client, site_settings):
+    # given
+    cache.clear()
+    extensions = json.dumps(get_persisted_query_extensions())
+    post_persisted_query(
+        client,
+        {"query": PERSISTED_QUERY, "extensions": get_persisted_query_extensions()},
+    )
+
+    # when
+    response = client.get(API_PATH, {"extensions": extensions})
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["shop"]["name"] == site_settings.site.name
+
+
+@override_settings(GRAPHQL_PERSISTED_QUERY_ALLOW_GET=True)
+def test_persisted_mutation_with_get_request_not_allowed(client):
+    # given
+    cache.clear()
+    query = 'mutation { tokenVerify(token: "token") { isValid } }'
+    query_hash = hashlib.sha256(query.encode("utf-8")).hexdigest()
+    extensions = get_persisted_query_extensions(query_hash)
+
+    # when
+    response = client.get(
+        API_PATH, {"query": query, "extensions": json.dumps(extensions)}
+    )
+
+    # then
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "Only queries can be sent with GET."
+
+
+@override_settings(GRAPHQL_PERSISTED_QUERY_ALLOW_GET=False, PLAYGROUND_ENABLED=False)
+def test_persisted_query_with_get_request_disabled(client):
+    # given
+    extensions = json.dumps(get_persisted_query_extensions())
+
+    # when
+    response = client.get(API_PATH, {"extensions": extensions})
+
+    # then
+    assert response.status_code == 405
@@ -17,6 +17,7 @@ from ..enums import (
     DiscountErrorCode,
     ExportErrorCode,
     GiftCardErrorCode,
+    ImportErrorCode,
     InvoiceErrorCode,
     JobStatusEnum,
     LanguageCodeEnum,
@@ -163,6 +164,13 @@ class ExportError(Error):
     code = ExportErrorCode(description="The error code.", required=True)
 
 
+class ImportFileError(Error):
+    code = ImportErrorCode(description="The error code.", required=True)
+
+    class Meta:
+        name = "ImportError"
+
+
 class MenuError(Error):
     code = MenuErrorCode(description="The error code.", required=True)
 
@@ -476,3 +484,9 @@ class ProductClassRecommendationError(Error):
 
 class ProductMaxMinError(Error):
     code = ProductMaxMinErrorCode(description="The error code.", required=True)
+
+
+class BulkProductMaxMinError(ProductMaxMinError):
+    index = graphene.Int(
+        description="Index of an input list item that caused the error."
+    )
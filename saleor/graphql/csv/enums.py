@@ -1,10 +1,12 @@
 import graphene
 
-from ...csv import ExportEvents, FileTypes
+from ...csv import ExportEvents, FileTypes, ImportEvents, ImportTypes
 from ...graphql.core.enums import to_enum
 
 ExportEventEnum = to_enum(ExportEvents)
 FileTypeEnum = to_enum(FileTypes)
+ImportEventEnum = to_enum(ImportEvents)
+ImportTypeEnum = to_enum(ImportTypes)
 
 
 class ExportScope(graphene.Enum):
@@ -1,24 +1,35 @@
+import os
 from typing import Dict, List, Mapping, Union
 
 import graphene
 from django.core.exceptions import ValidationError
 
-from ...core.permissions import ProductMaxMinPermissions, ProductPermissions
+from ...core.permissions import (
+    ProductClassPermissions,
+    ProductMaxMinPermissions,
+    ProductPermissions,
+)
+from ...csv import FileTypes, ImportTypes
 from ...csv import models as csv_models
-from ...csv.events import export_started_event
-from ...csv.tasks import export_products_max_min_task, export_products_task
+from ...csv.events import export_started_event, import_started_event
+from ...csv.tasks import (
+    export_products_max_min_task,
+    export_products_task,
+    import_file_task,
+)
 from ..attribute.types import Attribute
 from ..channel.types import Channel
-from ..core.enums import ExportErrorCode
+from ..core.enums import ExportErrorCode, ImportErrorCode
 from ..core.mutations import BaseMutation
-from ..core.types.common import ExportError
+from ..core.types import Upload
+from ..core.types.common import ExportError, ImportFileError
 from ..product.filters import ProductFilterInput
 from ..product.filters_product_max_min import ProductMaxMinFilterInput
 from ..product.types import Product
 from ..product.types.product_max_min import ProductMaxMin
 from ..warehouse.types import Warehouse
 from .enums import ExportScope, FileTypeEnum, ProductFieldEnum, ProductMaxMinFieldEnum
-from .types import ExportFile
+from .types import ExportFile, ImportFile
 
 
 class ExportInfoInput(graphene.InputObjectType):
@@ -243,3 +254,105 @@ class ExportProductsMaxMin(BaseExportProducts):
         if fields:
             export_info["fields"] = fields
         return export_info
+
+
+class BaseImportFile(BaseMutation):
+    import_file = graphene.Field(
+        ImportFile,
+        description=(
+            "The newly created import file job which is responsible for import data."
+        ),
+    )
+
+    class Arguments:
+        file = Upload(
+            required=True,
+            description=(
+                "Represents a file in a multipart request. Accepted formats are "
+                "CSV (semicolon separated) and XLSX."
+            ),
+        )
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def get_import_type(cls) -> str:
+        raise NotImplementedError
+
+    @classmethod
+    def clean_file(cls, info, file):
+        file_data = info.context.FILES.get(file)
+        if not file_data:
+            raise ValidationError(
+                {
+                    "file": ValidationError(
+                        "File is required.", code=ImportErrorCode.REQUIRED.value
+                    )
+                }
+            )
+        _, extension = os.path.splitext(file_data.name)
+        if extension.lower() not in [f".{FileTypes.CSV}", f".{FileTypes.XLSX}"]:
+            raise ValidationError(
+                {
+                    "file": ValidationError(
+                        "Invalid file type. Only CSV and XLSX files are accepted.",
+                        code=ImportErrorCode.INVALID.value,
+                    )
+                }
+            )
+        return file_data
+
+    @classmethod
+    def perform_mutation(cls, root, info, **data):
+        file_data = cls.clean_file(info, data["file"])
+
+        app = info.context.app
+        kwargs = {"app": app} if app else {"user": info.context.user}
+
+        import_file = csv_models.ImportFile(type=cls.get_import_type(), **kwargs)
+        import_file.content_file.save(file_data.name, file_data, save=False)
+        import_file.save()
+        import_started_event(import_file=import_file, **kwargs)
+        import_file_task.delay(import_file.pk)
+
+        import_file.refresh_from_db()
+        return cls(import_file=import_file)
+
+
+class ImportProductsMaxMin(BaseImportFile):
+    class Arguments(BaseImportFile.Arguments):
+        pass
+
+    class Meta:
+        description = (
+            "Import products max min from csv or xlsx file. The file is processed "
+            "in the background and rows which cannot be imported are reported in "
+            "the error file of the import job."
+        )
+        permissions = (ProductMaxMinPermissions.MANAGE_PRODUCT_MAX_MIN,)
+        error_type_class = ImportFileError
+        error_type_field = "import_errors"
+
+    @classmethod
+    def get_import_type(cls) -> str:
+        return ImportTypes.PRODUCT_MAX_MIN
+
+
+class ImportProductClassRecommendations(BaseImportFile):
+    class Arguments(BaseImportFile.Arguments):
+        pass
+
+    class Meta:
+        description = (
+            "Import product class recommendations from csv or xlsx file. The file "
+            "is processed in the background and rows which cannot be imported are "
+            "reported in the error file of the import job."
+        )
+        permissions = (ProductClassPermissions.MANAGE_PRODUCT_CLASS,)
+        error_type_class = ImportFileError
+        error_type_field = "import_errors"
+
+    @classmethod
+    def get_import_type(cls) -> str:
+        return ImportTypes.PRODUCT_CLASS_RECOMMENDATION
@@ -1,14 +1,23 @@
 import graphene
 
-from ...core.permissions import ProductPermissions
+from ...core.permissions import (
+    ProductClassPermissions,
+    ProductMaxMinPermissions,
+    ProductPermissions,
+)
 from ..core.fields import FilterInputConnectionField
 from ..core.utils import from_global_id_or_error
-from ..decorators import permission_required
+from ..decorators import one_of_permissions_required, permission_required
 from .filters import ExportFileFilterInput
-from .mutations import ExportProducts, ExportProductsMaxMin
-from .resolvers import resolve_export_file, resolve_export_files
+from .mutations import (
+    ExportProducts,
+    ExportProductsMaxMin,
+    ImportProductClassRecommendations,
+    ImportProductsMaxMin,
+)
+from .resolvers import resolve_export_file, resolve_export_files, resolve_import_file
 from .sorters import ExportFileSortingInput
-from .types import ExportFile
+from .types import ExportFile, ImportFile
 
 
 class CsvQueries(graphene.ObjectType):
@@ -25,6 +34,13 @@ class CsvQueries(graphene.ObjectType):
         sort_by=ExportFileSortingInput(description="Sort export files."),
         description="List of export files.",
     )
+    import_file = graphene.Field(
+        ImportFile,
+        id=graphene.Argument(
+            graphene.ID, description="ID of the import file job.", required=True
+        ),
+        description="Look up an import file by ID.",
+    )
 
     @permission_required(ProductPermissions.MANAGE_PRODUCTS)
     def resolve_export_file(self, info, id):
@@ -35,7 +51,19 @@ class CsvQueries(graphene.ObjectType):
     def resolve_export_files(self, _info, **kwargs):
         return resolve_export_files()
 
+    @one_of_permissions_required(
+        [
+            ProductMaxMinPermissions.MANAGE_PRODUCT_MAX_MIN,
+            ProductClassPermissions.MANAGE_PRODUCT_CLASS,
+        ]
+    )
+    def resolve_import_file(self, info, id):
+        _, id = from_global_id_or_error(id, ImportFile)
+        return resolve_import_file(id)
+
 
 class CsvMutations(graphene.ObjectType):
     export_products = ExportProducts.Field()
     export_products_max_min = ExportProductsMaxMin.Field()
+    import_products_max_min = ImportProductsMaxMin.Field()
+    import_product_class_recommendations = ImportProductClassRecommendations.Field()
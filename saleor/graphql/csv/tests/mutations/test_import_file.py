@@ -0,0 +1,146 @@
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from .....csv import ImportEvents, ImportTypes
+from .....csv.error_codes import ImportErrorCode
+from .....csv.models import ImportEvent, ImportFile
+from ....tests.utils import get_graphql_content, get_multipart_request_body
+
+IMPORT_PRODUCTS_MAX_MIN_MUTATION = """
+    mutation ImportProductsMaxMin($file: Upload!){
+        importProductsMaxMin(file: $file){
+            importFile {
+                id
+                status
+                type
+                processedRows
+                importedRows
+                failedRows
+                user {
+                    email
+                }
+            }
+            errors {
+                field
+                code
+                message
+            }
+        }
+    }
+"""
+
+IMPORT_PRODUCT_CLASS_RECOMMENDATIONS_MUTATION = """
+    mutation ImportProductClassRecommendations($file: Upload!){
+        importProductClassRecommendations(file: $file){
+            importFile {
+                id
+                type
+            }
+            errors {
+                field
+                code
+                message
+            }
+        }
+    }
+"""
+
+
+@patch("saleor.graphql.csv.mutations.import_file_task.delay")
+def test_import_products_max_min_mutation(
+    import_file_task_mock,
+    staff_api_client,
+    permission_manage_product_max_min,
+    media_root,
+):
+    # given
+    user = staff_api_client.user
+    file_name = "file"
+    content_file = SimpleUploadedFile(
+        "max_min.csv", b"Channel Slug;Variant SKU;Current Min Level;Current Max Level"
+    )
+    body = get_multipart_request_body(
+        IMPORT_PRODUCTS_MAX_MIN_MUTATION, {"file": file_name}, content_file, file_name
+    )
+
+    # when
+    response = staff_api_client.post_multipart(
+        body, permissions=[permission_manage_product_max_min]
+    )
+
+    # then
+    content = get_graphql_content(response)
+    data = content["data"]["importProductsMaxMin"]
+    assert not data["errors"]
+    assert data["importFile"]["status"] == "PENDING"
+    assert data["importFile"]["type"] == ImportTypes.PRODUCT_MAX_MIN.upper()
+    assert data["importFile"]["processedRows"] == 0
+    assert data["importFile"]["user"]["email"] == user.email
+
+    import_file = ImportFile.objects.get()
+    assert import_file.user == user
+    assert import_file.content_file.name.endswith(".csv")
+    import_file_task_mock.assert_called_once_with(import_file.pk)
+    assert ImportEvent.objects.filter(
+        import_file=import_file, user=user, type=ImportEvents.IMPORT_PENDING
+    ).exists()
+
+
+@patch("saleor.graphql.csv.mutations.import_file_task.delay")
+def test_import_products_max_min_mutation_invalid_file_type(
+    import_file_task_mock,
+    staff_api_client,
+    permission_manage_product_max_min,
+    media_root,
+):
+    # given
+    file_name = "file"
+    content_file = SimpleUploadedFile("max_min.txt", b"content")
+    body = get_multipart_request_body(
+        IMPORT_PRODUCTS_MAX_MIN_MUTATION, {"file": file_name}, content_file, file_name
+    )
+
+    # when
+    response = staff_api_client.post_multipart(
+        body, permissions=[permission_manage_product_max_min]
+    )
+
+    # then
+    content = get_graphql_content(response)
+    errors = content["data"]["importProductsMaxMin"]["errors"]
+    assert len(errors) == 1
+    assert errors[0]["field"] == "file"
+    assert errors[0]["code"] == ImportErrorCode.INVALID.name
+    assert not ImportFile.objects.exists()
+    import_file_task_mock.assert_not_called()
+
+
+@patch("saleor.graphql.csv.mutations.import_file_task.delay")
+def test_import_product_class_recommendations_mutation(
+    import_file_task_mock, staff_api_client, permission_manage_product_class, media_root
+):
+    # given
+    file_name = "file"
+    content_file = SimpleUploadedFile("product_class.xlsx", b"content")
+    body = get_multipart_request_body(
+        IMPORT_PRODUCT_CLASS_RECOMMENDATIONS_MUTATION,
+        {"file": file_name},
+        content_file,
+        file_name,
+    )
+
+    # when
+    response = staff_api_client.post_multipart(
+        body, permissions=[permission_manage_product_class]
+    )
+
+    # then
+    content = get_graphql_content(response)
+    data = content["data"]["importProductClassRecommendations"]
+    assert not data["errors"]
+    assert (
+        data["importFile"]["type"] == ImportTypes.PRODUCT_CLASS_RECOMMENDATION.upper()
+    )
+    import_file = ImportFile.objects.get()
+    import_file_task_mock.assert_called_once_with(import_file.pk)
@@ -10,7 +10,7 @@ from ..app.types import App
 from ..core.connection import CountableDjangoObjectType
 from ..core.types.common import Job
 from ..utils import get_user_or_app_from_context
-from .enums import ExportEventEnum
+from .enums import ExportEventEnum, ImportEventEnum, ImportTypeEnum
 
 
 class ExportEvent(CountableDjangoObjectType):
@@ -94,3 +94,115 @@ class ExportFile(CountableDjangoObjectType):
     @staticmethod
     def resolve_events(root: models.ExportFile, _info):
         return root.events.all().order_by("pk")
+
+
+class ImportEvent(CountableDjangoObjectType):
+    date = graphene.types.datetime.DateTime(
+        description="Date when event happened at in ISO 8601 format.",
+        required=True,
+    )
+    type = ImportEventEnum(description="Import event type.", required=True)
+    user = graphene.Field(
+        User, description="User who performed the action.", required=False
+    )
+    app = graphene.Field(
+        App, description="App which performed the action.", required=False
+    )
+    message = graphene.String(description="Content of the event.")
+    processed_rows = graphene.Int(description="Number of rows processed so far.")
+    imported_rows = graphene.Int(description="Number of rows imported so far.")
+    failed_rows = graphene.Int(description="Number of rows which failed so far.")
+
+    class Meta:
+        description = "History log of import file."
+        model = models.ImportEvent
+        interfaces = [graphene.relay.Node]
+        only_fields = ["id"]
+
+    @staticmethod
+    def resolve_user(root: models.ImportEvent, info):
+        requestor = get_user_or_app_from_context(info.context)
+        if requestor_has_access(requestor, root.user, AccountPermissions.MANAGE_STAFF):
+            return root.user
+        raise PermissionDenied()
+
+    @staticmethod
+    def resolve_app(root: models.ImportEvent, info):
+        requestor = get_user_or_app_from_context(info.context)
+        if requestor_has_access(requestor, root.user, AppPermission.MANAGE_APPS):
+            return root.app
+        raise PermissionDenied()
+
+    @staticmethod
+    def resolve_message(root: models.ImportEvent, _info):
+        return root.parameters.get("message", None)
+
+    @staticmethod
+    def resolve_processed_rows(root: models.ImportEvent, _info):
+        return root.parameters.get("processed_rows", None)
+
+    @staticmethod
+    def resolve_imported_rows(root: models.ImportEvent, _info):
+        return root.parameters.get("imported_rows", None)
+
+    @staticmethod
+    def resolve_failed_rows(root: models.ImportEvent, _info):
+        return root.parameters.get("failed_rows", None)
+
+
+class ImportFile(CountableDjangoObjectType):
+    url = graphene.String(description="The URL of the uploaded file.")
+    type = ImportTypeEnum(description="Type of imported data.", required=True)
+    error_url = graphene.String(
+        description="The URL of the report with rows which could not be imported."
+    )
+    processed_rows = graphene.Int(
+        description="Number of rows processed so far.", required=True
+    )
+    imported_rows = graphene.Int(
+        description="Number of rows imported so far.", required=True
+    )
+    failed_rows = graphene.Int(
+        description="Number of rows which could not be imported.", required=True
+    )
+    events = graphene.List(
+        graphene.NonNull(ImportEvent),
+        description="List of events associated with the import.",
+    )
+
+    class Meta:
+        description = "Represents a job data of imported file."
+        interfaces = [graphene.relay.Node, Job]
+        model = models.ImportFile
+        only_fields = ["id", "user", "app", "url"]
+
+    @staticmethod
+    def resolve_url(root: models.ImportFile, info):
+        return info.context.build_absolute_uri(root.content_file.url)
+
+    @staticmethod
+    def resolve_error_url(root: models.ImportFile, info):
+        error_file = root.error_file
+        if not error_file:
+            return None
+        return info.context.build_absolute_uri(error_file.url)
+
+    @staticmethod
+    def resolve_user(root: models.ImportFile, info):
+        requestor = get_user_or_app_from_context(info.context)
+        if requestor_has_access(requestor, root.user, AccountPermissions.MANAGE_STAFF):
+            return root.user
+        raise PermissionDenied()
+
+    @staticmethod
+    def resolve_app(root: models.ImportFile, info):
+        requestor = get_user_or_app_from_context(info.context)
+        if requestor_has_access(requestor, root.user, AccountPermissions.MANAGE_STAFF):
+            return (
+                AppByIdLoader(info.context).load(root.app_id) if root.app_id else None
+            )
+        raise PermissionDenied()
+
+    @staticmethod
+    def resolve_events(root: models.ImportFile, _info):
+        return root.events.all().order_by("pk")
@@ -8,6 +8,7 @@ from ....core.prices import quantize_price
 from ....order.error_codes import OrderErrorCode
 from ....order.models import FulfillmentStatus
 from ....payment import ChargeStatus, PaymentError
+from ....warehouse.management import recalculate_stocks_quantity_allocated
 from ....warehouse.models import Allocation, Stock
 from ...tests.utils import get_graphql_content
 
@@ -54,6 +55,7 @@ def test_fulfillment_refund_products_with_back_in_stock_webhook(
 ):
 
     Allocation.objects.update(quantity_allocated=5)
+    recalculate_stocks_quantity_allocated()
     payment_dummy.total = order_with_lines.total_gross_amount
     payment_dummy.captured_amount = payment_dummy.total
     payment_dummy.charge_status = ChargeStatus.FULLY_CHARGED
@@ -32,6 +32,7 @@ from ....payment.models import Payment
 from ....plugins.manager import PluginsManager
 from ....product.models import ProductVariant, ProductVariantChannelListing
 from ....shipping.models import ShippingMethod, ShippingMethodChannelListing
+from ....warehouse.management import recalculate_stocks_quantity_allocated
 from ....warehouse.models import Allocation, Stock, Warehouse
 from ....warehouse.tests.utils import get_available_quantity_for_stock
 from ...order.mutations.orders import (
@@ -3736,6 +3737,7 @@ def test_order_line_update_with_back_in_stock_webhook_called_once_success_scenar
     first_allocated = Allocation.objects.first()
     first_allocated.quantity_allocated = 5
     first_allocated.save()
+    recalculate_stocks_quantity_allocated()
 
     query = ORDER_LINE_UPDATE_MUTATION
     order = order_with_lines
@@ -3762,6 +3764,7 @@ def test_order_line_update_with_back_in_stock_webhook_called_twice_success_scena
     first_allocation = Allocation.objects.first()
     first_allocation.quantity_allocated = 5
     first_allocation.save()
+    recalculate_stocks_quantity_allocated()
 
     query = ORDER_LINE_UPDATE_MUTATION
     order = order_with_lines
@@ -1,5 +1,5 @@
 import graphene
-from django.forms.models import model_to_dict
+from django.core.exceptions import ValidationError
 from django.utils import timezone
 
 from saleor.core.permissions import ProductClassPermissions
@@ -16,8 +16,17 @@ from saleor.graphql.product.mutations.product_class_recommendation import (
     ProductClassRecommendationMixin,
 )
 from saleor.graphql.product.types import ProductClassRecommendation
+from saleor.graphql.product.types.product_class_recommendation import (
+    ProductClassRecommendationChangeStatusJob,
+)
 
-from ....product_class import ProductClassRecommendationStatus, models
+from ....core.exceptions import PermissionDenied
+from ....product_class import models
+from ....product_class.tasks import change_product_classes_status_task
+from ....product_class.utils import (
+    change_product_classes_status,
+    update_current_previous_for_product_classes,
+)
 from ..enums import ProductClassRecommendationEnum
 
 
@@ -99,6 +108,7 @@ class ProductClassRecommendationBulkCreate(BaseProductClassRecommendationBulk):
     def perform_mutation(cls, _root, info, **data):
         instances = cls.validate(_root, info, **data)
         data = models.ProductClassRecommendation.objects.bulk_create(instances)
+        update_current_previous_for_product_classes(data)
         return ProductClassRecommendationBulkCreate(
             count=len(data), product_class_recommendations=data
         )
@@ -143,6 +153,7 @@ class ProductClassRecommendationBulkUpdate(BaseProductClassRecommendationBulk):
                 "product_class_recommendation",
             ],
         )
+        update_current_previous_for_product_classes(instances)
         return ProductClassRecommendationBulkUpdate(
             count=len(instances), product_class_recommendations=instances
         )
@@ -163,10 +174,22 @@ class ProductClassRecommendationBulkDelete(ModelBulkDeleteMutation):
         error_type_class = ProductClassRecommendationError
         error_type_field = "product_class_recommendation_errors"
 
+    @classmethod
+    @traced_atomic_transaction()
+    def bulk_action(cls, info, queryset):
+        product_classes = list(queryset.only("id", "listing_id"))
+        queryset.delete()
+        update_current_previous_for_product_classes(product_classes)
+
 
 class ProductClassRecommendationBulkChangeStatus(
     BaseBulkMutation, ProductClassRecommendationChangeStatusMixin
 ):
+    job = graphene.Field(
+        ProductClassRecommendationChangeStatusJob,
+        description="Job processing the change, when run in background.",
+    )
+
     class Arguments:
         ids = graphene.List(
             graphene.NonNull(graphene.ID),
@@ -177,6 +200,13 @@ class ProductClassRecommendationBulkChangeStatus(
             required=True,
             description="Status of product class to update status.",
         )
+        background = graphene.Boolean(
+            default_value=False,
+            description=(
+                "Change the status in a background job and return it immediately. "
+                "Already approved product classes are skipped by the job."
+            ),
+        )
 
     class Meta:
         model = models.ProductClassRecommendation
@@ -192,58 +222,39 @@ class ProductClassRecommendationBulkChangeStatus(
         cls.check_instance(instance)
 
     @classmethod
-    def save_bulk_metadata(cls, listing_ids):
-        group_data_by_listing = {}
-        # each listing have 1 or 2 row is True
-        product_classes = (
-            models.ProductClassRecommendation.objects.qs_filter_current_previous(
-                order_by="approved_at desc",
-                filter_row_number="<= 2",
-                list_status=[
-                    ProductClassRecommendationStatus.APPROVED,
-                ],
-            )
-            .filter(
-                status=ProductClassRecommendationStatus.APPROVED,
-                listing_id__in=listing_ids,
-            )
-            .order_by("-approved_at")
+    def mutate(cls, root, info, **data):
+        if not data.get("background"):
+            return super().mutate(root, info, **data)
+
+        if not cls.check_permissions(info.context):
+            raise PermissionDenied()
+        try:
+            job = cls.start_change_status_job(info, **data)
+        except ValidationError as error:
+            return cls.handle_errors(error, count=0)
+        return cls(errors=[], count=job.total_count, job=job)
+
+    @classmethod
+    def start_change_status_job(cls, info, ids, status, **_data):
+        cls.check_permission_change_status(info, status)
+        pks = cls.get_global_ids_or_error(ids, only_type=ProductClassRecommendation)
+        product_class_ids = list(dict.fromkeys(int(pk) for pk in pks))
+
+        app = info.context.app
+        kwargs = {"app": app} if app else {"user": info.context.user}
+        job = models.ProductClassRecommendationChangeStatusJob.objects.create(
+            product_class_status=status,
+            product_class_ids=product_class_ids,
+            total_count=len(product_class_ids),
+            **kwargs,
         )
-        # because loop order by approved_at => only get 1 or 2 value in dict
-        for item in product_classes:
-            if item.listing_id not in group_data_by_listing.keys():
-                group_data_by_listing[item.listing_id] = [model_to_dict(item)]
-            else:
-                group_data_by_listing[item.listing_id].append(model_to_dict(item))
-
-        # TODO: (issue performance) Update many value different with many id different
-        for key, values in group_data_by_listing.items():
-            obj_metadata = {
-                "current": cls.fields_save_metadata(values[0]),
-            }
-            if len(values) > 1:
-                obj_metadata["previous"] = cls.fields_save_metadata(values[1])
-
-            listing = models.ProductVariantChannelListing.objects.get(id=key)
-            listing.store_value_in_metadata({"product_class": obj_metadata})
-            listing.save()
-        return True
+        change_product_classes_status_task.delay(job.pk)
+        return job
 
     @classmethod
-    @traced_atomic_transaction()
     def bulk_action(cls, info, queryset, **data):
-        listing_ids = []
         status = data.get("status")
         cls.validate(info, data)
-        user = info.context.user
-        obj_update = {
-            "updated_by_id": user.id,
-            "status": status,
-            "updated_at": timezone.datetime.now(),
-        }
-        if status == ProductClassRecommendationStatus.APPROVED:
-            obj_update["approved_by_id"] = user.id
-            obj_update["approved_at"] = timezone.datetime.now()
-            listing_ids = queryset.values_list("listing_id", flat=True)
-        queryset.update(**obj_update)
-        cls.save_bulk_metadata(listing_ids)
+        change_product_classes_status(
+            queryset.values_list("id", flat=True), status, info.context.user.id
+        )
@@ -1,5 +1,9 @@
+from collections import defaultdict
+
 import graphene
+from django.core.exceptions import ValidationError
 from django.utils import timezone
+from graphql.error import GraphQLError
 
 from saleor.graphql.core.mutations import ModelBulkDeleteMutation, ModelMutation
 from saleor.graphql.product.mutations.product_max_min import (
@@ -10,8 +14,13 @@ from saleor.graphql.product.types.product_max_min import ProductMaxMin
 
 from ....core.permissions import ProductMaxMinPermissions
 from ....core.tracing import traced_atomic_transaction
+from ....product import models as product_models
 from ....product_max_min import models
-from ...core.types.common import ProductMaxMinError
+from ....product_max_min.error_codes import ProductMaxMinErrorCode
+from ....product_max_min.utils import update_current_previous_for_products_max_min
+from ...core.types.common import BulkProductMaxMinError, ProductMaxMinError
+from ...core.utils import from_global_id_or_error
+from ..types.channels import ProductVariantChannelListing
 
 
 class ProductMaxMinBulkUpdateInput(ProductMaxMinInput):
@@ -35,28 +44,122 @@ class BaseProductMaxMinBulk(ModelMutation, ProductMaxMinMixin):
         abstract = True
 
     @classmethod
-    def config_input_cls(cls):
+    def add_field_user(cls, cleaned_input, data):
         raise NotImplementedError
 
     @classmethod
-    def add_field_user(cls, cleaned_input, data):
+    def get_instances(cls, data, errors):
+        """Return instances to modify, indexed by the position of an input item."""
         raise NotImplementedError
 
     @classmethod
-    def validate(cls, _root, info, **data):
-        instances = []
-        data = data.get("input")
-        input_cls = cls.config_input_cls()
+    def resolve_pks(cls, global_ids, only_type, field, errors):
+        """Decode global IDs, reporting invalid ones with the input item index."""
+        pks = {}
+        for index, global_id in enumerate(global_ids):
+            try:
+                _, pk = from_global_id_or_error(global_id, only_type, raise_error=True)
+            except GraphQLError as e:
+                errors[field].append(
+                    ValidationError(
+                        str(e),
+                        code=ProductMaxMinErrorCode.GRAPHQL_ERROR.value,
+                        params={"index": index},
+                    )
+                )
+            else:
+                pks[index] = int(pk)
+        return pks
+
+    @classmethod
+    def get_listings(cls, data, errors):
+        listing_pks = cls.resolve_pks(
+            [item["listing"] for item in data],
+            ProductVariantChannelListing,
+            "listing",
+            errors,
+        )
+        listings = product_models.ProductVariantChannelListing.objects.in_bulk(
+            set(listing_pks.values())
+        )
+        for index, pk in listing_pks.items():
+            if pk not in listings:
+                errors["listing"].append(
+                    ValidationError(
+                        f"Couldn't resolve to a node: {data[index]['listing']}",
+                        code=ProductMaxMinErrorCode.NOT_FOUND.value,
+                        params={"index": index},
+                    )
+                )
+        return {
+            index: listings[pk] for index, pk in listing_pks.items() if pk in listings
+        }
+
+    @classmethod
+    def clean_levels(cls, index, instance, item, errors):
+        max_level = item.get("max_level")
+        min_level = item.get("min_level")
+        for field, level in [("min_level", min_level), ("max_level", max_level)]:
+            if level is not None and level < 0:
+                errors[field].append(
+                    ValidationError(
+                        "The level must be a positive number",
+                        code=ProductMaxMinErrorCode.INVALID.value,
+                        params={"index": index},
+                    )
+                )
+                return False
+        try:
+            cls.validate_product_max_min(instance, item)
+        except ValidationError as error:
+            for field, field_errors in error.error_dict.items():
+                errors[field].extend(
+                    ValidationError(
+                        field_error.message,
+                        code=field_error.code,
+                        params={"index": index},
+                    )
+                    for field_error in field_errors
+                )
+            return False
+        return True
+
+    @classmethod
+    def validate(cls, info, data, errors):
+        """Validate all input items at once.
+
+        Listings and instances are fetched with one query each. Items with
+        errors are skipped and reported with their index, the others are
+        returned ready to be saved.
+        """
         user = info.context.user
-        for item in data:
-            instance = cls.get_instance(info, **item)
-            cleaned_input = cls.clean_input(info, instance, item, input_cls=input_cls)
-            cls.validate_product_max_min(instance, cleaned_input)
+        instances = cls.get_instances(data, errors)
+        listings = cls.get_listings(data, errors)
+
+        valid_instances = []
+        for index, item in enumerate(data):
+            instance = instances.get(index)
+            listing = listings.get(index)
+            if instance is None or listing is None:
+                continue
+            if not cls.clean_levels(index, instance, item, errors):
+                continue
+            cleaned_input = {
+                field: item[field]
+                for field in ["min_level", "max_level"]
+                if item.get(field) is not None
+            }
+            cleaned_input["listing"] = listing
             cleaned_input = cls.add_field_user(cleaned_input, user)
-            instance = cls.construct_instance(instance, cleaned_input)
-            cls.clean_instance(info, instance)
-            instances.append(instance)
-        return instances
+            valid_instances.append(cls.construct_instance(instance, cleaned_input))
+        return valid_instances
+
+    @classmethod
+    def success_response(cls, instances, errors):
+        response = {"count": len(instances), "products_max_min": instances}
+        if errors:
+            return cls.handle_errors(ValidationError(errors), **response)
+        return cls(**response)
 
 
 class ProductMaxMinBulkCreate(BaseProductMaxMinBulk):
@@ -71,24 +174,26 @@ class ProductMaxMinBulkCreate(BaseProductMaxMinBulk):
         model = models.ProductMaxMin
         description = "Creates product max min."
         permissions = (ProductMaxMinPermissions.MANAGE_PRODUCT_MAX_MIN,)
-        error_type_class = ProductMaxMinError
+        error_type_class = BulkProductMaxMinError
         error_type_field = "product_class_max_min_errors"
 
-    @classmethod
-    def config_input_cls(cls):
-        return ProductMaxMinInput
-
     @classmethod
     def add_field_user(cls, cleaned_input, data):
         cleaned_input["created_by"] = data
         return cleaned_input
 
+    @classmethod
+    def get_instances(cls, data, errors):
+        return {index: models.ProductMaxMin() for index in range(len(data))}
+
     @classmethod
     @traced_atomic_transaction()
     def perform_mutation(cls, _root, info, **data):
-        instances = cls.validate(_root, info, **data)
-        data = models.ProductMaxMin.objects.bulk_create(instances)
-        return ProductMaxMinBulkCreate(count=len(data), products_max_min=data)
+        errors = defaultdict(list)
+        instances = cls.validate(info, data["input"], errors)
+        instances = models.ProductMaxMin.objects.bulk_create(instances)
+        update_current_previous_for_products_max_min(instances)
+        return cls.success_response(instances, errors)
 
 
 class ProductMaxMinBulkUpdate(BaseProductMaxMinBulk):
@@ -103,22 +208,46 @@ class ProductMaxMinBulkUpdate(BaseProductMaxMinBulk):
         model = models.ProductMaxMin
         description = "Update product max min."
         permissions = (ProductMaxMinPermissions.MANAGE_PRODUCT_MAX_MIN,)
-        error_type_class = ProductMaxMinError
+        error_type_class = BulkProductMaxMinError
         error_type_field = "product_class_max_min_errors"
 
-    @classmethod
-    def config_input_cls(cls):
-        return ProductMaxMinBulkUpdateInput
-
     @classmethod
     def add_field_user(cls, cleaned_input, data):
         cleaned_input["updated_by"] = data
         return cleaned_input
 
+    @classmethod
+    def get_instances(cls, data, errors):
+        pks = cls.resolve_pks(
+            [item["id"] for item in data], ProductMaxMin, "id", errors
+        )
+        instances = models.ProductMaxMin.objects.in_bulk(set(pks.values()))
+        used_pks = set()
+        for index, pk in list(pks.items()):
+            error = None
+            if pk not in instances:
+                error = ValidationError(
+                    f"Couldn't resolve to a node: {data[index]['id']}",
+                    code=ProductMaxMinErrorCode.NOT_FOUND.value,
+                    params={"index": index},
+                )
+            elif pk in used_pks:
+                error = ValidationError(
+                    "Duplicated product max min ID.",
+                    code=ProductMaxMinErrorCode.UNIQUE.value,
+                    params={"index": index},
+                )
+            if error:
+                errors["id"].append(error)
+                del pks[index]
+            used_pks.add(pk)
+        return {index: instances[pk] for index, pk in pks.items()}
+
     @classmethod
     @traced_atomic_transaction()
     def perform_mutation(cls, _root, info, **data):
-        instances = cls.validate(_root, info, **data)
+        errors = defaultdict(list)
+        instances = cls.validate(info, data["input"], errors)
         for instance in instances:
             instance.updated_at = timezone.datetime.now()
         models.ProductMaxMin.objects.bulk_update(
@@ -127,9 +256,12 @@ class ProductMaxMinBulkUpdate(BaseProductMaxMinBulk):
                 "min_level",
                 "max_level",
                 "listing_id",
+                "updated_by_id",
+                "updated_at",
             ],
         )
-        return ProductMaxMinBulkUpdate(count=len(instances), products_max_min=instances)
+        update_current_previous_for_products_max_min(instances)
+        return cls.success_response(instances, errors)
 
 
 class ProductMaxMinBulkDelete(ModelBulkDeleteMutation):
@@ -146,3 +278,10 @@ class ProductMaxMinBulkDelete(ModelBulkDeleteMutation):
         permissions = (ProductMaxMinPermissions.MANAGE_PRODUCT_MAX_MIN,)
         error_type_class = ProductMaxMinError
         error_type_field = "product_class_max_min_errors"
+
+    @classmethod
+    @traced_atomic_transaction()
+    def bulk_action(cls, info, queryset):
+        products_max_min = list(queryset.only("id", "listing_id"))
+        queryset.delete()
+        update_current_previous_for_products_max_min(products_max_min)
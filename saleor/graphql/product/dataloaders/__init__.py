@@ -4,7 +4,10 @@ from .attributes import (
     SelectedAttributesByProductVariantIdLoader,
     VariantAttributesByProductTypeIdLoader,
 )
-from .product_class_recommendation import ProductClassRecommendationIdLoader
+from .product_class_recommendation import (
+    ProductClassCurrentPreviousByListingIdAndTypeLoader,
+)
+from .product_max_min import PreviousProductMaxMinByListingIdAndFilterLoader
 from .products import (
     AvailableProductVariantsByProductIdAndChannel,
     CategoryByIdLoader,
@@ -75,5 +78,6 @@ __all__ = [
     "VariantsChannelListingByProductIdAndChannelSlugLoader",
     "ProductVariantsByProductIdAndChannel",
     "AvailableProductVariantsByProductIdAndChannel",
-    "ProductClassRecommendationIdLoader",
+    "ProductClassCurrentPreviousByListingIdAndTypeLoader",
+    "PreviousProductMaxMinByListingIdAndFilterLoader",
 ]
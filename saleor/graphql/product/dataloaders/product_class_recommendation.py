@@ -1,25 +1,29 @@
-from django.db.models import F
+from collections import defaultdict
 
-from saleor.graphql.core.dataloaders import DataLoader
-from saleor.product_class import ProductClassRecommendationStatus
-from saleor.product_class.models import ProductClassRecommendation
+from ....product_class.models import ProductClassRecommendationCurrentPrevious
+from ...core.dataloaders import DataLoader
 
 
-class ProductClassRecommendationIdLoader(DataLoader):
-    context_key = "product_class_recommendation_id_loader"
+class ProductClassCurrentPreviousByListingIdAndTypeLoader(DataLoader):
+    """Load current/previous product class pointers of listings.
+
+    Keys are `(listing_id, type)` tuples, where `type` is one of
+    `ProductClassCurrentPreviousType`. Current and previous recommendations are
+    fetched in the same query.
+    """
+
+    context_key = "product_class_current_previous_by_listing_id_and_type"
 
     def batch_load(self, keys):
-        product_classes = ProductClassRecommendation.objects.query_add_row_number(
-            [F("created_at").desc()]
-        ).filter(
-            listing_id__in=keys,
-            status__in=[
-                ProductClassRecommendationStatus.APPROVED,
-                ProductClassRecommendationStatus.SUBMITTED,
-            ],
-        )
-        product_classes_previous = [item for item in product_classes if item.selected]
-        product_classes_map = {}
-        for product_class_obj in product_classes_previous:
-            product_classes_map[product_class_obj.listing_id] = product_class_obj
-        return [product_classes_map.get(listing_id, {}) for listing_id in keys]
+        listing_ids_by_type = defaultdict(list)
+        for listing_id, type_ in keys:
+            listing_ids_by_type[type_].append(listing_id)
+
+        pointers_map = {}
+        for type_, listing_ids in listing_ids_by_type.items():
+            pointers = ProductClassRecommendationCurrentPrevious.objects.filter(
+                listing_id__in=listing_ids, type=type_
+            ).select_related("current", "previous")
+            for pointer in pointers:
+                pointers_map[(pointer.listing_id, type_)] = pointer
+        return [pointers_map.get(key) for key in keys]
@@ -0,0 +1,37 @@
+import json
+from collections import defaultdict
+
+from ....product_max_min.models import ProductMaxMin
+from ...core.dataloaders import DataLoader
+
+
+class PreviousProductMaxMinByListingIdAndFilterLoader(DataLoader):
+    """Load the previous product max min of listings matching a filter.
+
+    Keys are `(listing_id, filter)` tuples, where `filter` is the JSON encoded
+    `ProductMaxMinFilterInput` of the query, so one query is made per filter.
+    """
+
+    context_key = "previous_product_max_min_by_listing_id_and_filter"
+
+    def batch_load(self, keys):
+        # imported here to avoid a circular import through the product filters
+        from ..filters_product_max_min import BaseProductMaxMinFilter
+
+        listing_ids_by_filter = defaultdict(list)
+        for listing_id, filter_data in keys:
+            listing_ids_by_filter[filter_data].append(listing_id)
+
+        previous_map = {}
+        for filter_data, listing_ids in listing_ids_by_filter.items():
+            products_max_min = ProductMaxMin.objects.filter(
+                listing_previous__listing_id__in=listing_ids
+            )
+            products_max_min = BaseProductMaxMinFilter(
+                data=json.loads(filter_data), queryset=products_max_min
+            ).qs
+            for product_max_min in products_max_min:
+                previous_map[
+                    (product_max_min.listing_id, filter_data)
+                ] = product_max_min
+        return [previous_map.get(key) for key in keys]
@@ -5,9 +5,8 @@ from typing import Dict, Iterable, List, Optional
 import django_filters
 import graphene
 from django.contrib.postgres.search import SearchQuery, SearchRank
-from django.db.models import Exists, F, FloatField, OuterRef, Q, Subquery, Sum
-from django.db.models.fields import IntegerField
-from django.db.models.functions import Cast, Coalesce
+from django.db.models import Exists, F, FloatField, OuterRef, Q, Sum
+from django.db.models.functions import Cast
 from graphene_django.filter import GlobalIDMultipleChoiceFilter
 
 from ...attribute import AttributeInputType
@@ -30,7 +29,7 @@ from ...product.models import (
     ProductVariant,
     ProductVariantChannelListing,
 )
-from ...warehouse.models import Allocation, Stock
+from ...warehouse.models import Stock
 from ..channel.filters import get_channel_slug_from_filter_data
 from ..core.filters import (
     EnumFilter,
@@ -292,16 +291,9 @@ def filter_products_by_collections(qs, collection_pks):
 
 
 def filter_products_by_stock_availability(qs, stock_availability, channel_slug):
-    allocations = (
-        Allocation.objects.values("stock_id")
-        .filter(quantity_allocated__gt=0, stock_id=OuterRef("pk"))
-        .values_list(Sum("quantity_allocated"))
-    )
-    allocated_subquery = Subquery(queryset=allocations, output_field=IntegerField())
-
     stocks = list(
         Stock.objects.for_channel(channel_slug)
-        .filter(quantity__gt=Coalesce(allocated_subquery, 0))
+        .filter(quantity__gt=F("quantity_allocated"))
         .values_list("product_variant_id", flat=True)
     )
 
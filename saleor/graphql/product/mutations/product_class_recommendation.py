@@ -20,6 +20,11 @@ from saleor.product_class import ProductClassRecommendationStatus
 from ....core.exceptions import PermissionDenied
 from ....product_class import models
 from ....product_class.error_codes import ProductClassRecommendationErrorCode
+from ....product_class.utils import (
+    get_product_class_metadata_fields,
+    update_current_previous_for_product_classes,
+    update_product_classes_current_previous,
+)
 from ..enums import ProductClassRecommendationEnum
 
 
@@ -80,13 +85,7 @@ class ProductClassRecommendationChangeStatusMixin:
 
     @classmethod
     def fields_save_metadata(cls, data):
-        return {
-            "product_class_qty": data["product_class_qty"],
-            "product_class_value": data["product_class_value"],
-            "product_class_recommendation": data["product_class_recommendation"],
-            "status": data["status"],
-            "approved_at": data["approved_at"],
-        }
+        return get_product_class_metadata_fields(data)
 
     @classmethod
     def check_instance(cls, instance):
@@ -125,6 +124,7 @@ class BaseProductClassRecommendation(ModelMutation, ProductClassRecommendationMi
     @traced_atomic_transaction()
     def save(cls, info, instance, cleaned_input):
         instance.save()
+        update_current_previous_for_product_classes([instance])
 
 
 class ProductClassRecommendationCreate(BaseProductClassRecommendation):
@@ -188,6 +188,11 @@ class ProductClassRecommendationDelete(ModelDeleteMutation):
     def perform_mutation(cls, _root, info, **data):
         return super().perform_mutation(info, info, **data)
 
+    @classmethod
+    def success_response(cls, instance):
+        update_current_previous_for_product_classes([instance])
+        return super().success_response(instance)
+
 
 class ProductClassRecommendationChangeStatus(
     BaseMutation, ProductClassRecommendationChangeStatusMixin
@@ -254,6 +259,7 @@ class ProductClassRecommendationChangeStatus(
             product_class.approved_at = timezone.datetime.now()
 
         product_class.save()
+        update_product_classes_current_previous([product_class.listing_id])
         transaction.on_commit(lambda: cls.update_metadata(product_class))
         return ProductClassRecommendationChangeStatus(
             product_class_recommendation=product_class
@@ -4,8 +4,10 @@ from django.core.exceptions import ValidationError
 from saleor.graphql.core.mutations import ModelDeleteMutation, ModelMutation
 
 from ....core.permissions import ProductMaxMinPermissions
+from ....core.tracing import traced_atomic_transaction
 from ....product_max_min import models
 from ....product_max_min.error_codes import ProductMaxMinErrorCode
+from ....product_max_min.utils import update_current_previous_for_products_max_min
 from ...core.types.common import ProductMaxMinError
 from ..types.product_max_min import ProductMaxMin
 
@@ -65,6 +67,12 @@ class BaseProductMaxMin(ModelMutation, ProductMaxMinMixin):
         cleaned_input = cls.add_field_user(cleaned_input, user)
         return cleaned_input
 
+    @classmethod
+    @traced_atomic_transaction()
+    def save(cls, info, instance, cleaned_input):
+        instance.save()
+        update_current_previous_for_products_max_min([instance])
+
 
 class ProductMaxMinCreate(BaseProductMaxMin):
     class Arguments:
@@ -117,3 +125,13 @@ class ProductMaxMinDelete(ModelDeleteMutation):
         permissions = (ProductMaxMinPermissions.MANAGE_PRODUCT_MAX_MIN,)
         error_type_class = ProductMaxMinError
         error_type_field = "product_max_min_errors"
+
+    @classmethod
+    @traced_atomic_transaction()
+    def perform_mutation(cls, _root, info, **data):
+        return super().perform_mutation(_root, info, **data)
+
+    @classmethod
+    def success_response(cls, instance):
+        update_current_previous_for_products_max_min([instance])
+        return super().success_response(instance)
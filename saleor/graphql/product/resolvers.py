@@ -6,7 +6,10 @@ from ...core.tracing import traced_resolver
 from ...order import OrderStatus
 from ...order.models import Order
 from ...product import models
-from ...product_class.models import ProductClassRecommendation
+from ...product_class.models import (
+    ProductClassRecommendation,
+    ProductClassRecommendationChangeStatusJob,
+)
 from ...product_max_min.models import ProductMaxMin
 from ..channel import ChannelQsContext
 from ..core.utils import from_global_id_or_error
@@ -181,16 +184,13 @@ def resolve_product_class_recommendation(pk):
     return ProductClassRecommendation.objects.filter(id=pk).first()
 
 
+def resolve_product_class_recommendation_change_status_job(pk):
+    return ProductClassRecommendationChangeStatusJob.objects.filter(id=pk).first()
+
+
 def resolve_current_previous_product_classes(info, **kwargs):
     list_status = check_permission_product_class_approved(info)
-    product_classes = ProductClassRecommendation.objects.qs_filter_current_previous(
-        order_by="created_at desc",
-        filter_row_number="<= 2",
-        list_status=list_status,
-    ).filter(
-        status__in=list_status,
-    )
-    return product_classes
+    return ProductClassRecommendation.objects.qs_current_previous(list_status)
 
 
 def resolve_product_max_min(pk):
@@ -198,5 +198,4 @@ def resolve_product_max_min(pk):
 
 
 def resolve_current_previous_products_max_min(info, **kwargs):
-    current_ids, _ = ProductMaxMin.objects.get_current_previous_ids()
-    return ProductMaxMin.objects.filter(id__in=current_ids)
+    return ProductMaxMin.objects.qs_current()
@@ -131,6 +131,7 @@ from .resolvers import (
     resolve_product_by_id,
     resolve_product_by_slug,
     resolve_product_class_recommendation,
+    resolve_product_class_recommendation_change_status_job,
     resolve_product_class_recommendations,
     resolve_product_max_min,
     resolve_product_type_by_id,
@@ -158,7 +159,10 @@ from .types import (
     ProductType,
     ProductVariant,
 )
-from .types.product_class_recommendation import CurrentPreviousProductClass
+from .types.product_class_recommendation import (
+    CurrentPreviousProductClass,
+    ProductClassRecommendationChangeStatusJob,
+)
 from .types.product_max_min import CurrentPreviousProductMaxMin, ProductMaxMin
 
 
@@ -438,6 +442,14 @@ class ProductClassRecommendationQueries(graphene.ObjectType):
         description="Product class recommendation.",
     )
 
+    product_class_recommendation_change_status_job = graphene.Field(
+        ProductClassRecommendationChangeStatusJob,
+        id=graphene.Argument(
+            graphene.ID, description="ID of the change status job.", required=True
+        ),
+        description="Look up a product class change status job by ID.",
+    )
+
     current_previous_product_classes = CurrentPreviousFilterConnectionField(
         CurrentPreviousProductClass,
         filter=ProductClassRecommendationFilterInput(
@@ -459,6 +471,11 @@ class ProductClassRecommendationQueries(graphene.ObjectType):
         _, pk = from_global_id(pk)
         return resolve_product_class_recommendation(pk)
 
+    @permission_required(ProductClassPermissions.MANAGE_PRODUCT_CLASS)
+    def resolve_product_class_recommendation_change_status_job(self, info, id):
+        _, id = from_global_id_or_error(id, ProductClassRecommendationChangeStatusJob)
+        return resolve_product_class_recommendation_change_status_job(id)
+
     @permission_required(ProductClassPermissions.MANAGE_PRODUCT_CLASS)
     def resolve_current_previous_product_classes(self, info, **kwargs):
         return resolve_current_previous_product_classes(info, **kwargs)
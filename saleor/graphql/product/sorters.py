@@ -263,6 +263,7 @@ class ProductClassRecommendationSortField(graphene.Enum):
     INFO = ["product_class_qty", "product_class_value", "product_class_recommendation"]
     STATUS = ["status"]
     DATETIME = ["created_at", "updated_at", "approved_at"]
+    LISTING = ["listing_id", "created_at", "pk"]
 
     @property
     def description(self):
@@ -271,6 +272,7 @@ class ProductClassRecommendationSortField(graphene.Enum):
             ProductTypeSortField.INFO.name: "info",
             ProductTypeSortField.STATUS.name: "status",
             ProductTypeSortField.DATETIME.name: "datetime",
+            ProductClassRecommendationSortField.LISTING.name: "listing",
         }
         if self.name in descriptions:
             return f"Sort products by {descriptions[self.name]}."
@@ -133,7 +133,11 @@ def test_category_view(api_client, category_with_products, count_queries, channe
 
 @pytest.mark.django_db
 @pytest.mark.count_queries(autouse=False)
-def test_categories_children(api_client, categories_with_children, count_queries):
+def test_categories_children(
+    api_client, categories_with_children, count_queries, settings
+):
+    # nested pagination of 30 children of 30 categories exceeds the default cost
+    settings.GRAPHQL_QUERY_MAX_COST = 100000
     query = """query categories {
         categories(first: 30) {
           edges {
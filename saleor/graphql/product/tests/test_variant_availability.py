@@ -1,5 +1,7 @@
 import graphene
+from django.db import connection
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django_countries import countries
 
 from ....shipping.models import ShippingZone
@@ -214,3 +216,55 @@ def test_variant_quantity_available_without_inventory_tracking_and_stocks(
     variant_data = content["data"]["productVariant"]
     assert variant_data["deprecatedByCountry"] == settings.MAX_CHECKOUT_LINE_QUANTITY
     assert variant_data["byAddress"] == settings.MAX_CHECKOUT_LINE_QUANTITY
+
+
+@override_settings(RESERVE_STOCK_DURATION=5)
+def test_variant_quantity_available_with_reservations(
+    api_client, checkout_line_with_reservation_in_many_stocks, channel_USD
+):
+    variant = checkout_line_with_reservation_in_many_stocks.variant
+    variables = {
+        "id": graphene.Node.to_global_id("ProductVariant", variant.pk),
+        "address": {"country": COUNTRY_CODE},
+        "channel": channel_USD.slug,
+    }
+    response = api_client.post_graphql(QUERY_VARIANT_AVAILABILITY, variables)
+    content = get_graphql_content(response)
+    variant_data = content["data"]["productVariant"]
+    assert variant_data["byAddress"] == 4
+
+
+QUERY_PRODUCTS_VARIANTS_AVAILABILITY = """
+    query productsAvailability($address: AddressInput, $channel: String) {
+        products(first: 10, channel: $channel) {
+            edges {
+                node {
+                    variants {
+                        quantityAvailable(address: $address)
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+@override_settings(MAX_CHECKOUT_LINE_QUANTITY=150)
+def test_variants_quantity_available_with_country_code_in_single_query(
+    api_client, product_list, channel_USD
+):
+    variables = {"address": {"country": COUNTRY_CODE}, "channel": channel_USD.slug}
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.post_graphql(
+            QUERY_PRODUCTS_VARIANTS_AVAILABILITY, variables
+        )
+
+    content = get_graphql_content(response)
+    products = content["data"]["products"]["edges"]
+    assert len(products) == len(product_list)
+    for product in products:
+        assert product["node"]["variants"] == [{"quantityAvailable": 100}]
+    stock_queries = [
+        query for query in queries if 'FROM "warehouse_stock"' in query["sql"]
+    ]
+    assert len(stock_queries) == 1
@@ -3,9 +3,16 @@ from graphene import relay
 from graphene_federation import key
 
 from ....core.permissions import ProductClassPermissions
-from ....product_class import ProductClassRecommendationStatus, models
+from ....product_class import ProductClassCurrentPreviousType, models
+from ...account.dataloaders import UserByUserIdLoader
 from ...account.types import User
 from ...core.connection import CountableDjangoObjectType
+from ...core.types.common import Job
+from ..dataloaders import (
+    ProductClassCurrentPreviousByListingIdAndTypeLoader,
+    ProductVariantChannelListingByIdLoader,
+)
+from ..enums import ProductClassRecommendationEnum
 from .channels import ProductVariantChannelListing
 
 
@@ -50,6 +57,30 @@ class ProductClassRecommendation(CountableDjangoObjectType):
         interfaces = [relay.Node]
         model = models.ProductClassRecommendation
 
+    @staticmethod
+    def resolve_listing(root: models.ProductClassRecommendation, info, **_kwargs):
+        return ProductVariantChannelListingByIdLoader(info.context).load(
+            root.listing_id
+        )
+
+    @staticmethod
+    def resolve_created_by(root: models.ProductClassRecommendation, info, **_kwargs):
+        if not root.created_by_id:
+            return None
+        return UserByUserIdLoader(info.context).load(root.created_by_id)
+
+    @staticmethod
+    def resolve_updated_by(root: models.ProductClassRecommendation, info, **_kwargs):
+        if not root.updated_by_id:
+            return None
+        return UserByUserIdLoader(info.context).load(root.updated_by_id)
+
+    @staticmethod
+    def resolve_approved_by(root: models.ProductClassRecommendation, info, **_kwargs):
+        if not root.approved_by_id:
+            return None
+        return UserByUserIdLoader(info.context).load(root.approved_by_id)
+
 
 @key(fields="id")
 class CurrentPreviousProductClass(CountableDjangoObjectType):
@@ -63,36 +94,46 @@ class CurrentPreviousProductClass(CountableDjangoObjectType):
 
     @staticmethod
     def resolve_product_class_current(
-        root: models.ProductClassRecommendation, _info, **_kwargs
+        root: models.ProductClassRecommendation, info, **_kwargs
     ):
-        product_classes = (
-            models.ProductClassRecommendation.objects.qs_filter_current_previous(
-                order_by="created_at desc",
-                filter_row_number="= 1",
-                list_status=[
-                    ProductClassRecommendationStatus.APPROVED,
-                    ProductClassRecommendationStatus.SUBMITTED,
-                ],
-            ).filter(listing_id=root.listing_id)
+        return (
+            ProductClassCurrentPreviousByListingIdAndTypeLoader(info.context)
+            .load((root.listing_id, ProductClassCurrentPreviousType.SUBMITTED_APPROVED))
+            .then(lambda pointer: pointer.current if pointer else None)
         )
-        return product_classes.first()
 
     @staticmethod
     def resolve_product_class_previous(
-        root: models.ProductClassRecommendation, _info, **_kwargs
+        root: models.ProductClassRecommendation, info, **_kwargs
     ):
         permissions = (ProductClassPermissions.APPROVE_PRODUCT_CLASS,)
-        if not _info.context.user.has_perms(permissions):
+        if not info.context.user.has_perms(permissions):
             return None
 
-        product_classes = (
-            models.ProductClassRecommendation.objects.qs_filter_current_previous(
-                order_by="created_at desc",
-                filter_row_number="= 2",
-                list_status=[
-                    ProductClassRecommendationStatus.APPROVED,
-                    ProductClassRecommendationStatus.SUBMITTED,
-                ],
-            ).filter(listing_id=root.listing_id)
+        return (
+            ProductClassCurrentPreviousByListingIdAndTypeLoader(info.context)
+            .load((root.listing_id, ProductClassCurrentPreviousType.SUBMITTED_APPROVED))
+            .then(lambda pointer: pointer.previous if pointer else None)
         )
-        return product_classes.first()
+
+
+class ProductClassRecommendationChangeStatusJob(CountableDjangoObjectType):
+    product_class_status = ProductClassRecommendationEnum(
+        description="Status the product classes are changed to.", required=True
+    )
+    total_count = graphene.Int(
+        description="Number of product classes to process.", required=True
+    )
+    processed_count = graphene.Int(
+        description="Number of product classes processed so far.", required=True
+    )
+    updated_count = graphene.Int(
+        description="Number of product classes which status was changed.",
+        required=True,
+    )
+
+    class Meta:
+        description = "Represents a job changing status of product classes."
+        interfaces = [relay.Node, Job]
+        model = models.ProductClassRecommendationChangeStatusJob
+        only_fields = ["id"]
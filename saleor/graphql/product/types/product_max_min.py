@@ -1,3 +1,5 @@
+import json
+
 import graphene
 from graphene_federation import key
 
@@ -5,7 +7,12 @@ from saleor.graphql.core.connection import CountableDjangoObjectType
 from saleor.graphql.product.types import ProductVariantChannelListing
 
 from ....product_max_min import models
+from ...account.dataloaders import UserByUserIdLoader
 from ...account.types import User
+from ..dataloaders import (
+    PreviousProductMaxMinByListingIdAndFilterLoader,
+    ProductVariantChannelListingByIdLoader,
+)
 from ..filters_product_max_min import BaseProductMaxMinFilter
 
 
@@ -37,6 +44,24 @@ class ProductMaxMin(CountableDjangoObjectType):
         interfaces = [graphene.relay.Node]
         model = models.ProductMaxMin
 
+    @staticmethod
+    def resolve_listing(root: models.ProductMaxMin, info, **_kwargs):
+        return ProductVariantChannelListingByIdLoader(info.context).load(
+            root.listing_id
+        )
+
+    @staticmethod
+    def resolve_created_by(root: models.ProductMaxMin, info, **_kwargs):
+        if not root.created_by_id:
+            return None
+        return UserByUserIdLoader(info.context).load(root.created_by_id)
+
+    @staticmethod
+    def resolve_updated_by(root: models.ProductMaxMin, info, **_kwargs):
+        if not root.updated_by_id:
+            return None
+        return UserByUserIdLoader(info.context).load(root.updated_by_id)
+
 
 @key(fields="id")
 class CurrentPreviousProductMaxMin(CountableDjangoObjectType):
@@ -53,13 +78,19 @@ class CurrentPreviousProductMaxMin(CountableDjangoObjectType):
         return root
 
     @staticmethod
-    def resolve_product_max_min_previous(root: models.ProductMaxMin, _info, **_kwargs):
-        _, previous_ids = models.ProductMaxMin.objects.get_current_previous_ids()
-
-        product_max_min = models.ProductMaxMin.objects.filter(
-            listing_id=root.listing_id, id__in=previous_ids
-        ).order_by("-created_at")
-        product_max_min = BaseProductMaxMinFilter(
-            data=_info.variable_values.get("filter"), queryset=product_max_min
-        ).qs
-        return product_max_min.first()
+    def resolve_product_max_min_previous(root: models.ProductMaxMin, info, **_kwargs):
+        # only fields of the previous revision itself are applied, so the key
+        # doesn't depend on listing filters added to the input by the connection
+        filter_input = info.variable_values.get("filter") or {}
+        filter_data = json.dumps(
+            {
+                field: value
+                for field, value in filter_input.items()
+                if field in BaseProductMaxMinFilter.base_filters
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return PreviousProductMaxMinByListingIdAndFilterLoader(info.context).load(
+            (root.listing_id, filter_data)
+        )
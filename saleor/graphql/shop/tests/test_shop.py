@@ -1321,7 +1321,9 @@ def test_cannot_get_shop_limit_info_when_not_staff(user_api_client):
     assert_no_permission(response)
 
 
-def test_get_shop_limit_info_returns_null_by_default(staff_api_client):
+def test_get_shop_limit_info_returns_null_by_default(staff_api_client, settings):
+    # the whole response is compared, so skip the query cost extensions
+    settings.GRAPHQL_QUERY_MAX_COST = 0
     query = LIMIT_INFO_QUERY
     response = staff_api_client.post_graphql(query)
     content = get_graphql_content(response)
@@ -2,7 +2,10 @@ import fnmatch
 import hashlib
 import json
 import logging
+import threading
 import traceback
+from collections import OrderedDict
+from functools import partial
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import opentracing
@@ -11,22 +14,40 @@ from django.conf import settings
 from django.core.cache import cache
 from django.db import connection
 from django.db.backends.postgresql.base import DatabaseWrapper
-from django.http import HttpRequest, HttpResponseNotAllowed, JsonResponse
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseForbidden,
+    HttpResponseNotAllowed,
+    JsonResponse,
+)
 from django.shortcuts import render
 from django.urls import reverse
+from django.utils.crypto import constant_time_compare
 from django.utils.functional import SimpleLazyObject
 from django.views.generic import View
 from graphene_django.settings import graphene_settings
 from graphene_django.views import instantiate_middleware
-from graphql import GraphQLDocument, get_default_backend
+from graphql import GraphQLDocument, get_default_backend, validate
+from graphql.backend import core as core_backend
 from graphql.error import GraphQLError, GraphQLSyntaxError
 from graphql.error import format_error as format_graphql_error
 from graphql.execution import ExecutionResult
 from jwt.exceptions import PyJWTError
 
 from .. import __version__ as saleor_version
+from ..core.auth import get_token_from_request
 from ..core.exceptions import PermissionDenied, ReadOnlyException
 from ..core.utils import is_valid_ipv4, is_valid_ipv6
+from .core.instrumentation import (
+    InstrumentationMiddleware,
+    instrument_operation,
+    is_summary_requested,
+    render_metrics,
+)
+from .core.query_cost import calculate_query_cost
+from .core.response_cache import get_response_cache_key
 
 API_PATH = SimpleLazyObject(lambda: reverse("api"))
 INT_ERROR_MSG = "Int cannot represent non 32-bit signed integer value"
@@ -50,6 +71,62 @@ def tracing_wrapper(execute, sql, params, many, context):
         return execute(sql, params, many, context)
 
 
+class PersistedQueryNotFound(GraphQLError):
+    """Raised when a persisted query hash was not registered yet.
+
+    The message is the one expected by Apollo clients, which then send the hash
+    again together with the full query text.
+    """
+
+    def __init__(self):
+        super().__init__("PersistedQueryNotFound")
+
+
+class GraphQLDocumentCache:
+    """Bounded LRU cache of parsed and validated GraphQL documents.
+
+    Only the AST of documents which passed the schema validation is stored, so
+    cached documents are executed without parsing and validating them again.
+    The cache is kept in memory of a single worker process.
+    """
+
+    def __init__(self):
+        self._documents: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._documents)
+
+    def get(self, key: str):
+        with self._lock:
+            document_ast = self._documents.get(key)
+            if document_ast is None:
+                self.misses += 1
+                return None
+            self._documents.move_to_end(key)
+            self.hits += 1
+            return document_ast
+
+    def set(self, key: str, document_ast):
+        max_size = settings.GRAPHQL_DOCUMENT_CACHE_SIZE
+        with self._lock:
+            self._documents[key] = document_ast
+            self._documents.move_to_end(key)
+            while len(self._documents) > max_size:
+                self._documents.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+document_cache = GraphQLDocumentCache()
+
+
 class GraphQLView(View):
     # This class is our implementation of `graphene_django.views.GraphQLView`,
     # which was extended to support the following features:
@@ -86,13 +163,13 @@ class GraphQLView(View):
 
     def dispatch(self, request, *args, **kwargs):
         # Handle options method the GraphQlView restricts it.
-        if request.method == "GET":
+        if request.method == "GET" and not self.is_persisted_query_request(request):
             if settings.PLAYGROUND_ENABLED:
                 return self.render_playground(request)
             return HttpResponseNotAllowed(["OPTIONS", "POST"])
         if request.method == "OPTIONS":
             response = self.options(request, *args, **kwargs)
-        elif request.method == "POST":
+        elif request.method in ["GET", "POST"]:
             response = self.handle_query(request)
         else:
             return HttpResponseNotAllowed(["GET", "OPTIONS", "POST"])
@@ -112,6 +189,12 @@ class GraphQLView(View):
                     break
         return response
 
+    @staticmethod
+    def is_persisted_query_request(request: HttpRequest) -> bool:
+        return settings.GRAPHQL_PERSISTED_QUERY_ALLOW_GET and (
+            "extensions" in request.GET
+        )
+
     def render_playground(self, request):
         return render(
             request,
@@ -129,7 +212,16 @@ class GraphQLView(View):
             )
 
         if isinstance(data, list):
-            responses = [self.get_response(request, entry) for entry in data]
+            max_operations = settings.GRAPHQL_BATCH_MAX_OPERATIONS
+            if len(data) > max_operations:
+                message = f"Batch can contain at most {max_operations} operations."
+                return JsonResponse(
+                    data={"errors": [self.format_error(GraphQLError(message))]},
+                    status=400,
+                )
+            # operations share the request, so they use the same data loaders,
+            # discounts, plugins manager and authenticated user
+            responses = [self.get_batch_response(request, entry) for entry in data]
             result: Union[list, Optional[dict]] = [
                 response for response, code in responses
             ]
@@ -197,12 +289,22 @@ class GraphQLView(View):
                 status_code = 400
             else:
                 response["data"] = execution_result.data
+            if execution_result.extensions:
+                response["extensions"] = execution_result.extensions
             result: Optional[Dict[str, List[Any]]] = response
         else:
             result = None
 
         return result, status_code
 
+    def get_batch_response(
+        self, request: HttpRequest, data: Any
+    ) -> Tuple[Optional[Dict[str, List[Any]]], int]:
+        if not isinstance(data, dict):
+            error = GraphQLError("Operation must be an object.")
+            return {"errors": [self.format_error(error)]}, 400
+        return self.get_response(request, data)
+
     def get_root_value(self):
         return self.root_value
 
@@ -223,15 +325,52 @@ class GraphQLView(View):
                 ),
             )
 
+        use_document_cache = settings.GRAPHQL_DOCUMENT_CACHE_SIZE > 0 and isinstance(
+            self.backend, core_backend.GraphQLCoreBackend
+        )
+        if use_document_cache:
+            key = f"{id(self.schema)}-{generate_cache_key(query)}"
+            document_ast = document_cache.get(key)
+            if document_ast is not None:
+                return self.get_validated_document(query, document_ast), None
+
         # Attempt to parse the query, if it fails, return the error
         try:
-            return (
-                self.backend.document_from_string(self.schema, query),  # type: ignore
-                None,
+            document = self.backend.document_from_string(
+                self.schema, query  # type: ignore
             )
         except (ValueError, GraphQLSyntaxError) as e:
             return None, ExecutionResult(errors=[e], invalid=True)
 
+        # Invalid documents are not cached, the validation errors are returned
+        # when they are executed.
+        if use_document_cache and self.is_valid_document(document):
+            document_cache.set(key, document.document_ast)
+            return self.get_validated_document(query, document.document_ast), None
+        return document, None
+
+    def is_valid_document(self, document: GraphQLDocument) -> bool:
+        try:
+            return not validate(self.schema, document.document_ast)
+        except Exception:
+            # Scalars may raise while validating literals, such errors are
+            # handled when the document is executed.
+            return False
+
+    def get_validated_document(self, query: str, document_ast) -> GraphQLDocument:
+        return GraphQLDocument(
+            schema=self.schema,
+            document_string=query,
+            document_ast=document_ast,
+            execute=partial(
+                core_backend.execute_and_validate,
+                self.schema,
+                document_ast,
+                validate=False,
+                **self.backend.execute_params,  # type: ignore
+            ),
+        )
+
     def check_if_query_contains_only_schema(self, document: GraphQLDocument):
         query_with_schema = False
         for definition in document.document_ast.definitions:
@@ -253,10 +392,29 @@ class GraphQLView(View):
 
             query, variables, operation_name = self.get_graphql_params(request, data)
 
+            try:
+                query_hash = self.get_persisted_query_hash(data)
+                if query_hash:
+                    query = self.get_persisted_query(query, query_hash)
+                elif request.method == "GET":
+                    raise GraphQLError("Only persisted queries can be sent with GET.")
+            except GraphQLError as e:
+                return ExecutionResult(errors=[e], invalid=True)
+
             document, error = self.parse_query(query)
             if error:
                 return error
 
+            if request.method == "GET" and (
+                document.get_operation_type(operation_name) != "query"  # type: ignore
+            ):
+                return ExecutionResult(
+                    errors=[GraphQLError("Only queries can be sent with GET.")],
+                    invalid=True,
+                )
+
+            extensions = None
+            response_cache_key = None
             if document is not None:
                 raw_query_string = document.document_string
                 span.set_tag("graphql.query", raw_query_string)
@@ -267,6 +425,23 @@ class GraphQLView(View):
                 except GraphQLError as e:
                     return ExecutionResult(errors=[e], invalid=True)
 
+                if not query_contains_schema:
+                    extensions, error = self.check_query_cost(
+                        document, variables, operation_name
+                    )
+                    if error:
+                        return error
+
+                    response_cache_key = self.get_response_cache_key(
+                        request, document, variables, operation_name
+                    )
+                    if response_cache_key:
+                        cached_data = cache.get(response_cache_key)
+                        if cached_data is not None:
+                            return ExecutionResult(
+                                data=cached_data, extensions=extensions
+                            )
+
             extra_options: Dict[str, Optional[Any]] = {}
 
             if self.executor:
@@ -274,7 +449,9 @@ class GraphQLView(View):
                 # executor is not a valid argument in all backends
                 extra_options["executor"] = self.executor
             try:
-                with connection.execute_wrapper(tracing_wrapper):
+                with connection.execute_wrapper(tracing_wrapper), instrument_operation(
+                    request
+                ) as instrumentation:
                     response = None
                     should_use_cache_for_scheme = query_contains_schema & (
                         not settings.DEBUG
@@ -289,11 +466,28 @@ class GraphQLView(View):
                             variables=variables,
                             operation_name=operation_name,
                             context=request,
-                            middleware=self.middleware,
+                            middleware=self.get_middleware(instrumentation),
                             **extra_options,
                         )
                         if should_use_cache_for_scheme:
                             cache.set(key, response)
+                        if instrumentation and self.is_summary_allowed(request):
+                            extensions = dict(extensions or {})
+                            extensions[
+                                "instrumentation"
+                            ] = instrumentation.get_summary()
+                        if extensions:
+                            response.extensions = extensions
+                        if response_cache_key and not response.errors:
+                            cache.set(
+                                response_cache_key,
+                                response.data,
+                                settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT,
+                            )
+                        if document.get_operation_type(operation_name) == "mutation":
+                            # data loaded before the mutation could be outdated
+                            # in the next operations of a batch
+                            request.dataloaders = {}  # type: ignore
                     return response
             except Exception as e:
                 span.set_tag(opentracing.tags.ERROR, True)
@@ -304,8 +498,114 @@ class GraphQLView(View):
                     e = GraphQLError(str(e))
                 return ExecutionResult(errors=[e], invalid=True)
 
+    @staticmethod
+    def check_query_cost(
+        document: GraphQLDocument, variables: Optional[dict], operation_name: str
+    ) -> Tuple[Optional[dict], Optional[ExecutionResult]]:
+        """Calculate the cost of the query and reject it if it exceeds the budget.
+
+        Returned extensions are attached to the response, so clients can tune
+        their queries before reaching the limit.
+        """
+        max_cost = settings.GRAPHQL_QUERY_MAX_COST
+        if not max_cost:
+            return None, None
+        cost = calculate_query_cost(
+            document.schema,
+            document.document_ast,
+            variables if isinstance(variables, dict) else None,
+            operation_name,
+        )
+        extensions = {
+            "cost": {"requestedQueryCost": cost, "maximumAvailable": max_cost}
+        }
+        if cost > max_cost:
+            error = GraphQLError(
+                "The query exceeds the maximum cost of %s, requested cost is %s."
+                % (max_cost, cost)
+            )
+            return None, ExecutionResult(
+                errors=[error], invalid=True, extensions=extensions
+            )
+        return extensions, None
+
+    @staticmethod
+    def get_response_cache_key(
+        request: HttpRequest,
+        document: GraphQLDocument,
+        variables: Optional[dict],
+        operation_name: str,
+    ) -> Optional[str]:
+        """Return the response cache key for anonymous catalog queries.
+
+        Requests with a user or app token are never cached, as their responses
+        depend on permissions of the requestor.
+        """
+        if not settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT:
+            return None
+        if get_token_from_request(request):
+            return None
+        return get_response_cache_key(
+            document, variables if isinstance(variables, dict) else None, operation_name
+        )
+
+    def get_middleware(self, instrumentation) -> list:
+        if instrumentation is None:
+            return self.middleware
+        return [*self.middleware, InstrumentationMiddleware()]
+
+    @staticmethod
+    def is_summary_allowed(request: HttpRequest) -> bool:
+        """Check if the instrumentation summary can be returned to the requestor."""
+        if not is_summary_requested(request):
+            return False
+        user = getattr(request, "user", None)
+        return bool(user and user.is_active and user.is_staff)
+
+    @staticmethod
+    def get_persisted_query_hash(data: dict) -> Optional[str]:
+        extensions = data.get("extensions")
+        if not isinstance(extensions, dict):
+            return None
+        persisted_query = extensions.get("persistedQuery")
+        if not persisted_query:
+            return None
+        if not isinstance(persisted_query, dict):
+            raise GraphQLError("Invalid persisted query.")
+        if persisted_query.get("version") != 1:
+            raise GraphQLError("Unsupported persisted query version.")
+        query_hash = persisted_query.get("sha256Hash")
+        if not isinstance(query_hash, str) or not query_hash:
+            raise GraphQLError("Invalid persisted query.")
+        return query_hash
+
+    @staticmethod
+    def get_persisted_query(query: Optional[str], query_hash: str) -> str:
+        """Return the query registered under the hash or register the given one.
+
+        Clients first send only the hash. When it's unknown, they send it again
+        together with the query text, which is stored for next requests.
+        """
+        key = f"persisted-query-{query_hash}"
+        if not query:
+            query = cache.get(key)
+            if query is None:
+                raise PersistedQueryNotFound()
+            return query
+
+        if hashlib.sha256(query.encode("utf-8")).hexdigest() != query_hash:
+            raise GraphQLError("Provided sha256Hash does not match the query.")
+        cache.set(key, query, settings.GRAPHQL_PERSISTED_QUERY_TIMEOUT)
+        return query
+
     @staticmethod
     def parse_body(request: HttpRequest):
+        if request.method == "GET":
+            data = request.GET.dict()
+            for field in ["variables", "extensions"]:
+                if field in data:
+                    data[field] = json.loads(data[field])
+            return data
         content_type = request.content_type
         if content_type == "application/graphql":
             return {"query": request.body.decode("utf-8")}
@@ -414,3 +714,18 @@ def obj_set(obj, path, value, do_not_replace):
 def generate_cache_key(raw_query: str) -> str:
     hashed_query = hashlib.sha256(str(raw_query).encode("utf-8")).hexdigest()
     return f"{saleor_version}-{hashed_query}"
+
+
+def instrumentation_metrics(request: HttpRequest) -> HttpResponse:
+    """Return metrics of GraphQL operations in the Prometheus text format.
+
+    The endpoint is available only when the metrics token is configured and
+    requires it to be sent as a bearer token.
+    """
+    metrics_token = settings.GRAPHQL_INSTRUMENTATION_METRICS_TOKEN
+    if not settings.GRAPHQL_INSTRUMENTATION or not metrics_token:
+        raise Http404()
+    token = get_token_from_request(request)
+    if not token or not constant_time_compare(token, metrics_token):
+        return HttpResponseForbidden()
+    return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4")
@@ -3,10 +3,11 @@ from typing import DefaultDict, Iterable, List, Optional, Tuple
 from uuid import UUID
 
 from django.conf import settings
-from django.db.models import Exists, OuterRef
+from django.db.models import Exists, OuterRef, Sum
 
 from ...channel.models import Channel
-from ...warehouse.models import ShippingZone, Stock, Warehouse
+from ...warehouse.models import Stock, Warehouse
+from ...warehouse.reservations import is_reservation_enabled
 from ..core.dataloaders import DataLoader
 
 CountryCode = Optional[str]
@@ -18,9 +19,10 @@ class AvailableQuantityByProductVariantIdCountryCodeAndChannelSlugLoader(
 ):
     """Calculates available variant quantity based on variant ID and country code.
 
-    For each country code, for each shipping zone supporting that country,
-    calculate the maximum available quantity, then return either that number
-    or the maximum allowed checkout quantity, whichever is lower.
+    For each country code, sum the available quantity of warehouses supporting that
+    country in a single grouped query. Without a country code, calculate
+    the maximum available quantity of a single shipping zone. Then return either
+    that number or the maximum allowed checkout quantity, whichever is lower.
     """
 
     context_key = "available_quantity_by_productvariant_and_country"
@@ -59,46 +61,90 @@ class AvailableQuantityByProductVariantIdCountryCodeAndChannelSlugLoader(
         channel_slug: Optional[str],
         variant_ids: Iterable[int],
     ) -> Iterable[Tuple[int, int]]:
+        if country_code:
+            quantity_map = self.get_quantities_for_country(
+                country_code, channel_slug, variant_ids
+            )
+        else:
+            quantity_map = self.get_highest_quantities_in_shipping_zones(
+                channel_slug, variant_ids
+            )
+
+        # Return the quantities after capping them at the maximum quantity allowed in
+        # checkout. This prevent users from tracking the store's precise stock levels.
+        return [
+            (
+                variant_id,
+                min(quantity_map[variant_id], settings.MAX_CHECKOUT_LINE_QUANTITY),
+            )
+            for variant_id in variant_ids
+        ]
+
+    def get_quantities_for_country(
+        self,
+        country_code: CountryCode,
+        channel_slug: Optional[str],
+        variant_ids: Iterable[int],
+    ) -> DefaultDict[int, int]:
+        # When country code is known, sum quantities of all warehouses from shipping
+        # zones supporting given country with a single grouped query.
+        stocks = (
+            Stock.objects.for_country_and_channel(country_code, channel_slug)
+            .filter(product_variant_id__in=variant_ids)
+            .order_by()
+        )
+        aggregates = {
+            "total_quantity": Sum("quantity"),
+            "quantity_allocated": Sum("quantity_allocated"),
+        }
+        if is_reservation_enabled():
+            stocks = stocks.annotate_reserved_quantity()
+            aggregates["quantity_reserved"] = Sum("reserved_quantity")
+        quantities = stocks.values("product_variant_id").annotate(**aggregates)
+
+        quantity_map: DefaultDict[int, int] = defaultdict(int)
+        for quantity in quantities:
+            quantity_map[quantity["product_variant_id"]] = max(
+                quantity["total_quantity"]
+                - quantity["quantity_allocated"]
+                - quantity.get("quantity_reserved", 0),
+                0,
+            )
+        return quantity_map
+
+    def get_highest_quantities_in_shipping_zones(
+        self, channel_slug: Optional[str], variant_ids: Iterable[int]
+    ) -> DefaultDict[int, int]:
         # get stocks only for warehouses assigned to the shipping zones
         # that are available in the given channel
         stocks = Stock.objects.filter(product_variant_id__in=variant_ids)
         WarehouseShippingZone = Warehouse.shipping_zones.through  # type: ignore
         warehouse_shipping_zones = WarehouseShippingZone.objects.all()
-        additional_warehouse_filter = False
-        if country_code or channel_slug:
-            additional_warehouse_filter = True
-            if country_code:
-                shipping_zones = ShippingZone.objects.filter(
-                    countries__contains=country_code
-                ).values("pk")
-                warehouse_shipping_zones = warehouse_shipping_zones.filter(
-                    Exists(shipping_zones.filter(pk=OuterRef("shippingzone_id")))
-                )
-            if channel_slug:
-                ShippingZoneChannel = Channel.shipping_zones.through  # type: ignore
-                channels = Channel.objects.filter(slug=channel_slug).values("pk")
-                shipping_zone_channels = ShippingZoneChannel.objects.filter(
-                    Exists(channels.filter(pk=OuterRef("channel_id")))
-                ).values("shippingzone_id")
-                warehouse_shipping_zones = warehouse_shipping_zones.filter(
-                    Exists(
-                        shipping_zone_channels.filter(
-                            shippingzone_id=OuterRef("shippingzone_id")
-                        )
+        if channel_slug:
+            ShippingZoneChannel = Channel.shipping_zones.through  # type: ignore
+            channels = Channel.objects.filter(slug=channel_slug).values("pk")
+            shipping_zone_channels = ShippingZoneChannel.objects.filter(
+                Exists(channels.filter(pk=OuterRef("channel_id")))
+            ).values("shippingzone_id")
+            warehouse_shipping_zones = warehouse_shipping_zones.filter(
+                Exists(
+                    shipping_zone_channels.filter(
+                        shippingzone_id=OuterRef("shippingzone_id")
                     )
                 )
+            )
         warehouse_shipping_zones_map = defaultdict(list)
         for warehouse_shipping_zone in warehouse_shipping_zones:
             warehouse_shipping_zones_map[warehouse_shipping_zone.warehouse_id].append(
                 warehouse_shipping_zone.shippingzone_id
             )
-        if additional_warehouse_filter:
+        if channel_slug:
             stocks = stocks.filter(warehouse_id__in=warehouse_shipping_zones_map.keys())
         stocks = stocks.annotate_available_quantity()
 
-        # A single country code (or a missing country code) can return results from
-        # multiple shipping zones. We want to combine all quantities within a single
-        # zone and then find out which zone contains the highest total.
+        # A missing country code can return results from multiple shipping zones.
+        # We want to combine all quantities within a single zone and then find out
+        # which zone contains the highest total.
         quantity_by_shipping_zone_by_product_variant: DefaultDict[
             int, DefaultDict[int, int]
         ] = defaultdict(lambda: defaultdict(int))
@@ -117,24 +163,9 @@ class AvailableQuantityByProductVariantIdCountryCodeAndChannelSlugLoader(
             variant_id,
             quantity_by_shipping_zone,
         ) in quantity_by_shipping_zone_by_product_variant.items():
-            quantity_values = quantity_by_shipping_zone.values()
-            if country_code:
-                # When country code is known, return the sum of quantities from all
-                # shipping zones supporting given country.
-                quantity_map[variant_id] = sum(quantity_values)
-            else:
-                # When country code is unknown, return the highest known quantity.
-                quantity_map[variant_id] = max(quantity_values)
-
-        # Return the quantities after capping them at the maximum quantity allowed in
-        # checkout. This prevent users from tracking the store's precise stock levels.
-        return [
-            (
-                variant_id,
-                min(quantity_map[variant_id], settings.MAX_CHECKOUT_LINE_QUANTITY),
-            )
-            for variant_id in variant_ids
-        ]
+            # When country code is unknown, return the highest known quantity.
+            quantity_map[variant_id] = max(quantity_by_shipping_zone.values())
+        return quantity_map
 
 
 class StocksWithAvailableQuantityByProductVariantIdCountryCodeAndChannelLoader(
@@ -3,6 +3,7 @@ from typing import TYPE_CHECKING, List
 from django.apps import AppConfig
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.db.models.signals import post_delete, post_save
 from django.utils.module_loading import import_string
 
 if TYPE_CHECKING:
@@ -14,11 +15,27 @@ class PluginConfig(AppConfig):
     verbose_name = "Plugins"
 
     def ready(self):
+        from ..channel.models import Channel
+        from .models import PluginConfiguration
+        from .signals import invalidate_plugin_configuration_on_change
+
         plugins = getattr(settings, "PLUGINS", [])
 
         for plugin_path in plugins:
             self.load_and_check_plugin(plugin_path)
 
+        # plugins managers reuse loaded channels and plugin configurations
+        # until they are changed
+        for sender in [Channel, PluginConfiguration]:
+            for name, signal in [("save", post_save), ("delete", post_delete)]:
+                signal.connect(
+                    invalidate_plugin_configuration_on_change,
+                    sender=sender,
+                    dispatch_uid=(
+                        f"invalidate_plugin_configuration_{name}_{sender.__name__}"
+                    ),
+                )
+
     def load_and_check_plugin(self, plugin_path: str):
         try:
             plugin = import_string(plugin_path)
@@ -1,3 +1,6 @@
+import copy
+import threading
+import time
 from collections import defaultdict
 from decimal import Decimal
 from typing import (
@@ -14,6 +17,7 @@ from typing import (
 
 import opentracing
 from django.conf import settings
+from django.core.cache import cache
 from django.core.handlers.wsgi import WSGIRequest
 from django.http import HttpResponse, HttpResponseNotFound
 from django.utils.module_loading import import_string
@@ -53,6 +57,80 @@ if TYPE_CHECKING:
 
 NotifyEventTypeChoice = str
 
+PLUGIN_CONFIGURATION_VERSION_KEY = "plugins-configuration-version"
+
+# channels and plugin configurations loaded by the current process, reused by
+# plugins managers until the configuration version is changed or the snapshot
+# expires
+_configuration_snapshot: Dict[str, Any] = {}
+_configuration_snapshot_lock = threading.Lock()
+
+
+def invalidate_plugin_configuration():
+    """Make all processes reload channels and plugin configurations."""
+    try:
+        cache.incr(PLUGIN_CONFIGURATION_VERSION_KEY)
+    except ValueError:
+        get_plugin_configuration_version()
+    with _configuration_snapshot_lock:
+        _configuration_snapshot.clear()
+
+
+def get_plugin_configuration_version() -> int:
+    version = cache.get(PLUGIN_CONFIGURATION_VERSION_KEY)
+    if version is None:
+        # versions start from the current time, so a version evicted from the cache
+        # is not reused by processes which loaded configurations before
+        cache.add(PLUGIN_CONFIGURATION_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(PLUGIN_CONFIGURATION_VERSION_KEY)
+    return version
+
+
+def get_plugin_configuration_snapshot() -> Tuple[
+    List["Channel"], List["PluginConfiguration"]
+]:
+    """Return channels and plugin configurations used to load plugins.
+
+    When `PLUGIN_CONFIGURATION_SNAPSHOT` is enabled, they are fetched from
+    the database only when the configuration version changes or the snapshot is
+    older than `PLUGIN_CONFIGURATION_SNAPSHOT_TIMEOUT` seconds. Copies are returned,
+    so objects modified by plugins are not shared between requests.
+    """
+    if not settings.PLUGIN_CONFIGURATION_SNAPSHOT:
+        return (
+            list(Channel.objects.all()),
+            list(PluginConfiguration.objects.select_related("channel")),
+        )
+
+    version = get_plugin_configuration_version()
+    now = time.monotonic()
+    with _configuration_snapshot_lock:
+        loaded_at = _configuration_snapshot.get("loaded_at")
+        if (
+            _configuration_snapshot.get("version") != version
+            or loaded_at is None
+            or now - loaded_at >= settings.PLUGIN_CONFIGURATION_SNAPSHOT_TIMEOUT
+        ):
+            _configuration_snapshot.update(
+                version=version,
+                loaded_at=now,
+                channels=list(Channel.objects.all()),
+                configurations=list(
+                    PluginConfiguration.objects.select_related("channel")
+                ),
+            )
+        channels = _configuration_snapshot["channels"]
+        configurations = _configuration_snapshot["configurations"]
+
+    plugin_configurations = []
+    for configuration in configurations:
+        configuration = copy.copy(configuration)
+        configuration.configuration = copy.deepcopy(configuration.configuration)
+        if configuration.channel_id:
+            configuration.channel = copy.copy(configuration.channel)
+        plugin_configurations.append(configuration)
+    return [copy.copy(channel) for channel in channels], plugin_configurations
+
 
 class PluginsManager(PaymentInterface):
     """Base manager for handling plugins logic."""
@@ -83,12 +161,12 @@ class PluginsManager(PaymentInterface):
         with opentracing.global_tracer().start_active_span("PluginsManager.__init__"):
             self.plugins_per_channel = defaultdict(list)
             self.all_plugins = []
+            channels, plugin_configurations = get_plugin_configuration_snapshot()
             (
                 self._global_config,
                 self._configs_per_channel,
-            ) = self._get_all_plugin_configs()
+            ) = self._get_all_plugin_configs(plugin_configurations)
             self.global_plugins = []
-            channels = Channel.objects.all()
             for plugin_path in plugins:
 
                 with opentracing.global_tracer().start_active_span(f"{plugin_path}"):
@@ -835,20 +913,18 @@ class PluginsManager(PaymentInterface):
             " payment method is inaccessible!"
         )
 
-    def _get_all_plugin_configs(self):
+    def _get_all_plugin_configs(
+        self, plugin_configurations: Iterable["PluginConfiguration"]
+    ):
         with opentracing.global_tracer().start_active_span("_get_all_plugin_configs"):
-            if not hasattr(self, "_plugin_configs"):
-                plugin_configurations = PluginConfiguration.objects.prefetch_related(
-                    "channel"
-                ).all()
-                self._plugin_configs_per_channel = defaultdict(dict)
-                self._global_plugin_configs = {}
-                for pc in plugin_configurations:
-                    channel = pc.channel
-                    if channel is None:
-                        self._global_plugin_configs[pc.identifier] = pc
-                    else:
-                        self._plugin_configs_per_channel[channel][pc.identifier] = pc
+            self._plugin_configs_per_channel = defaultdict(dict)
+            self._global_plugin_configs = {}
+            for pc in plugin_configurations:
+                channel = pc.channel
+                if channel is None:
+                    self._global_plugin_configs[pc.identifier] = pc
+                else:
+                    self._plugin_configs_per_channel[channel][pc.identifier] = pc
             return self._global_plugin_configs, self._plugin_configs_per_channel
 
     # FIXME these methods should be more generic
@@ -0,0 +1,59 @@
+from typing import TYPE_CHECKING, Any, List
+
+from django.conf import settings
+
+from ...graphql.core.response_cache import invalidate_response_cache_tags
+from ..base_plugin import BasePlugin
+
+if TYPE_CHECKING:
+    # flake8: noqa
+    from ...product.models import Product, ProductVariant
+    from ...warehouse.models import Stock
+
+
+class ResponseCachePlugin(BasePlugin):
+    PLUGIN_ID = "mirumee.response_cache"
+    PLUGIN_NAME = "Response cache"
+    DEFAULT_ACTIVE = True
+    PLUGIN_DESCRIPTION = (
+        "Built-in saleor plugin that invalidates cached responses of anonymous "
+        "catalog queries when products change."
+    )
+    CONFIGURATION_PER_CHANNEL = False
+
+    def _invalidate_products(self, previous_value: Any) -> Any:
+        if self.active and settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT:
+            invalidate_response_cache_tags("products")
+        return previous_value
+
+    def product_created(self, product: "Product", previous_value: Any) -> Any:
+        return self._invalidate_products(previous_value)
+
+    def product_updated(self, product: "Product", previous_value: Any) -> Any:
+        return self._invalidate_products(previous_value)
+
+    def product_deleted(
+        self, product: "Product", variants: List[int], previous_value: Any
+    ) -> Any:
+        return self._invalidate_products(previous_value)
+
+    def product_variant_created(
+        self, product_variant: "ProductVariant", previous_value: Any
+    ) -> Any:
+        return self._invalidate_products(previous_value)
+
+    def product_variant_updated(
+        self, product_variant: "ProductVariant", previous_value: Any
+    ) -> Any:
+        return self._invalidate_products(previous_value)
+
+    def product_variant_deleted(
+        self, product_variant: "ProductVariant", previous_value: Any
+    ) -> Any:
+        return self._invalidate_products(previous_value)
+
+    def product_variant_out_of_stock(self, stock: "Stock", previous_value: Any) -> Any:
+        return self._invalidate_products(previous_value)
+
+    def product_variant_back_in_stock(self, stock: "Stock", previous_value: Any) -> Any:
+        return self._invalidate_products(previous_value)
@@ -0,0 +1,28 @@
+from django.core.cache import cache
+
+from ....graphql.core.response_cache import get_tag_versions
+from ...manager import get_plugins_manager
+
+
+def test_product_updated_invalidates_products_tag(settings, product):
+    settings.PLUGINS = ["saleor.plugins.response_cache.plugin.ResponseCachePlugin"]
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 60
+    cache.clear()
+    versions = get_tag_versions(["products", "menus"])
+
+    get_plugins_manager().product_updated(product)
+
+    new_versions = get_tag_versions(["products", "menus"])
+    assert new_versions["products"] != versions["products"]
+    assert new_versions["menus"] == versions["menus"]
+
+
+def test_product_updated_response_cache_disabled(settings, product):
+    settings.PLUGINS = ["saleor.plugins.response_cache.plugin.ResponseCachePlugin"]
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 0
+    cache.clear()
+    versions = get_tag_versions(["products"])
+
+    get_plugins_manager().product_updated(product)
+
+    assert get_tag_versions(["products"]) == versions
@@ -0,0 +1,10 @@
+from django.db import transaction
+
+from .manager import invalidate_plugin_configuration
+
+
+def invalidate_plugin_configuration_on_change(sender, instance, **kwargs):
+    # invalidate again after commit, as other processes could reload the old data
+    # before the transaction was committed
+    invalidate_plugin_configuration()
+    transaction.on_commit(invalidate_plugin_configuration)
@@ -6,6 +6,7 @@ from django.http import HttpResponseNotFound, JsonResponse
 from django_countries.fields import Country
 from prices import Money, TaxedMoney
 
+from ...channel.models import Channel
 from ...checkout.fetch import fetch_checkout_info, fetch_checkout_lines
 from ...core.prices import quantize_price
 from ...core.taxes import TaxType
@@ -32,6 +33,85 @@ def test_get_plugins_manager(settings):
     assert len(manager.all_plugins) == 1
 
 
+def test_get_plugins_manager_reuses_plugin_configuration(
+    settings, channel_USD, django_assert_num_queries
+):
+    settings.PLUGIN_CONFIGURATION_SNAPSHOT = True
+    settings.PLUGINS = ["saleor.plugins.tests.sample_plugins.ChannelPluginSample"]
+    get_plugins_manager()
+
+    with django_assert_num_queries(0):
+        manager = get_plugins_manager()
+
+    assert list(manager.plugins_per_channel.keys()) == [channel_USD.slug]
+
+
+def test_get_plugins_manager_without_plugin_configuration_snapshot(
+    settings, channel_USD, django_assert_num_queries
+):
+    settings.PLUGINS = ["saleor.plugins.tests.sample_plugins.ChannelPluginSample"]
+    get_plugins_manager()
+
+    with django_assert_num_queries(2):
+        get_plugins_manager()
+
+
+def test_get_plugins_manager_reloads_expired_plugin_configuration(
+    settings, channel_USD
+):
+    settings.PLUGIN_CONFIGURATION_SNAPSHOT = True
+    settings.PLUGIN_CONFIGURATION_SNAPSHOT_TIMEOUT = 0
+    settings.PLUGINS = ["saleor.plugins.tests.sample_plugins.ChannelPluginSample"]
+    get_plugins_manager()
+
+    # a change which doesn't invalidate the plugin configuration
+    Channel.objects.filter(pk=channel_USD.pk).update(slug="new-slug")
+    manager = get_plugins_manager()
+
+    assert list(manager.plugins_per_channel.keys()) == ["new-slug"]
+
+
+def test_get_plugins_manager_reloads_changed_channels(settings, channel_USD):
+    settings.PLUGIN_CONFIGURATION_SNAPSHOT = True
+    settings.PLUGINS = ["saleor.plugins.tests.sample_plugins.ChannelPluginSample"]
+    get_plugins_manager()
+
+    channel_USD.slug = "new-slug"
+    channel_USD.save(update_fields=["slug"])
+    manager = get_plugins_manager()
+
+    assert list(manager.plugins_per_channel.keys()) == ["new-slug"]
+
+
+def test_get_plugins_manager_reloads_changed_plugin_configuration(settings):
+    settings.PLUGIN_CONFIGURATION_SNAPSHOT = True
+    settings.PLUGINS = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+    assert get_plugins_manager().all_plugins[0].active
+
+    PluginConfiguration.objects.create(
+        identifier=PluginSample.PLUGIN_ID, active=False, configuration=[]
+    )
+    manager = get_plugins_manager()
+
+    assert not manager.all_plugins[0].active
+
+
+def test_get_plugins_manager_does_not_share_plugin_configuration(settings):
+    settings.PLUGIN_CONFIGURATION_SNAPSHOT = True
+    settings.PLUGINS = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+    PluginConfiguration.objects.create(
+        identifier=PluginSample.PLUGIN_ID,
+        active=True,
+        configuration=[{"name": "Username", "value": "admin"}],
+    )
+    plugin = get_plugins_manager().all_plugins[0]
+
+    plugin.configuration[0]["value"] = "changed"
+
+    new_plugin = get_plugins_manager().all_plugins[0]
+    assert new_plugin.configuration[0]["value"] == "admin"
+
+
 def test_manager_with_default_configuration_for_channel_plugins(
     settings, channel_USD, channel_PLN
 ):
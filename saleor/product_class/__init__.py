@@ -8,3 +8,42 @@ class ProductClassRecommendationStatus:
         (SUBMITTED, "Product class submitted, waiting for approval"),
         (APPROVED, "Product class approved"),
     ]
+
+
+class ProductClassCurrentPreviousType:
+    """Status sets for which the two latest recommendations of a listing are kept."""
+
+    APPROVED = "approved"
+    SUBMITTED_APPROVED = "submitted_approved"
+    DRAFT_SUBMITTED = "draft_submitted"
+
+    CHOICES = [
+        (APPROVED, "Latest approved product classes by approval time"),
+        (SUBMITTED_APPROVED, "Latest submitted or approved product classes"),
+        (DRAFT_SUBMITTED, "Latest draft or submitted product classes"),
+    ]
+
+    STATUSES = {
+        APPROVED: [ProductClassRecommendationStatus.APPROVED],
+        SUBMITTED_APPROVED: [
+            ProductClassRecommendationStatus.SUBMITTED,
+            ProductClassRecommendationStatus.APPROVED,
+        ],
+        DRAFT_SUBMITTED: [
+            ProductClassRecommendationStatus.DRAFT,
+            ProductClassRecommendationStatus.SUBMITTED,
+        ],
+    }
+
+    ORDERING = {
+        APPROVED: ["-approved_at", "-id"],
+        SUBMITTED_APPROVED: ["-created_at", "-id"],
+        DRAFT_SUBMITTED: ["-created_at", "-id"],
+    }
+
+    @classmethod
+    def from_statuses(cls, list_status):
+        for type_, statuses in cls.STATUSES.items():
+            if set(statuses) == set(list_status):
+                return type_
+        raise ValueError(f"Product class status set {list_status} is not tracked.")
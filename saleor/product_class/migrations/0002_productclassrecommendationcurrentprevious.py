@@ -0,0 +1,119 @@
+# Generated by Django 3.2.6 on 2021-11-15 08:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+CURRENT_PREVIOUS_TYPES = [
+    ("approved", ("APPROVED",), "approved_at DESC, id DESC"),
+    ("submitted_approved", ("SUBMITTED", "APPROVED"), "created_at DESC, id DESC"),
+    ("draft_submitted", ("DRAFT", "SUBMITTED"), "created_at DESC, id DESC"),
+]
+
+FILL_CURRENT_PREVIOUS = """
+INSERT INTO product_class_productclassrecommendationcurrentprevious
+    (listing_id, type, current_id, previous_id)
+SELECT listing_id,
+       %(type)s,
+       MAX(id) FILTER (WHERE row_number = 1),
+       MAX(id) FILTER (WHERE row_number = 2)
+FROM (
+    SELECT id, listing_id, ROW_NUMBER() OVER (
+        PARTITION BY listing_id ORDER BY {order_by}
+    ) AS row_number
+    FROM product_class_productclassrecommendation
+    WHERE status IN %(statuses)s
+) AS recommendations
+WHERE row_number <= 2
+GROUP BY listing_id;
+"""
+
+
+def fill_current_previous(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        for type_, statuses, order_by in CURRENT_PREVIOUS_TYPES:
+            cursor.execute(
+                FILL_CURRENT_PREVIOUS.format(order_by=order_by),
+                {"type": type_, "statuses": statuses},
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0148_auto_20210929_0806"),
+        ("product_class", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="productclassrecommendation",
+            index=models.Index(
+                fields=["listing", "status", "-created_at"],
+                name="productclass_listing_idx",
+            ),
+        ),
+        migrations.CreateModel(
+            name="ProductClassRecommendationCurrentPrevious",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "type",
+                    models.CharField(
+                        choices=[
+                            (
+                                "approved",
+                                "Latest approved product classes by approval time",
+                            ),
+                            (
+                                "submitted_approved",
+                                "Latest submitted or approved product classes",
+                            ),
+                            (
+                                "draft_submitted",
+                                "Latest draft or submitted product classes",
+                            ),
+                        ],
+                        max_length=32,
+                    ),
+                ),
+                (
+                    "current",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="listing_current",
+                        to="product_class.productclassrecommendation",
+                    ),
+                ),
+                (
+                    "listing",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="product_class_current_previous",
+                        to="product.productvariantchannellisting",
+                    ),
+                ),
+                (
+                    "previous",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="listing_previous",
+                        to="product_class.productclassrecommendation",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("listing", "type")},
+            },
+        ),
+        migrations.RunPython(fill_current_previous, migrations.RunPython.noop),
+    ]
@@ -1,43 +1,40 @@
+from django.contrib.postgres.fields import ArrayField
 from django.db import models
+from django.db.models import Exists, OuterRef
 
 from saleor import settings
+from saleor.app.models import App
+from saleor.core.models import Job
 from saleor.core.permissions import ProductClassPermissions
 from saleor.product.models import ProductVariantChannelListing
-from saleor.product_class import ProductClassRecommendationStatus
-
-# Create your models here.
+from saleor.product_class import (
+    ProductClassCurrentPreviousType,
+    ProductClassRecommendationStatus,
+)
 
 
 class ProductClassesQueryset(models.QuerySet):
-    def qs_group_current_previous(
-        self, filter_row_number: str, order_by: str, list_status: list
-    ):
-        list_status = tuple(list_status)
-        params = [list_status]
-        sql_raw = """
-        select id
-        from (
-                 select ROW_NUMBER() OVER (
-                     PARTITION BY listing_id
-                     ORDER BY {order_by}) AS row_number,
-                        A.*
-                 from product_class_productclassrecommendation A
-                 WHERE A.status IN  %s
-             ) AS B
-        WHERE B.row_number {filter_row_number}
-        """.format(
-            order_by=order_by, filter_row_number=filter_row_number
+    def qs_current_previous(self, list_status: list):
+        """Return the two latest recommendations of each listing in a status set."""
+        pointers = ProductClassRecommendationCurrentPrevious.objects.filter(
+            type=ProductClassCurrentPreviousType.from_statuses(list_status)
+        )
+        return self.filter(
+            Exists(pointers.filter(current_id=OuterRef("pk")))
+            | Exists(pointers.filter(previous_id=OuterRef("pk")))
         )
-        return self.raw(sql_raw, params=params)
 
-    def qs_filter_current_previous(
-        self, filter_row_number: str, order_by: str, list_status: list
-    ):
-        group_product_classes = self.qs_group_current_previous(
-            filter_row_number, order_by, list_status
+    def qs_current(self, list_status: list):
+        pointers = ProductClassRecommendationCurrentPrevious.objects.filter(
+            type=ProductClassCurrentPreviousType.from_statuses(list_status)
         )
-        ids = [item.id for item in group_product_classes]
-        return self.filter(id__in=ids)
+        return self.filter(Exists(pointers.filter(current_id=OuterRef("pk"))))
+
+    def qs_previous(self, list_status: list):
+        pointers = ProductClassRecommendationCurrentPrevious.objects.filter(
+            type=ProductClassCurrentPreviousType.from_statuses(list_status)
+        )
+        return self.filter(Exists(pointers.filter(previous_id=OuterRef("pk"))))
 
 
 class ProductClassRecommendation(models.Model):
@@ -85,6 +82,12 @@ class ProductClassRecommendation(models.Model):
 
     class Meta:
         app_label = "product_class"
+        indexes = [
+            models.Index(
+                fields=["listing", "status", "-created_at"],
+                name="productclass_listing_idx",
+            ),
+        ]
 
         permissions = (
             (
@@ -96,3 +99,64 @@ class ProductClassRecommendation(models.Model):
                 "Approve product class recommendation.",
             ),
         )
+
+
+class ProductClassRecommendationCurrentPrevious(models.Model):
+    """Pointers to the latest two recommendations of a listing in a status set.
+
+    Rows are maintained by `update_product_classes_current_previous` whenever
+    recommendations are created, updated, deleted or change their status.
+    """
+
+    listing = models.ForeignKey(
+        ProductVariantChannelListing,
+        on_delete=models.CASCADE,
+        related_name="product_class_current_previous",
+    )
+    type = models.CharField(
+        max_length=32, choices=ProductClassCurrentPreviousType.CHOICES
+    )
+    current = models.ForeignKey(
+        ProductClassRecommendation,
+        on_delete=models.CASCADE,
+        related_name="listing_current",
+    )
+    previous = models.ForeignKey(
+        ProductClassRecommendation,
+        on_delete=models.SET_NULL,
+        related_name="listing_previous",
+        blank=True,
+        null=True,
+    )
+
+    class Meta:
+        app_label = "product_class"
+        unique_together = [["listing", "type"]]
+
+
+class ProductClassRecommendationChangeStatusJob(Job):
+    """Background job changing the status of many product class recommendations."""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="product_class_change_status_jobs",
+        on_delete=models.CASCADE,
+        null=True,
+    )
+    app = models.ForeignKey(
+        App,
+        related_name="product_class_change_status_jobs",
+        on_delete=models.CASCADE,
+        null=True,
+    )
+    product_class_status = models.CharField(
+        choices=ProductClassRecommendationStatus.CHOICES, max_length=128
+    )
+    product_class_ids = ArrayField(models.IntegerField(), default=list)
+    total_count = models.PositiveIntegerField(default=0)
+    processed_count = models.PositiveIntegerField(default=0)
+    updated_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        app_label = "product_class"
+        ordering = ("-created_at",)
@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.db import DatabaseError
+
+from ..celeryconf import app
+from ..core import JobStatus
+from ..core.tracing import traced_atomic_transaction
+from .models import ProductClassRecommendationChangeStatusJob
+from .utils import change_product_classes_status
+
+CELERY_RETRY_BACKOFF = 10
+CELERY_RETRY_MAX = 5
+
+
+def on_change_status_task_failure(self, exc, task_id, args, kwargs, einfo):
+    job_id = args[0]
+    job = ProductClassRecommendationChangeStatusJob.objects.get(pk=job_id)
+    job.status = JobStatus.FAILED
+    job.message = str(exc)[:255]
+    job.save(update_fields=["status", "message", "updated_at"])
+
+
+def on_change_status_task_success(self, retval, task_id, args, kwargs):
+    job_id = args[0]
+    job = ProductClassRecommendationChangeStatusJob.objects.get(pk=job_id)
+    job.status = JobStatus.SUCCESS
+    job.save(update_fields=["status", "updated_at"])
+
+
+@app.task(
+    autoretry_for=(DatabaseError,),
+    retry_backoff=CELERY_RETRY_BACKOFF,
+    retry_kwargs={"max_retries": CELERY_RETRY_MAX},
+    on_success=on_change_status_task_success,
+    on_failure=on_change_status_task_failure,
+)
+def change_product_classes_status_task(job_id: int):
+    """Change status of the job's recommendations in chunks, saving progress."""
+    job = ProductClassRecommendationChangeStatusJob.objects.get(pk=job_id)
+    product_class_ids = job.product_class_ids
+    batch_size = settings.PRODUCT_CLASS_CHANGE_STATUS_BATCH_SIZE
+
+    # start from the already processed ones, so a retried job is resumed
+    for start in range(job.processed_count, len(product_class_ids), batch_size):
+        end = start + batch_size
+        batch_ids = product_class_ids[start:end]
+        # progress is committed together with the batch, so a retry doesn't count
+        # the batch twice
+        with traced_atomic_transaction():
+            updated_count = change_product_classes_status(
+                batch_ids, job.product_class_status, job.user_id
+            )
+            job.updated_count += updated_count
+            job.processed_count = start + len(batch_ids)
+            job.save(update_fields=["processed_count", "updated_count", "updated_at"])
@@ -1,8 +1,14 @@
+from unittest.mock import patch
+
 import graphene
 
 from saleor.graphql.tests.utils import assert_no_permission, get_graphql_content
+from saleor.product_class import ProductClassRecommendationStatus
 from saleor.product_class.error_codes import ProductClassRecommendationErrorCode
-from saleor.product_class.models import ProductClassRecommendation
+from saleor.product_class.models import (
+    ProductClassRecommendation,
+    ProductClassRecommendationChangeStatusJob,
+)
 
 QUERY_PRODUCT_CLASS_BULK_CREATE = """
 mutation ProductClassRecommendationBulkCreate(
@@ -457,3 +463,101 @@ def test_product_class_bulk_change_status_approve_no_permission(
 
     # then
     assert_no_permission(response)
+
+
+QUERY_PRODUCT_CLASS_BULK_CHANGE_STATUS_IN_BACKGROUND = """
+mutation ProductClassRecommendationBulkChangeStatus(
+    $ids: [ID!]!, $status: ProductClassRecommendationEnum!
+){
+    productClassRecommendationBulkChangeStatus(
+        ids: $ids, status: $status, background: true
+    ){
+        count
+        job{
+            id
+            status
+            productClassStatus
+            totalCount
+            processedCount
+        }
+        errors{
+            code
+        }
+    }
+}
+"""
+
+
+@patch(
+    "saleor.graphql.product.bulk_mutations.product_class_recommendation."
+    "change_product_classes_status_task.delay"
+)
+def test_product_class_bulk_change_status_in_background(
+    change_status_task_mock,
+    staff_api_client,
+    product_class_recommendations,
+    permission_manage_product_class,
+):
+    # given
+    draft, submitted, _ = product_class_recommendations
+    variables = {
+        "ids": [
+            graphene.Node.to_global_id("ProductClassRecommendation", instance.id)
+            for instance in [draft, submitted]
+        ],
+        "status": "SUBMITTED",
+    }
+
+    # when
+    response = staff_api_client.post_graphql(
+        QUERY_PRODUCT_CLASS_BULK_CHANGE_STATUS_IN_BACKGROUND,
+        variables,
+        permissions=[permission_manage_product_class],
+    )
+
+    # then
+    content = get_graphql_content(response)
+    data = content["data"]["productClassRecommendationBulkChangeStatus"]
+    assert not data["errors"]
+    assert data["count"] == 2
+    assert data["job"]["status"] == "PENDING"
+    assert data["job"]["productClassStatus"] == "SUBMITTED"
+    assert data["job"]["totalCount"] == 2
+    assert data["job"]["processedCount"] == 0
+
+    job = ProductClassRecommendationChangeStatusJob.objects.get()
+    assert job.product_class_ids == [draft.id, submitted.id]
+    assert job.user == staff_api_client.user
+    change_status_task_mock.assert_called_once_with(job.pk)
+    draft.refresh_from_db()
+    assert draft.status == ProductClassRecommendationStatus.DRAFT
+
+
+@patch(
+    "saleor.graphql.product.bulk_mutations.product_class_recommendation."
+    "change_product_classes_status_task.delay"
+)
+def test_product_class_bulk_change_status_in_background_approve_no_permission(
+    change_status_task_mock,
+    staff_api_client,
+    product_class_recommendations,
+    permission_manage_product_class,
+):
+    # given
+    draft = product_class_recommendations[0]
+    variables = {
+        "ids": [graphene.Node.to_global_id("ProductClassRecommendation", draft.id)],
+        "status": "APPROVED",
+    }
+
+    # when
+    response = staff_api_client.post_graphql(
+        QUERY_PRODUCT_CLASS_BULK_CHANGE_STATUS_IN_BACKGROUND,
+        variables,
+        permissions=[permission_manage_product_class],
+    )
+
+    # then
+    assert_no_permission(response)
+    assert not ProductClassRecommendationChangeStatusJob.objects.exists()
+    change_status_task_mock.assert_not_called()
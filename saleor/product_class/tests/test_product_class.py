@@ -1,8 +1,13 @@
+from decimal import Decimal
+
 import graphene
+from django.core.cache import cache
 
 from saleor.graphql.tests.utils import assert_no_permission, get_graphql_content
+from saleor.product.models import ProductVariant, ProductVariantChannelListing
 from saleor.product_class import ProductClassRecommendationStatus
 from saleor.product_class.models import ProductClassRecommendation
+from saleor.product_class.utils import update_product_classes_current_previous
 
 QUERY_LIST_PRODUCT_CLASS = """
 query GetProductsClassRecommendation($first: Int, $last: Int,
@@ -312,3 +317,109 @@ def test_current_previous_product_class_no_permission(
 
     # then
     assert_no_permission(response)
+
+
+QUERY_CURRENT_PREVIOUS_PRODUCT_CLASS_BY_LISTING = """
+query GetCurrentPreviousProductsClasses(
+    $first: Int, $after: String, $cached: Boolean
+){
+    currentPreviousProductClasses(
+        first: $first, after: $after, sortBy: {field: LISTING, direction: ASC}
+    ){
+        totalCount(cached: $cached)
+        edges {
+            node {
+                productClassCurrent{
+                    productClassQty
+                    listing {
+                        id
+                    }
+                }
+            }
+        }
+        pageInfo{
+            endCursor
+            hasNextPage
+        }
+    }
+}
+"""
+
+
+def create_listings_with_product_classes(product, channel, count):
+    listings = []
+    for i in range(count):
+        variant = ProductVariant.objects.create(product=product, sku=f"SKU_PC_{i}")
+        listing = ProductVariantChannelListing.objects.create(
+            variant=variant,
+            channel=channel,
+            price_amount=Decimal(10),
+            currency=channel.currency_code,
+        )
+        ProductClassRecommendation.objects.create(
+            listing=listing,
+            product_class_qty=f"qty_{i}",
+            status=ProductClassRecommendationStatus.SUBMITTED,
+        )
+        update_product_classes_current_previous([listing.id])
+        listings.append(listing)
+    return listings
+
+
+def test_current_previous_product_classes_paginated_by_listing(
+    staff_api_client, product, channel_USD, permission_manage_product_class
+):
+    # given
+    query = QUERY_CURRENT_PREVIOUS_PRODUCT_CLASS_BY_LISTING
+    staff_api_client.user.user_permissions.add(permission_manage_product_class)
+    listings = create_listings_with_product_classes(product, channel_USD, 3)
+
+    # when
+    response = staff_api_client.post_graphql(query, {"first": 2})
+    first_page = get_graphql_content(response)["data"]["currentPreviousProductClasses"]
+    response = staff_api_client.post_graphql(
+        query, {"first": 2, "after": first_page["pageInfo"]["endCursor"]}
+    )
+    second_page = get_graphql_content(response)["data"]["currentPreviousProductClasses"]
+
+    # then
+    listing_ids = [
+        edge["node"]["productClassCurrent"]["listing"]["id"]
+        for edge in first_page["edges"] + second_page["edges"]
+    ]
+    assert listing_ids == [
+        graphene.Node.to_global_id("ProductVariantChannelListing", listing.id)
+        for listing in listings
+    ]
+    assert first_page["pageInfo"]["hasNextPage"] is True
+    assert second_page["pageInfo"]["hasNextPage"] is False
+
+
+def test_current_previous_product_classes_cached_total_count(
+    staff_api_client, product, channel_USD, permission_manage_product_class
+):
+    # given
+    query = QUERY_CURRENT_PREVIOUS_PRODUCT_CLASS_BY_LISTING
+    staff_api_client.user.user_permissions.add(permission_manage_product_class)
+    listing = create_listings_with_product_classes(product, channel_USD, 2)[0]
+    cache.clear()
+    response = staff_api_client.post_graphql(query, {"first": 1, "cached": True})
+    content = get_graphql_content(response)
+    assert content["data"]["currentPreviousProductClasses"]["totalCount"] == 2
+
+    ProductClassRecommendation.objects.filter(listing=listing).delete()
+    update_product_classes_current_previous([listing.id])
+
+    # when
+    response = staff_api_client.post_graphql(query, {"first": 1, "cached": True})
+    cached_count = get_graphql_content(response)["data"][
+        "currentPreviousProductClasses"
+    ]["totalCount"]
+    response = staff_api_client.post_graphql(query, {"first": 1})
+    exact_count = get_graphql_content(response)["data"][
+        "currentPreviousProductClasses"
+    ]["totalCount"]
+
+    # then
+    assert cached_count == 2
+    assert exact_count == 1
@@ -0,0 +1,170 @@
+from unittest.mock import Mock, patch
+
+from django.db import OperationalError
+
+from ...core import JobStatus
+from ...tests.utils import flush_post_commit_hooks
+from .. import ProductClassRecommendationStatus
+from ..models import ProductClassRecommendationChangeStatusJob
+from ..tasks import (
+    change_product_classes_status_task,
+    on_change_status_task_failure,
+    on_change_status_task_success,
+)
+
+
+def test_change_product_classes_status_task(
+    product_class_recommendations, staff_user, settings
+):
+    # given
+    settings.PRODUCT_CLASS_CHANGE_STATUS_BATCH_SIZE = 2
+    draft, submitted, approved = product_class_recommendations
+    job = ProductClassRecommendationChangeStatusJob.objects.create(
+        user=staff_user,
+        product_class_status=ProductClassRecommendationStatus.APPROVED,
+        product_class_ids=[draft.id, submitted.id, approved.id],
+        total_count=3,
+    )
+
+    # when
+    change_product_classes_status_task(job.pk)
+    flush_post_commit_hooks()
+
+    # then
+    job.refresh_from_db()
+    assert job.processed_count == 3
+    assert job.updated_count == 2
+
+    submitted.refresh_from_db()
+    assert submitted.status == ProductClassRecommendationStatus.APPROVED
+    assert submitted.approved_by == staff_user
+    product_class_metadata = submitted.listing.metadata["product_class"]
+    assert product_class_metadata["current"]["status"] == submitted.status
+
+
+def test_change_product_classes_status_task_resumes_processed_job(
+    product_class_recommendations, staff_user
+):
+    # given
+    draft, submitted, _ = product_class_recommendations
+    job = ProductClassRecommendationChangeStatusJob.objects.create(
+        user=staff_user,
+        product_class_status=ProductClassRecommendationStatus.SUBMITTED,
+        product_class_ids=[draft.id, submitted.id],
+        total_count=2,
+        processed_count=1,
+    )
+
+    # when
+    change_product_classes_status_task(job.pk)
+
+    # then
+    job.refresh_from_db()
+    assert job.processed_count == 2
+    draft.refresh_from_db()
+    assert draft.status == ProductClassRecommendationStatus.DRAFT
+
+
+@patch("saleor.product_class.tasks.change_product_classes_status")
+def test_change_product_classes_status_task_retries_from_processed_count(
+    change_product_classes_status_mock,
+    product_class_recommendations,
+    staff_user,
+    settings,
+):
+    # given
+    settings.PRODUCT_CLASS_CHANGE_STATUS_BATCH_SIZE = 1
+    draft, submitted, approved = product_class_recommendations
+    job = ProductClassRecommendationChangeStatusJob.objects.create(
+        user=staff_user,
+        product_class_status=ProductClassRecommendationStatus.SUBMITTED,
+        product_class_ids=[draft.id, submitted.id, approved.id],
+        total_count=3,
+    )
+    change_product_classes_status_mock.side_effect = [1, OperationalError(), 1, 0]
+
+    # when
+    result = change_product_classes_status_task.apply(args=[job.pk])
+
+    # then
+    assert result.successful()
+    processed_ids = [
+        call.args[0] for call in change_product_classes_status_mock.call_args_list
+    ]
+    assert processed_ids == [[draft.id], [submitted.id], [submitted.id], [approved.id]]
+    job.refresh_from_db()
+    assert job.status == JobStatus.SUCCESS
+    assert job.processed_count == 3
+    assert job.updated_count == 2
+
+
+def test_change_product_classes_status_task_retry_after_failed_progress_save(
+    product_class_recommendations, staff_user, settings
+):
+    # given
+    settings.PRODUCT_CLASS_CHANGE_STATUS_BATCH_SIZE = 2
+    draft, submitted, approved = product_class_recommendations
+    job = ProductClassRecommendationChangeStatusJob.objects.create(
+        user=staff_user,
+        product_class_status=ProductClassRecommendationStatus.APPROVED,
+        product_class_ids=[draft.id, submitted.id, approved.id],
+        total_count=3,
+    )
+    save = ProductClassRecommendationChangeStatusJob.save
+    failed_saves = []
+
+    def save_failing_once(instance, *args, **kwargs):
+        if "processed_count" in kwargs.get("update_fields", []) and not failed_saves:
+            failed_saves.append(instance.processed_count)
+            raise OperationalError()
+        return save(instance, *args, **kwargs)
+
+    # when
+    with patch.object(
+        ProductClassRecommendationChangeStatusJob,
+        "save",
+        autospec=True,
+        side_effect=save_failing_once,
+    ):
+        result = change_product_classes_status_task.apply(args=[job.pk])
+
+    # then
+    assert result.successful()
+    assert failed_saves == [2]
+    job.refresh_from_db()
+    assert job.processed_count == 3
+    # the retried batch is counted, already approved recommendation is skipped
+    assert job.updated_count == 2
+    submitted.refresh_from_db()
+    assert submitted.status == ProductClassRecommendationStatus.APPROVED
+
+
+def test_on_change_status_task_failure(staff_user):
+    # given
+    job = ProductClassRecommendationChangeStatusJob.objects.create(
+        user=staff_user, product_class_status=ProductClassRecommendationStatus.DRAFT
+    )
+
+    # when
+    on_change_status_task_failure(
+        None, Exception("Test"), "task_id", [job.pk], {}, Mock(type="Test error")
+    )
+
+    # then
+    job.refresh_from_db()
+    assert job.status == JobStatus.FAILED
+    assert job.message == "Test"
+
+
+def test_on_change_status_task_success(staff_user):
+    # given
+    job = ProductClassRecommendationChangeStatusJob.objects.create(
+        user=staff_user, product_class_status=ProductClassRecommendationStatus.DRAFT
+    )
+
+    # when
+    on_change_status_task_success(None, None, "task_id", [job.pk], {})
+
+    # then
+    job.refresh_from_db()
+    assert job.status == JobStatus.SUCCESS
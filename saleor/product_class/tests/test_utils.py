@@ -0,0 +1,176 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ...tests.utils import flush_post_commit_hooks
+from .. import ProductClassCurrentPreviousType, ProductClassRecommendationStatus
+from ..models import (
+    ProductClassRecommendation,
+    ProductClassRecommendationCurrentPrevious,
+)
+from ..utils import (
+    change_product_classes_status,
+    store_product_classes_in_listings_metadata,
+    update_current_previous_for_product_classes,
+    update_product_classes_current_previous,
+)
+
+
+def test_update_product_classes_current_previous(product_class_recommendations):
+    # given
+    draft, submitted, approved = product_class_recommendations
+    listing_id = draft.listing_id
+
+    # when
+    update_product_classes_current_previous([listing_id])
+
+    # then
+    pointers = {
+        pointer.type: pointer
+        for pointer in ProductClassRecommendationCurrentPrevious.objects.filter(
+            listing_id=listing_id
+        )
+    }
+    assert pointers[ProductClassCurrentPreviousType.APPROVED].current == approved
+    assert pointers[ProductClassCurrentPreviousType.APPROVED].previous is None
+    submitted_approved = pointers[ProductClassCurrentPreviousType.SUBMITTED_APPROVED]
+    assert submitted_approved.current == approved
+    assert submitted_approved.previous == submitted
+    draft_submitted = pointers[ProductClassCurrentPreviousType.DRAFT_SUBMITTED]
+    assert draft_submitted.current == submitted
+    assert draft_submitted.previous == draft
+
+
+def test_update_product_classes_current_previous_locks_listings(
+    product_class_recommendations,
+):
+    # given
+    listing_id = product_class_recommendations[0].listing_id
+
+    # when
+    with CaptureQueriesContext(connection) as queries:
+        update_product_classes_current_previous([listing_id])
+
+    # then
+    lock_query = next(query["sql"] for query in queries if "FOR UPDATE" in query["sql"])
+    assert "product_productvariantchannellisting" in lock_query
+    assert "ORDER BY" in lock_query
+    assert ProductClassRecommendationCurrentPrevious.objects.filter(
+        listing_id=listing_id
+    ).exists()
+
+
+def test_qs_current_previous(product_class_recommendations):
+    # given
+    draft, submitted, approved = product_class_recommendations
+    list_status = [
+        ProductClassRecommendationStatus.SUBMITTED,
+        ProductClassRecommendationStatus.APPROVED,
+    ]
+
+    # when
+    product_classes = ProductClassRecommendation.objects.qs_current_previous(
+        list_status
+    )
+
+    # then
+    assert set(product_classes) == {submitted, approved}
+    assert list(ProductClassRecommendation.objects.qs_current(list_status)) == [
+        approved
+    ]
+    assert list(ProductClassRecommendation.objects.qs_previous(list_status)) == [
+        submitted
+    ]
+
+
+def test_update_current_previous_for_changed_status(product_class_recommendation):
+    # given
+    product_class_recommendation.status = ProductClassRecommendationStatus.APPROVED
+    product_class_recommendation.save(update_fields=["status"])
+
+    # when
+    update_current_previous_for_product_classes([product_class_recommendation])
+
+    # then
+    pointers = ProductClassRecommendationCurrentPrevious.objects.filter(
+        listing_id=product_class_recommendation.listing_id
+    )
+    assert {pointer.type for pointer in pointers} == {
+        ProductClassCurrentPreviousType.APPROVED,
+        ProductClassCurrentPreviousType.SUBMITTED_APPROVED,
+    }
+
+
+def test_store_product_classes_in_listings_metadata(
+    product_class_recommendations,
+    channel_variant_metadata,
+    settings,
+    django_assert_num_queries,
+):
+    # given
+    settings.PRODUCT_CLASS_METADATA_BATCH_SIZE = 1
+    approved = product_class_recommendations[2]
+    channel_variant_metadata.store_value_in_metadata({"key_B": "value_B"})
+    channel_variant_metadata.save(update_fields=["metadata"])
+
+    # when
+    # the batch is written in its own transaction, which adds savepoint queries
+    with django_assert_num_queries(5):
+        store_product_classes_in_listings_metadata([channel_variant_metadata.id])
+
+    # then
+    channel_variant_metadata.refresh_from_db()
+    metadata = channel_variant_metadata.metadata
+    assert metadata["key_B"] == "value_B"
+    assert metadata["product_class"]["current"]["status"] == approved.status
+    assert (
+        metadata["product_class"]["current"]["product_class_qty"]
+        == approved.product_class_qty
+    )
+    assert "previous" not in metadata["product_class"]
+
+
+def test_change_product_classes_status_skips_approved(
+    product_class_recommendations, staff_user
+):
+    # given
+    draft, _, approved = product_class_recommendations
+
+    # when
+    count = change_product_classes_status(
+        [draft.id, approved.id],
+        ProductClassRecommendationStatus.SUBMITTED,
+        staff_user.id,
+    )
+
+    # then
+    assert count == 1
+    draft.refresh_from_db()
+    approved.refresh_from_db()
+    assert draft.status == ProductClassRecommendationStatus.SUBMITTED
+    assert draft.updated_by == staff_user
+    assert approved.status == ProductClassRecommendationStatus.APPROVED
+
+
+def test_change_product_classes_status_stores_metadata_after_commit(
+    product_class_recommendations, staff_user
+):
+    # given
+    _, submitted, _ = product_class_recommendations
+    listing = submitted.listing
+    listing.metadata.pop("product_class", None)
+    listing.save(update_fields=["metadata"])
+
+    # when
+    change_product_classes_status(
+        [submitted.id], ProductClassRecommendationStatus.APPROVED, staff_user.id
+    )
+
+    # then
+    listing.refresh_from_db()
+    assert "product_class" not in listing.metadata
+    flush_post_commit_hooks()
+    listing.refresh_from_db()
+    product_class_metadata = listing.metadata["product_class"]
+    assert product_class_metadata["current"]["status"] == (
+        ProductClassRecommendationStatus.APPROVED
+    )
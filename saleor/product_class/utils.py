@@ -0,0 +1,182 @@
+from functools import partial
+from typing import Iterable, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import OuterRef, Q, Subquery
+from django.forms.models import model_to_dict
+from django.utils import timezone
+
+from ..core.tracing import traced_atomic_transaction
+from ..product.models import ProductVariantChannelListing
+from . import ProductClassCurrentPreviousType, ProductClassRecommendationStatus
+from .models import (
+    ProductClassRecommendation,
+    ProductClassRecommendationCurrentPrevious,
+)
+
+
+@traced_atomic_transaction()
+def update_product_classes_current_previous(listing_ids: Iterable[int]):
+    """Recalculate current and previous product class pointers of listings.
+
+    For every tracked status set the two latest recommendations of each listing
+    are picked with an indexed lookup, so the cost depends on the number of
+    given listings and not on the size of the recommendation table. Listings are
+    locked for update, so concurrent recalculations of the same listings don't
+    insert the same pointers.
+    """
+    listing_ids = {listing_id for listing_id in listing_ids if listing_id}
+    if not listing_ids:
+        return
+    listing_ids = set(
+        ProductVariantChannelListing.objects.select_for_update(of=("self",))
+        .filter(pk__in=listing_ids)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+    types = [type_ for type_, _ in ProductClassCurrentPreviousType.CHOICES]
+    annotations = {}
+    for type_ in types:
+        recommendations = ProductClassRecommendation.objects.filter(
+            listing_id=OuterRef("pk"),
+            status__in=ProductClassCurrentPreviousType.STATUSES[type_],
+        ).order_by(*ProductClassCurrentPreviousType.ORDERING[type_])
+        annotations[f"{type_}_current"] = Subquery(recommendations.values("id")[:1])
+        annotations[f"{type_}_previous"] = Subquery(recommendations.values("id")[1:2])
+
+    pointers = []
+    listings = (
+        ProductVariantChannelListing.objects.filter(pk__in=listing_ids)
+        .annotate(**annotations)
+        .values("pk", *annotations.keys())
+    )
+    for listing in listings:
+        for type_ in types:
+            current_id = listing[f"{type_}_current"]
+            if not current_id:
+                continue
+            pointers.append(
+                ProductClassRecommendationCurrentPrevious(
+                    listing_id=listing["pk"],
+                    type=type_,
+                    current_id=current_id,
+                    previous_id=listing[f"{type_}_previous"],
+                )
+            )
+
+    ProductClassRecommendationCurrentPrevious.objects.filter(
+        listing_id__in=listing_ids
+    ).delete()
+    ProductClassRecommendationCurrentPrevious.objects.bulk_create(pointers)
+
+
+def update_current_previous_for_product_classes(
+    product_classes: Iterable[ProductClassRecommendation],
+):
+    """Recalculate pointers of listings affected by changed recommendations.
+
+    Besides listings the recommendations belong to, listings that still point
+    to any of them are refreshed too, as the recommendation may have been
+    moved to another listing or deleted.
+    """
+    ids, listing_ids = set(), set()
+    for product_class in product_classes:
+        ids.add(product_class.pk)
+        listing_ids.add(product_class.listing_id)
+    listing_ids.update(
+        ProductClassRecommendationCurrentPrevious.objects.filter(
+            Q(current_id__in=ids) | Q(previous_id__in=ids)
+        ).values_list("listing_id", flat=True)
+    )
+    update_product_classes_current_previous(listing_ids)
+
+
+def get_product_class_metadata_fields(data: dict) -> dict:
+    return {
+        "product_class_qty": data["product_class_qty"],
+        "product_class_value": data["product_class_value"],
+        "product_class_recommendation": data["product_class_recommendation"],
+        "status": data["status"],
+        "approved_at": data["approved_at"],
+    }
+
+
+def store_product_classes_in_listings_metadata(listing_ids: Iterable[int]):
+    """Write approved current and previous product classes to listings metadata.
+
+    Listings are processed in batches of `PRODUCT_CLASS_METADATA_BATCH_SIZE`,
+    each one written with a single bulk update in its own transaction, so
+    listings are locked only until their batch is written.
+    """
+    listing_ids = sorted(listing_ids)
+    batch_size = settings.PRODUCT_CLASS_METADATA_BATCH_SIZE
+    for start in range(0, len(listing_ids), batch_size):
+        end = start + batch_size
+        with traced_atomic_transaction():
+            _store_product_classes_in_listings_metadata(listing_ids[start:end])
+
+
+def _store_product_classes_in_listings_metadata(listing_ids: List[int]):
+    # each listing have 1 or 2 approved product classes
+    pointers = ProductClassRecommendationCurrentPrevious.objects.filter(
+        listing_id__in=listing_ids,
+        type=ProductClassCurrentPreviousType.APPROVED,
+    ).select_related("current", "previous")
+
+    metadata_by_listing = {}
+    for pointer in pointers:
+        obj_metadata = {
+            "current": get_product_class_metadata_fields(
+                model_to_dict(pointer.current)
+            ),
+        }
+        if pointer.previous:
+            obj_metadata["previous"] = get_product_class_metadata_fields(
+                model_to_dict(pointer.previous)
+            )
+        metadata_by_listing[pointer.listing_id] = obj_metadata
+
+    listings = list(
+        ProductVariantChannelListing.objects.select_for_update(of=("self",))
+        .filter(id__in=metadata_by_listing.keys())
+        .order_by("pk")
+        .only("id", "metadata")
+    )
+    for listing in listings:
+        listing.store_value_in_metadata(
+            {"product_class": metadata_by_listing[listing.id]}
+        )
+    ProductVariantChannelListing.objects.bulk_update(listings, ["metadata"])
+
+
+@traced_atomic_transaction()
+def change_product_classes_status(
+    product_class_ids: Iterable[int], status: str, user_id: Optional[int] = None
+) -> int:
+    """Change status of recommendations and return how many were updated.
+
+    Already approved recommendations are left untouched. Metadata of listings with
+    approved recommendations is written after the status change is committed.
+    """
+    queryset = ProductClassRecommendation.objects.filter(
+        pk__in=product_class_ids
+    ).exclude(status=ProductClassRecommendationStatus.APPROVED)
+    obj_update = {
+        "updated_by_id": user_id,
+        "status": status,
+        "updated_at": timezone.now(),
+    }
+    if status == ProductClassRecommendationStatus.APPROVED:
+        obj_update["approved_by_id"] = user_id
+        obj_update["approved_at"] = timezone.now()
+
+    listing_ids = set(queryset.values_list("listing_id", flat=True))
+    count = queryset.update(**obj_update)
+    update_product_classes_current_previous(listing_ids)
+    if status == ProductClassRecommendationStatus.APPROVED:
+        transaction.on_commit(
+            partial(store_product_classes_in_listings_metadata, listing_ids)
+        )
+    return count
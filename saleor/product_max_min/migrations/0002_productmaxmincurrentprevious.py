@@ -0,0 +1,72 @@
+# Generated by Django 3.2.6 on 2021-11-15 03:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+FILL_CURRENT_PREVIOUS = """
+INSERT INTO product_max_min_productmaxmincurrentprevious
+    (listing_id, current_id, previous_id)
+SELECT listing_id,
+       MAX(id) FILTER (WHERE row_number = 1),
+       MAX(id) FILTER (WHERE row_number = 2)
+FROM (
+    SELECT id, listing_id, ROW_NUMBER() OVER (
+        PARTITION BY listing_id ORDER BY created_at DESC, id DESC
+    ) AS row_number
+    FROM product_max_min_productmaxmin
+) AS revisions
+WHERE row_number <= 2
+GROUP BY listing_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0148_auto_20210929_0806"),
+        ("product_max_min", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="productmaxmin",
+            index=models.Index(
+                fields=["listing", "-created_at", "-id"],
+                name="productmaxmin_listing_idx",
+            ),
+        ),
+        migrations.CreateModel(
+            name="ProductMaxMinCurrentPrevious",
+            fields=[
+                (
+                    "listing",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="product_max_min_current_previous",
+                        serialize=False,
+                        to="product.productvariantchannellisting",
+                    ),
+                ),
+                (
+                    "current",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="listing_current",
+                        to="product_max_min.productmaxmin",
+                    ),
+                ),
+                (
+                    "previous",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="listing_previous",
+                        to="product_max_min.productmaxmin",
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunSQL(FILL_CURRENT_PREVIOUS, reverse_sql=migrations.RunSQL.noop),
+    ]
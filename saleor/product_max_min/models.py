@@ -1,7 +1,5 @@
 from django.db import models
 from django.db.models import Q
-from django.db.models.expressions import F, Subquery, Window
-from django.db.models.functions import RowNumber
 
 from saleor import settings
 from saleor.core.permissions import ProductMaxMinPermissions
@@ -9,44 +7,20 @@ from saleor.product.models import ProductVariantChannelListing
 
 
 class ProductMaxMinQueryset(models.QuerySet):
-    def qs_group_partition(self):
-        return ProductMaxMin.objects.annotate(
-            row_number=Window(
-                expression=RowNumber(),
-                partition_by=[F("listing_id")],
-                order_by=F("created_at").desc(),
-            )
-        ).order_by("-created_at")
-
-    def get_data_after_group_partition(self):
-        group_data_by_listing = {}
-        ids = []
-        products_max_min = self.qs_group_partition().values(
-            "listing_id", "id", "row_number"
-        )
-        for item in products_max_min:
-            if item["row_number"] > 2:
-                continue
-            if item["listing_id"] not in group_data_by_listing.keys():
-                group_data_by_listing[item["listing_id"]] = [item["id"]]
-            else:
-                group_data_by_listing[item["listing_id"]].append(item["id"])
-            ids.append(item["id"])
-        return ids, group_data_by_listing
+    def qs_current(self):
+        return self.filter(listing_current__isnull=False)
+
+    def qs_previous(self):
+        return self.filter(listing_previous__isnull=False)
 
     def qs_filter_current_previous(self):
-        product_max_min_ids, _ = self.get_data_after_group_partition()
-        return self.filter(id__in=product_max_min_ids)
+        return self.filter(
+            Q(listing_current__isnull=False) | Q(listing_previous__isnull=False)
+        )
 
     def get_current_previous_ids(self):
-        current_ids = self.distinct("listing_id").order_by("-listing_id", "-created_at")
-        previous_ids = (
-            self.distinct("listing_id")
-            .order_by("-listing_id", "-created_at")
-            .filter(~Q(id__in=Subquery(current_ids.values("id"))))
-        )
-        current_ids = current_ids.values_list("id", flat=True)
-        previous_ids = previous_ids.values_list("id", flat=True)
+        current_ids = self.qs_current().values_list("id", flat=True)
+        previous_ids = self.qs_previous().values_list("id", flat=True)
         return current_ids, previous_ids
 
 
@@ -79,6 +53,12 @@ class ProductMaxMin(models.Model):
 
     class Meta:
         app_label = "product_max_min"
+        indexes = [
+            models.Index(
+                fields=["listing", "-created_at", "-id"],
+                name="productmaxmin_listing_idx",
+            ),
+        ]
 
         permissions = (
             (
@@ -86,3 +66,33 @@ class ProductMaxMin(models.Model):
                 "Manage product max min.",
             ),
         )
+
+
+class ProductMaxMinCurrentPrevious(models.Model):
+    """Pointers to the latest two product max min revisions of a listing.
+
+    Rows are maintained by `update_products_max_min_current_previous` whenever
+    product max min revisions are created, updated or deleted.
+    """
+
+    listing = models.OneToOneField(
+        ProductVariantChannelListing,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name="product_max_min_current_previous",
+    )
+    current = models.ForeignKey(
+        ProductMaxMin,
+        on_delete=models.CASCADE,
+        related_name="listing_current",
+    )
+    previous = models.ForeignKey(
+        ProductMaxMin,
+        on_delete=models.SET_NULL,
+        related_name="listing_previous",
+        blank=True,
+        null=True,
+    )
+
+    class Meta:
+        app_label = "product_max_min"
@@ -1,4 +1,6 @@
 import graphene
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from saleor.graphql.tests.utils import assert_no_permission, get_graphql_content
 from saleor.product_max_min.error_codes import ProductMaxMinErrorCode
@@ -42,6 +44,7 @@ def test_product_max_min_bulk_create(
     assert ProductMaxMin.objects.count() == 1
     assert param[0]["maxLevel"] == data["maxLevel"]
     assert param[0]["minLevel"] == data["minLevel"]
+    assert ProductMaxMin.objects.qs_current().get().max_level == data["maxLevel"]
 
 
 def test_product_max_min_bulk_create_error(
@@ -250,3 +253,149 @@ def test_product_max_min_bulk_delete_no_permission(staff_api_client, product_max
 
     # then
     assert_no_permission(response)
+
+
+QUERY_BULK_CREATE_PRODUCT_MAX_MIN_WITH_ERRORS = """
+mutation ProductMaxMinBulkCreate($input: [ProductMaxMinInput!]!){
+    productMaxMinBulkCreate(input: $input){
+        count
+        productsMaxMin{
+            minLevel
+            maxLevel
+        }
+        productClassMaxMinErrors{
+            field
+            code
+            index
+        }
+    }
+}
+"""
+
+
+def test_product_max_min_bulk_create_returns_errors_per_item(
+    staff_api_client, channel_variant_metadata, permission_manage_product_max_min
+):
+    # given
+    listing_id = graphene.Node.to_global_id(
+        "ProductVariantChannelListing", channel_variant_metadata.id
+    )
+    missing_listing_id = graphene.Node.to_global_id(
+        "ProductVariantChannelListing", channel_variant_metadata.id + 1
+    )
+    variables = {
+        "input": [
+            {"listing": listing_id, "minLevel": 2, "maxLevel": 11},
+            {"listing": listing_id, "minLevel": 12, "maxLevel": 11},
+            {"listing": missing_listing_id, "minLevel": 2, "maxLevel": 11},
+            {"listing": "invalid", "minLevel": 2, "maxLevel": 11},
+        ]
+    }
+
+    # when
+    response = staff_api_client.post_graphql(
+        QUERY_BULK_CREATE_PRODUCT_MAX_MIN_WITH_ERRORS,
+        variables,
+        permissions=[permission_manage_product_max_min],
+    )
+
+    # then
+    content = get_graphql_content(response)
+    data = content["data"]["productMaxMinBulkCreate"]
+    assert data["count"] == 1
+    assert data["productsMaxMin"] == [{"minLevel": 2, "maxLevel": 11}]
+    errors = sorted(data["productClassMaxMinErrors"], key=lambda e: e["index"])
+    assert [(error["index"], error["code"]) for error in errors] == [
+        (1, ProductMaxMinErrorCode.INVALID.name),
+        (2, ProductMaxMinErrorCode.NOT_FOUND.name),
+        (3, ProductMaxMinErrorCode.GRAPHQL_ERROR.name),
+    ]
+    assert ProductMaxMin.objects.get().min_level == 2
+
+
+def test_product_max_min_bulk_create_query_count_does_not_grow(
+    staff_api_client, channel_variant_metadata, permission_manage_product_max_min
+):
+    # given
+    listing_id = graphene.Node.to_global_id(
+        "ProductVariantChannelListing", channel_variant_metadata.id
+    )
+    staff_api_client.user.user_permissions.add(permission_manage_product_max_min)
+
+    def create(count):
+        variables = {
+            "input": [{"listing": listing_id, "minLevel": 2, "maxLevel": 11}] * count
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = staff_api_client.post_graphql(
+                QUERY_BULK_CREATE_PRODUCT_MAX_MIN_WITH_ERRORS, variables
+            )
+        content = get_graphql_content(response)
+        assert content["data"]["productMaxMinBulkCreate"]["count"] == count
+        return len(queries)
+
+    # when
+    single_item_queries = create(1)
+    many_items_queries = create(20)
+
+    # then
+    assert single_item_queries == many_items_queries
+
+
+QUERY_BULK_UPDATE_PRODUCT_MAX_MIN_WITH_ERRORS = """
+mutation ProductMaxMinBulkUpdate($input: [ProductMaxMinBulkUpdateInput!]!){
+    productMaxMinBulkUpdate(input: $input){
+        count
+        productClassMaxMinErrors{
+            field
+            code
+            index
+        }
+    }
+}
+"""
+
+
+def test_product_max_min_bulk_update_returns_errors_per_item(
+    staff_api_client,
+    products_max_min,
+    channel_variant_metadata,
+    permission_manage_product_max_min,
+):
+    # given
+    first, second = products_max_min
+    listing_id = graphene.Node.to_global_id(
+        "ProductVariantChannelListing", channel_variant_metadata.id
+    )
+    first_id = graphene.Node.to_global_id("ProductMaxMin", first.id)
+    second_id = graphene.Node.to_global_id("ProductMaxMin", second.id)
+    variables = {
+        "input": [
+            {"id": first_id, "listing": listing_id, "maxLevel": 20},
+            {"id": first_id, "listing": listing_id, "maxLevel": 30},
+            {"id": second_id, "listing": listing_id, "maxLevel": 1},
+        ]
+    }
+
+    # when
+    response = staff_api_client.post_graphql(
+        QUERY_BULK_UPDATE_PRODUCT_MAX_MIN_WITH_ERRORS,
+        variables,
+        permissions=[permission_manage_product_max_min],
+    )
+
+    # then
+    content = get_graphql_content(response)
+    data = content["data"]["productMaxMinBulkUpdate"]
+    assert data["count"] == 1
+    errors = sorted(data["productClassMaxMinErrors"], key=lambda e: e["index"])
+    assert [(error["index"], error["code"]) for error in errors] == [
+        (1, ProductMaxMinErrorCode.UNIQUE.name),
+        (2, ProductMaxMinErrorCode.INVALID.name),
+    ]
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert first.max_level == 20
+    assert first.min_level == 4
+    assert first.updated_by == staff_api_client.user
+    assert second.max_level == 9
@@ -1,7 +1,13 @@
+from decimal import Decimal
+
 import graphene
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from saleor.graphql.tests.utils import assert_no_permission, get_graphql_content
+from saleor.product.models import ProductVariant, ProductVariantChannelListing
 from saleor.product_max_min.models import ProductMaxMin
+from saleor.product_max_min.utils import update_products_max_min_current_previous
 
 QUERY_CURRENT_PREVIOUS_PRODUCT_MAX_MIN = """
 query GetCurrentPreviousProductsMaxMin($first: Int, $last: Int,
@@ -109,6 +115,98 @@ def test_current_previous_product_max_min_no_permission(
     assert_no_permission(response)
 
 
+QUERY_CURRENT_PREVIOUS_PRODUCT_MAX_MIN_WITH_RELATIONS = """
+query GetCurrentPreviousProductsMaxMin($first: Int){
+    currentPreviousProductsMaxMin(first: $first){
+        edges {
+            node {
+                productMaxMinCurrent{
+                    minLevel
+                    createdBy{
+                        email
+                    }
+                    listing{
+                        channel{
+                            slug
+                        }
+                    }
+                }
+                productMaxMinPrevious{
+                    minLevel
+                    createdBy{
+                        email
+                    }
+                    listing{
+                        channel{
+                            slug
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+"""
+
+
+def create_listings_with_products_max_min(product, channel, user, count):
+    for i in range(count):
+        variant = ProductVariant.objects.create(product=product, sku=f"SKU_MM_{i}")
+        listing = ProductVariantChannelListing.objects.create(
+            variant=variant,
+            channel=channel,
+            price_amount=Decimal(10),
+            currency=channel.currency_code,
+        )
+        ProductMaxMin.objects.bulk_create(
+            [
+                ProductMaxMin(
+                    listing=listing, min_level=1, max_level=2, created_by=user
+                ),
+                ProductMaxMin(
+                    listing=listing, min_level=3, max_level=4, created_by=user
+                ),
+            ]
+        )
+        update_products_max_min_current_previous([listing.id])
+
+
+def test_current_previous_product_max_min_query_count_independent_of_page_size(
+    staff_api_client,
+    product,
+    channel_USD,
+    staff_user,
+    permission_manage_product_max_min,
+):
+    # given
+    query = QUERY_CURRENT_PREVIOUS_PRODUCT_MAX_MIN_WITH_RELATIONS
+    staff_api_client.user.user_permissions.add(permission_manage_product_max_min)
+    create_listings_with_products_max_min(product, channel_USD, staff_user, 5)
+
+    # when
+    with CaptureQueriesContext(connection) as small_page:
+        response = staff_api_client.post_graphql(query, {"first": 1})
+    small_page_data = get_graphql_content(response)
+    with CaptureQueriesContext(connection) as full_page:
+        response = staff_api_client.post_graphql(query, {"first": 5})
+    full_page_data = get_graphql_content(response)
+
+    # then
+    assert len(small_page_data["data"]["currentPreviousProductsMaxMin"]["edges"]) == 1
+    edges = full_page_data["data"]["currentPreviousProductsMaxMin"]["edges"]
+    assert len(edges) == 5
+    for edge in edges:
+        assert edge["node"]["productMaxMinCurrent"]["minLevel"] == 3
+        assert edge["node"]["productMaxMinPrevious"]["minLevel"] == 1
+        assert edge["node"]["productMaxMinPrevious"]["createdBy"]["email"] == (
+            staff_user.email
+        )
+        assert edge["node"]["productMaxMinPrevious"]["listing"]["channel"]["slug"] == (
+            channel_USD.slug
+        )
+    assert len(full_page) == len(small_page)
+
+
 QUERY_DETAIL_PRODUCT_MAX_MIN = """
 query GetProductMaxMin($id: ID!){
     productMaxMin(id: $id){
@@ -0,0 +1,87 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ..models import ProductMaxMin, ProductMaxMinCurrentPrevious
+from ..utils import (
+    update_current_previous_for_products_max_min,
+    update_products_max_min_current_previous,
+)
+
+
+def test_update_products_max_min_current_previous(staff_user, channel_variant_metadata):
+    # given
+    listing = channel_variant_metadata
+    products_max_min = [
+        ProductMaxMin.objects.create(listing=listing, min_level=i, max_level=10)
+        for i in range(3)
+    ]
+
+    # when
+    update_products_max_min_current_previous([listing.id])
+
+    # then
+    pointer = ProductMaxMinCurrentPrevious.objects.get(listing=listing)
+    assert pointer.current == products_max_min[2]
+    assert pointer.previous == products_max_min[1]
+    assert list(ProductMaxMin.objects.qs_current()) == [products_max_min[2]]
+    assert list(ProductMaxMin.objects.qs_previous()) == [products_max_min[1]]
+
+
+def test_update_products_max_min_current_previous_locks_listings(
+    channel_variant_metadata,
+):
+    # given
+    listing = channel_variant_metadata
+    ProductMaxMin.objects.create(listing=listing, min_level=1, max_level=10)
+
+    # when
+    with CaptureQueriesContext(connection) as queries:
+        update_products_max_min_current_previous([listing.id])
+
+    # then
+    lock_query = next(query["sql"] for query in queries if "FOR UPDATE" in query["sql"])
+    assert "product_productvariantchannellisting" in lock_query
+    assert "ORDER BY" in lock_query
+    assert ProductMaxMinCurrentPrevious.objects.filter(listing=listing).exists()
+
+
+def test_update_products_max_min_current_previous_single_revision(product_max_min):
+    # when
+    update_products_max_min_current_previous([product_max_min.listing_id])
+
+    # then
+    pointer = ProductMaxMinCurrentPrevious.objects.get(
+        listing_id=product_max_min.listing_id
+    )
+    assert pointer.current == product_max_min
+    assert pointer.previous is None
+
+
+def test_update_current_previous_for_deleted_products_max_min(products_max_min):
+    # given
+    listing_id = products_max_min[0].listing_id
+    current = ProductMaxMin.objects.qs_current().get()
+    current_id = current.pk
+    current.delete()
+
+    # when
+    update_current_previous_for_products_max_min([current])
+
+    # then
+    pointer = ProductMaxMinCurrentPrevious.objects.get(listing_id=listing_id)
+    assert pointer.current_id != current_id
+    assert pointer.previous is None
+
+
+def test_update_current_previous_for_all_deleted_products_max_min(product_max_min):
+    # given
+    listing_id = product_max_min.listing_id
+    product_max_min.delete()
+
+    # when
+    update_current_previous_for_products_max_min([product_max_min])
+
+    # then
+    assert not ProductMaxMinCurrentPrevious.objects.filter(
+        listing_id=listing_id
+    ).exists()
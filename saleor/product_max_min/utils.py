@@ -0,0 +1,71 @@
+from typing import Iterable
+
+from django.db.models import OuterRef, Q, Subquery
+
+from ..core.tracing import traced_atomic_transaction
+from ..product.models import ProductVariantChannelListing
+from .models import ProductMaxMin, ProductMaxMinCurrentPrevious
+
+
+@traced_atomic_transaction()
+def update_products_max_min_current_previous(listing_ids: Iterable[int]):
+    """Recalculate current and previous product max min pointers of listings.
+
+    The two latest revisions of each listing are picked with an indexed lookup
+    per listing, so the cost depends on the number of given listings and not
+    on the size of the product max min table. Listings are locked for update,
+    so concurrent recalculations of the same listings don't insert the same
+    pointers.
+    """
+    listing_ids = {listing_id for listing_id in listing_ids if listing_id}
+    if not listing_ids:
+        return
+    listing_ids = set(
+        ProductVariantChannelListing.objects.select_for_update(of=("self",))
+        .filter(pk__in=listing_ids)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+    revisions = ProductMaxMin.objects.filter(listing_id=OuterRef("pk")).order_by(
+        "-created_at", "-id"
+    )
+    listings = (
+        ProductVariantChannelListing.objects.filter(pk__in=listing_ids)
+        .annotate(
+            current_id=Subquery(revisions.values("id")[:1]),
+            previous_id=Subquery(revisions.values("id")[1:2]),
+        )
+        .values_list("pk", "current_id", "previous_id")
+    )
+    pointers = [
+        ProductMaxMinCurrentPrevious(
+            listing_id=listing_id, current_id=current_id, previous_id=previous_id
+        )
+        for listing_id, current_id, previous_id in listings
+        if current_id
+    ]
+
+    ProductMaxMinCurrentPrevious.objects.filter(listing_id__in=listing_ids).delete()
+    ProductMaxMinCurrentPrevious.objects.bulk_create(pointers)
+
+
+def update_current_previous_for_products_max_min(
+    products_max_min: Iterable[ProductMaxMin],
+):
+    """Recalculate pointers of listings affected by changed product max min.
+
+    Besides listings the revisions belong to, listings that still point to
+    any of them are refreshed too, as the revision may have been moved to
+    another listing or deleted.
+    """
+    ids, listing_ids = set(), set()
+    for product_max_min in products_max_min:
+        ids.add(product_max_min.pk)
+        listing_ids.add(product_max_min.listing_id)
+    listing_ids.update(
+        ProductMaxMinCurrentPrevious.objects.filter(
+            Q(current_id__in=ids) | Q(previous_id__in=ids)
+        ).values_list("listing_id", flat=True)
+    )
+    update_products_max_min_current_previous(listing_ids)
@@ -385,6 +385,54 @@ PAYMENT_MODEL = "order.Payment"
 
 MAX_CHECKOUT_LINE_QUANTITY = int(os.environ.get("MAX_CHECKOUT_LINE_QUANTITY", 50))
 
+# Number of minutes for which the quantity of checkout lines is reserved in stocks.
+# Reservations are disabled when set to 0.
+RESERVE_STOCK_DURATION = int(os.environ.get("RESERVE_STOCK_DURATION", 0))
+
+# Number of expired stock reservations deleted in one query by the periodic
+# cleanup task.
+EXPIRED_RESERVATIONS_DELETE_BATCH_SIZE = int(
+    os.environ.get("EXPIRED_RESERVATIONS_DELETE_BATCH_SIZE", 1000)
+)
+
+# Allocate stocks of orders with conditional updates of single stocks instead of
+# locking all stocks of the ordered variants, so concurrent orders of the same
+# variants don't wait for each other.
+LOCK_FREE_STOCK_ALLOCATION = get_bool_from_env("LOCK_FREE_STOCK_ALLOCATION", False)
+
+# Number of listings whose product class metadata is rewritten in one UPDATE
+# when product class recommendations are approved in bulk.
+PRODUCT_CLASS_METADATA_BATCH_SIZE = int(
+    os.environ.get("PRODUCT_CLASS_METADATA_BATCH_SIZE", 1000)
+)
+
+# Number of rows of an imported csv/xlsx file saved in one transaction.
+CSV_IMPORT_BATCH_SIZE = int(os.environ.get("CSV_IMPORT_BATCH_SIZE", 5000))
+
+# Number of product class recommendations changed in one transaction by the
+# background change status job.
+PRODUCT_CLASS_CHANGE_STATUS_BATCH_SIZE = int(
+    os.environ.get("PRODUCT_CLASS_CHANGE_STATUS_BATCH_SIZE", 1000)
+)
+
+# Number of seconds a connection's total count requested with
+# `totalCount(cached: true)` is reused for the same filters.
+CONNECTION_TOTAL_COUNT_CACHE_TIMEOUT = int(
+    os.environ.get("CONNECTION_TOTAL_COUNT_CACHE_TIMEOUT", 60)
+)
+
+# Minimal number of rows estimated by the database, for which
+# `totalCount(approximate: true)` returns the estimate instead of an exact count.
+CONNECTION_APPROXIMATE_COUNT_THRESHOLD = int(
+    os.environ.get("CONNECTION_APPROXIMATE_COUNT_THRESHOLD", 10000)
+)
+
+# Number of seconds active discounts are cached for, 0 disables the cache. They are
+# invalidated when sales change, but not when subcategories of discounted categories
+# are added. Invalidation reaches other processes only through the cache, so a cache
+# shared by web and Celery workers (e.g. Redis or Memcached) is required.
+DISCOUNTS_CACHE_TIMEOUT = int(os.environ.get("DISCOUNTS_CACHE_TIMEOUT", 0))
+
 TEST_RUNNER = "saleor.tests.runner.PytestTestRunner"
 
 
@@ -489,6 +537,10 @@ CELERY_BEAT_SCHEDULE = {
         "task": "saleor.warehouse.tasks.delete_empty_allocations_task",
         "schedule": timedelta(days=1),
     },
+    "delete-expired-reservations": {
+        "task": "saleor.warehouse.tasks.delete_expired_reservations_task",
+        "schedule": timedelta(hours=1),
+    },
 }
 
 # Change this value if your application is running behind a proxy,
@@ -520,6 +572,56 @@ GRAPHENE = {
     ],
 }
 
+# Number of parsed and validated GraphQL documents kept in memory by every
+# worker process. Set to 0 to parse and validate each query.
+GRAPHQL_DOCUMENT_CACHE_SIZE = int(os.environ.get("GRAPHQL_DOCUMENT_CACHE_SIZE", 1000))
+
+# Number of seconds the text of an automatic persisted query is kept in the cache
+# after it was registered by a client.
+GRAPHQL_PERSISTED_QUERY_TIMEOUT = int(
+    os.environ.get("GRAPHQL_PERSISTED_QUERY_TIMEOUT", 60 * 60 * 24)
+)
+# Allow sending persisted queries with GET requests, which can be cached by CDNs.
+GRAPHQL_PERSISTED_QUERY_ALLOW_GET = get_bool_from_env(
+    "GRAPHQL_PERSISTED_QUERY_ALLOW_GET", False
+)
+
+# Maximum static cost of a GraphQL query, calculated from field weights and
+# pagination arguments. Set to 0 to disable the query cost analysis.
+GRAPHQL_QUERY_MAX_COST = int(os.environ.get("GRAPHQL_QUERY_MAX_COST", 50000))
+
+# Maximum number of operations sent in one batch request.
+GRAPHQL_BATCH_MAX_OPERATIONS = int(os.environ.get("GRAPHQL_BATCH_MAX_OPERATIONS", 10))
+
+# Number of seconds responses of anonymous catalog queries are cached for. They
+# are invalidated by ResponseCachePlugin when products change. Disabled by default.
+GRAPHQL_RESPONSE_CACHE_TIMEOUT = int(
+    os.environ.get("GRAPHQL_RESPONSE_CACHE_TIMEOUT", 0)
+)
+
+# Reuse channels and plugin configurations loaded by a process in new plugins
+# managers for up to PLUGIN_CONFIGURATION_SNAPSHOT_TIMEOUT seconds. Changes saved
+# through models invalidate the snapshots of all processes through the cache, so
+# a cache shared by web and Celery workers (e.g. Redis or Memcached) is required.
+# Changes which bypass model signals, e.g. `QuerySet.update()`, are picked up
+# only when snapshots expire.
+PLUGIN_CONFIGURATION_SNAPSHOT = get_bool_from_env(
+    "PLUGIN_CONFIGURATION_SNAPSHOT", False
+)
+PLUGIN_CONFIGURATION_SNAPSHOT_TIMEOUT = int(
+    os.environ.get("PLUGIN_CONFIGURATION_SNAPSHOT_TIMEOUT", 60)
+)
+
+# Record time of resolvers, sizes of data loader batches and SQL queries of GraphQL
+# operations. Metrics are exposed in the Prometheus text format at /graphql/metrics/
+# and staff users can request a summary with the X-Saleor-Instrumentation header.
+GRAPHQL_INSTRUMENTATION = get_bool_from_env("GRAPHQL_INSTRUMENTATION", False)
+# Bearer token required to scrape /graphql/metrics/, the endpoint is disabled
+# when it's not set.
+GRAPHQL_INSTRUMENTATION_METRICS_TOKEN = os.environ.get(
+    "GRAPHQL_INSTRUMENTATION_METRICS_TOKEN"
+)
+
 BUILTIN_PLUGINS = [
     "saleor.plugins.avatax.plugin.AvataxPlugin",
     "saleor.plugins.vatlayer.plugin.VatlayerPlugin",
@@ -536,6 +638,7 @@ BUILTIN_PLUGINS = [
     "saleor.plugins.user_email.plugin.UserEmailPlugin",
     "saleor.plugins.admin_email.plugin.AdminEmailPlugin",
     "saleor.plugins.sendgrid.plugin.SendgridEmailPlugin",
+    "saleor.plugins.response_cache.plugin.ResponseCachePlugin",
 ]
 
 # Plugin discovery
@@ -16,6 +16,7 @@ from django.contrib.sites.models import Site
 from django.core.files import File
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db import connection
+from django.db.models import F
 from django.forms import ModelForm
 from django.template.defaultfilters import truncatechars
 from django.test.utils import CaptureQueriesContext as BaseCaptureQueriesContext
@@ -54,6 +55,7 @@ from ..discount.models import (
     VoucherCustomer,
     VoucherTranslation,
 )
+from ..discount.utils import invalidate_discounts_cache
 from ..giftcard import GiftCardEvents, GiftCardExpiryType
 from ..giftcard.models import GiftCard, GiftCardEvent
 from ..menu.models import Menu, MenuItem, MenuItemTranslation
@@ -76,7 +78,7 @@ from ..page.models import Page, PageTranslation, PageType
 from ..payment import ChargeStatus, TransactionKind
 from ..payment.interface import AddressData, GatewayConfig, PaymentData
 from ..payment.models import Payment
-from ..plugins.manager import get_plugins_manager
+from ..plugins.manager import get_plugins_manager, invalidate_plugin_configuration
 from ..plugins.models import PluginConfiguration
 from ..plugins.vatlayer.plugin import VatlayerPlugin
 from ..plugins.webhook.utils import to_payment_app_id
@@ -102,7 +104,9 @@ from ..product.models import (
 from ..product.tests.utils import create_image
 from ..product_class import ProductClassRecommendationStatus
 from ..product_class.models import ProductClassRecommendation
+from ..product_class.utils import update_product_classes_current_previous
 from ..product_max_min.models import ProductMaxMin
+from ..product_max_min.utils import update_products_max_min_current_previous
 from ..shipping.models import (
     ShippingMethod,
     ShippingMethodChannelListing,
@@ -112,7 +116,8 @@ from ..shipping.models import (
 )
 from ..site.models import SiteSettings
 from ..warehouse import WarehouseClickAndCollectOption
-from ..warehouse.models import Allocation, Stock, Warehouse
+from ..warehouse.management import recalculate_stocks_quantity_allocated
+from ..warehouse.models import Allocation, Reservation, Stock, Warehouse
 from ..webhook.event_types import WebhookEventType
 from ..webhook.models import Webhook, WebhookEvent
 from ..wishlist.models import Wishlist
@@ -234,6 +239,18 @@ def sample_gateway(settings):
     ]
 
 
+@pytest.fixture(autouse=True)
+def reset_plugin_configuration():
+    """Reload plugin configurations, as rolled back changes don't invalidate them."""
+    invalidate_plugin_configuration()
+
+
+@pytest.fixture(autouse=True)
+def reset_discounts_cache():
+    """Fetch discounts from the database, as rolled back sales don't invalidate them."""
+    invalidate_discounts_cache()
+
+
 @pytest.fixture(autouse=True)
 def site_settings(db, settings) -> SiteSettings:
     """Create a site and matching site settings.
@@ -282,6 +299,38 @@ def checkout_with_item(checkout, product):
     return checkout
 
 
+@pytest.fixture
+def checkout_line_with_reservation_in_many_stocks(
+    customer_user, variant_with_many_stocks, channel_USD
+):
+    checkout = Checkout.objects.create(
+        currency=channel_USD.currency_code, channel=channel_USD, user=customer_user
+    )
+    checkout.set_country("US", commit=True)
+    variant = variant_with_many_stocks
+    stocks = variant.stocks.all().order_by("pk")
+    checkout_line = checkout.lines.create(variant=variant, quantity=3)
+
+    reserved_until = timezone.now() + datetime.timedelta(minutes=5)
+    Reservation.objects.bulk_create(
+        [
+            Reservation(
+                checkout_line=checkout_line,
+                stock=stocks[0],
+                quantity_reserved=2,
+                reserved_until=reserved_until,
+            ),
+            Reservation(
+                checkout_line=checkout_line,
+                stock=stocks[1],
+                quantity_reserved=1,
+                reserved_until=reserved_until,
+            ),
+        ]
+    )
+    return checkout_line
+
+
 @pytest.fixture
 def checkouts_list(channel_USD, channel_PLN):
     checkouts_usd = Checkout.objects.bulk_create(
@@ -2556,6 +2605,12 @@ def order_line_with_allocation_in_many_stocks(
             Allocation(order_line=order_line, stock=stocks[1], quantity_allocated=1),
         ]
     )
+    Stock.objects.filter(pk=stocks[0].pk).update(
+        quantity_allocated=F("quantity_allocated") + 2
+    )
+    Stock.objects.filter(pk=stocks[1].pk).update(
+        quantity_allocated=F("quantity_allocated") + 1
+    )
 
     return order_line
 
@@ -2600,6 +2655,9 @@ def order_line_with_one_allocation(
     Allocation.objects.create(
         order_line=order_line, stock=stocks[0], quantity_allocated=1
     )
+    Stock.objects.filter(pk=stocks[0].pk).update(
+        quantity_allocated=F("quantity_allocated") + 1
+    )
 
     return order_line
 
@@ -2758,6 +2816,8 @@ def order_with_lines(
     Allocation.objects.create(
         order_line=line, stock=stock, quantity_allocated=line.quantity
     )
+    stock.quantity_allocated += line.quantity
+    stock.save(update_fields=["quantity_allocated"])
 
     product = Product.objects.create(
         name="Test product 2",
@@ -2806,6 +2866,8 @@ def order_with_lines(
     Allocation.objects.create(
         order_line=line, stock=stock, quantity_allocated=line.quantity
     )
+    stock.quantity_allocated += line.quantity
+    stock.save(update_fields=["quantity_allocated"])
 
     order.shipping_address = order.billing_address.get_copy()
     order.channel = channel_USD
@@ -2957,6 +3019,8 @@ def order_with_lines_channel_PLN(
     Allocation.objects.create(
         order_line=line, stock=stock, quantity_allocated=line.quantity
     )
+    stock.quantity_allocated += line.quantity
+    stock.save(update_fields=["quantity_allocated"])
 
     product = Product.objects.create(
         name="Test product 2 in PLN channel",
@@ -3004,6 +3068,8 @@ def order_with_lines_channel_PLN(
     Allocation.objects.create(
         order_line=line, stock=stock, quantity_allocated=line.quantity
     )
+    stock.quantity_allocated += line.quantity
+    stock.save(update_fields=["quantity_allocated"])
 
     order.shipping_address = order.billing_address.get_copy()
     order.channel = channel_PLN
@@ -3165,6 +3231,7 @@ def fulfillment_awaiting_approval(fulfilled_order):
 @pytest.fixture
 def draft_order(order_with_lines):
     Allocation.objects.filter(order_line__order=order_with_lines).delete()
+    recalculate_stocks_quantity_allocated()
     order_with_lines.status = OrderStatus.DRAFT
     order_with_lines.origin = OrderOrigin.DRAFT
     order_with_lines.save(update_fields=["status", "origin"])
@@ -4506,6 +4573,8 @@ def stock(variant, warehouse):
 
 @pytest.fixture
 def allocation(order_line, stock):
+    stock.quantity_allocated = order_line.quantity
+    stock.save(update_fields=["quantity_allocated"])
     return Allocation.objects.create(
         order_line=order_line, stock=stock, quantity_allocated=order_line.quantity
     )
@@ -4559,6 +4628,8 @@ def allocations(order_list, stock, channel_USD):
             ),
         ]
     )
+    stock.quantity_allocated = sum(line.quantity for line in lines)
+    stock.save(update_fields=["quantity_allocated"])
     return Allocation.objects.bulk_create(
         [
             Allocation(
@@ -4714,22 +4785,24 @@ def permission_manage_product_max_min():
 
 @pytest.fixture
 def product_class_recommendation(db, staff_user, channel_variant_metadata):
-    return ProductClassRecommendation.objects.create(
-        listing_id=channel_variant.id,
+    product_class = ProductClassRecommendation.objects.create(
+        listing_id=channel_variant_metadata.id,
         product_class_qty="product_class_qty",
         product_class_value="product_class_value",
         product_class_recommendation="product_class_recommendation",
         status=ProductClassRecommendationStatus.DRAFT,
         created_by_id=staff_user.id,
     )
+    update_product_classes_current_previous([channel_variant_metadata.id])
+    return product_class
 
 
 @pytest.fixture
 def product_class_recommendations(db, staff_user, channel_variant_metadata):
-    return ProductClassRecommendation.objects.bulk_create(
+    product_classes = ProductClassRecommendation.objects.bulk_create(
         [
             ProductClassRecommendation(
-                listing_id=channel_variant.id,
+                listing_id=channel_variant_metadata.id,
                 product_class_qty="product_class_qty",
                 product_class_value="product_class_value",
                 product_class_recommendation="product_class_recommendation",
@@ -4738,7 +4811,7 @@ def product_class_recommendations(db, staff_user, channel_variant_metadata):
                 created_at="2021-10-01T01:32:29.279226",
             ),
             ProductClassRecommendation(
-                listing_id=channel_variant.id,
+                listing_id=channel_variant_metadata.id,
                 product_class_qty="product_class_qty1",
                 product_class_value="product_class_value1",
                 product_class_recommendation="product_class_recommendation1",
@@ -4749,7 +4822,7 @@ def product_class_recommendations(db, staff_user, channel_variant_metadata):
                 created_at="2021-10-01T02:32:29.279226",
             ),
             ProductClassRecommendation(
-                listing_id=channel_variant.id,
+                listing_id=channel_variant_metadata.id,
                 product_class_qty="product_class_qty2",
                 product_class_value="product_class_value2",
                 product_class_recommendation="product_class_recommendation2",
@@ -4763,6 +4836,8 @@ def product_class_recommendations(db, staff_user, channel_variant_metadata):
             ),
         ]
     )
+    update_product_classes_current_previous([channel_variant_metadata.id])
+    return product_classes
 
 
 @pytest.fixture
@@ -4782,17 +4857,19 @@ def channel_variant_metadata(product, channel_USD) -> ProductVariantChannelListi
 
 @pytest.fixture
 def product_max_min(db, staff_user, channel_variant_metadata):
-    return ProductMaxMin.objects.create(
+    product_max_min = ProductMaxMin.objects.create(
         listing_id=channel_variant_metadata.id,
         max_level=10,
         min_level=4,
         created_by_id=staff_user.id,
     )
+    update_products_max_min_current_previous([channel_variant_metadata.id])
+    return product_max_min
 
 
 @pytest.fixture
 def products_max_min(db, staff_user, channel_variant_metadata):
-    return ProductMaxMin.objects.bulk_create(
+    products_max_min = ProductMaxMin.objects.bulk_create(
         [
             ProductMaxMin(
                 listing_id=channel_variant_metadata.id,
@@ -4810,3 +4887,5 @@ def products_max_min(db, staff_user, channel_variant_metadata):
             ),
         ]
     )
+    update_products_max_min_current_previous([channel_variant_metadata.id])
+    return products_max_min
@@ -5,7 +5,7 @@ from django.contrib.staticfiles.views import serve
 from django.views.decorators.csrf import csrf_exempt
 
 from .graphql.api import schema
-from .graphql.views import GraphQLView
+from .graphql.views import GraphQLView, instrumentation_metrics
 from .plugins.views import (
     handle_global_plugin_webhook,
     handle_plugin_per_channel_webhook,
@@ -15,6 +15,11 @@ from .product.views import digital_product
 
 urlpatterns = [
     url(r"^graphql/$", csrf_exempt(GraphQLView.as_view(schema=schema)), name="api"),
+    url(
+        r"^graphql/metrics/$",
+        instrumentation_metrics,
+        name="api-instrumentation-metrics",
+    ),
     url(
         r"^digital-download/(?P<token>[0-9A-Za-z_\-]+)/$",
         digital_product,
@@ -6,29 +6,49 @@ from django.db.models.functions import Coalesce
 
 from ..core.exceptions import InsufficientStock, InsufficientStockData
 from .models import Stock, StockQuerySet
+from .reservations import is_reservation_enabled
 
 if TYPE_CHECKING:
+    from ..checkout.models import Checkout
     from ..product.models import ProductVariant
 
 
-def _get_available_quantity(stocks: StockQuerySet) -> int:
-    results = stocks.aggregate(
-        total_quantity=Coalesce(Sum("quantity", distinct=True), 0),
-        quantity_allocated=Coalesce(Sum("allocations__quantity_allocated"), 0),
-    )
+def _get_available_quantity(
+    stocks: StockQuerySet, checkout: Optional["Checkout"] = None
+) -> int:
+    aggregates = {
+        "total_quantity": Coalesce(Sum("quantity"), 0),
+        "quantity_allocated": Coalesce(Sum("quantity_allocated"), 0),
+    }
+    if is_reservation_enabled():
+        stocks = stocks.annotate_reserved_quantity(checkout)
+        aggregates["quantity_reserved"] = Coalesce(Sum("reserved_quantity"), 0)
+    results = stocks.aggregate(**aggregates)
     total_quantity = results["total_quantity"]
     quantity_allocated = results["quantity_allocated"]
+    quantity_reserved = results.get("quantity_reserved", 0)
+
+    return max(total_quantity - quantity_allocated - quantity_reserved, 0)
+
 
-    return max(total_quantity - quantity_allocated, 0)
+def _get_stock_available_quantity(stock: Stock) -> int:
+    # `reserved_quantity` is annotated only when reservations are enabled
+    reserved_quantity = getattr(stock, "reserved_quantity", 0)
+    return max(stock.available_quantity - reserved_quantity, 0)  # type: ignore
 
 
 def check_stock_quantity(
-    variant: "ProductVariant", country_code: str, channel_slug: str, quantity: int
+    variant: "ProductVariant",
+    country_code: str,
+    channel_slug: str,
+    quantity: int,
+    checkout: Optional["Checkout"] = None,
 ):
     """Validate if there is stock available for given variant in given country.
 
     If so - returns None. If there is less stock then required raise InsufficientStock
-    exception.
+    exception. Quantity reserved by other checkouts than the given one is not
+    available.
     """
     if variant.track_inventory:
         stocks = Stock.objects.get_variant_stocks_for_country(
@@ -37,7 +57,7 @@ def check_stock_quantity(
         if not stocks:
             raise InsufficientStock([InsufficientStockData(variant=variant)])
 
-        if quantity > _get_available_quantity(stocks):
+        if quantity > _get_available_quantity(stocks, checkout):
             raise InsufficientStock([InsufficientStockData(variant=variant)])
 
 
@@ -47,9 +67,12 @@ def check_stock_quantity_bulk(
     quantities: Iterable[int],
     channel_slug: str,
     additional_filter_lookup: Optional[Dict[str, Any]] = None,
+    checkout: Optional["Checkout"] = None,
 ):
     """Validate if there is stock available for given variants in given country.
 
+    Quantity reserved by other checkouts than the given one is not available.
+
     :raises InsufficientStock: when there is not enough items in stock for a variant.
     """
     filter_lookup = {"product_variant__in": variants}
@@ -61,6 +84,8 @@ def check_stock_quantity_bulk(
         .filter(**filter_lookup)
         .annotate_available_quantity()
     )
+    if is_reservation_enabled():
+        all_variants_stocks = all_variants_stocks.annotate_reserved_quantity(checkout)
 
     variant_stocks: Dict[int, List[Stock]] = defaultdict(list)
     for stock in all_variants_stocks:
@@ -70,7 +95,7 @@ def check_stock_quantity_bulk(
     for variant, quantity in zip(variants, quantities):
         stocks = variant_stocks.get(variant.pk, [])
         available_quantity = sum(
-            [stock.available_quantity for stock in stocks]  # type: ignore
+            [_get_stock_available_quantity(stock) for stock in stocks]
         )
 
         if not stocks:
@@ -1,15 +1,39 @@
 from collections import defaultdict, namedtuple
-from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, cast
-
-from django.db import transaction
-from django.db.models import F, Sum
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    cast,
+)
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import (
+    Case,
+    F,
+    IntegerField,
+    OuterRef,
+    QuerySet,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
 from ..core.exceptions import AllocationError, InsufficientStock, InsufficientStockData
 from ..core.tracing import traced_atomic_transaction
 from ..order import OrderLineData
 from ..plugins.manager import PluginsManager
 from ..product.models import ProductVariant
-from .models import Allocation, Stock, Warehouse
+from .models import Allocation, Reservation, Stock, Warehouse
+from .reservations import is_reservation_enabled
 
 if TYPE_CHECKING:
     from ..order.models import Order, OrderLine
@@ -33,7 +57,11 @@ def allocate_stocks(
     ({"stock_pk": "quantity_allocated"}) with actual allocated quantity for stocks.
     Iterate by stocks and allocate as many items as needed or available in stock
     for order line, until allocated all required quantity for the order line.
+    Quantity reserved for checkouts is not available for allocation.
     If there is less quantity in stocks then rise InsufficientStock exception.
+
+    When `LOCK_FREE_STOCK_ALLOCATION` is enabled, stocks are not locked and
+    each stock is allocated with a conditional update instead.
     """
     # allocation only applied to order lines with variants with track inventory
     # set to True
@@ -47,33 +75,34 @@ def allocate_stocks(
     if additional_filter_lookup is not None:
         filter_lookup.update(additional_filter_lookup)
 
-    stocks = list(
+    if settings.LOCK_FREE_STOCK_ALLOCATION:
+        return _allocate_stocks_without_locks(
+            order_lines_info, country_code, channel_slug, manager, filter_lookup
+        )
+
+    stocks_qs = (
         Stock.objects.select_for_update(of=("self",))
         .for_country_and_channel(country_code, channel_slug)
         .filter(**filter_lookup)
         .order_by("pk")
-        .values("id", "product_variant", "pk", "quantity")
     )
-    stocks_id = (stock.pop("id") for stock in stocks)
-
-    quantity_allocation_list = list(
-        Allocation.objects.filter(
-            stock_id__in=stocks_id,
-            quantity_allocated__gt=0,
-        )
-        .values("stock")
-        .annotate(quantity_allocated_sum=Sum("quantity_allocated"))
-    )
-    quantity_allocation_for_stocks: Dict = defaultdict(int)
-    for allocation in quantity_allocation_list:
-        quantity_allocation_for_stocks[allocation["stock"]] += allocation[
-            "quantity_allocated_sum"
-        ]
+    fields = ["product_variant", "pk", "quantity", "quantity_allocated"]
+    if is_reservation_enabled():
+        stocks_qs = stocks_qs.annotate_reserved_quantity()
+        fields.append("reserved_quantity")
+    stocks = list(stocks_qs.values(*fields))
+    quantity_allocation_for_stocks: Dict = {
+        stock_data["pk"]: stock_data.pop("quantity_allocated") for stock_data in stocks
+    }
 
     variant_to_stocks: Dict[str, List[StockData]] = defaultdict(list)
+    stocks_data = []
     for stock_data in stocks:
         variant = stock_data.pop("product_variant")
-        variant_to_stocks[variant].append(StockData(**stock_data))
+        # quantity reserved for checkouts can't be allocated
+        stock_data["quantity"] -= stock_data.pop("reserved_quantity", 0)
+        stocks_data.append(StockData(**stock_data))
+        variant_to_stocks[variant].append(stocks_data[-1])
 
     insufficient_stock: List[InsufficientStockData] = []
     allocations: List[Allocation] = []
@@ -93,18 +122,196 @@ def allocate_stocks(
 
     if allocations:
         Allocation.objects.bulk_create(allocations)
-
+        stocks_quantity_allocated: Dict[int, int] = defaultdict(int)
         for allocation in allocations:
-            allocated_stock = (
-                Allocation.objects.filter(stock_id=allocation.stock_id).aggregate(
-                    Sum("quantity_allocated")
-                )["quantity_allocated__sum"]
-                or 0
+            stocks_quantity_allocated[
+                allocation.stock_id
+            ] += allocation.quantity_allocated
+        update_stocks_quantity_allocated(stocks_quantity_allocated)
+
+        # `quantity_allocation_for_stocks` includes the created allocations
+        out_of_stock_pks = [
+            stock_data.pk
+            for stock_data in stocks_data
+            if stock_data.pk in stocks_quantity_allocated
+            and stock_data.quantity - quantity_allocation_for_stocks[stock_data.pk] <= 0
+        ]
+        if out_of_stock_pks:
+            notify_stocks_on_commit(
+                manager.product_variant_out_of_stock,
+                Stock.objects.filter(pk__in=out_of_stock_pks),
             )
-            if not max(allocation.stock.quantity - allocated_stock, 0):
-                transaction.on_commit(
-                    lambda: manager.product_variant_out_of_stock(allocation.stock)
+
+
+def _allocate_stocks_without_locks(
+    order_lines_info: Iterable["OrderLineData"],
+    country_code: str,
+    channel_slug: str,
+    manager: PluginsManager,
+    filter_lookup: Dict[str, Any],
+):
+    """Allocate stocks for given `order_lines` without locking the stocks.
+
+    Stocks are read without a lock and each stock is allocated with a single update
+    that succeeds only when the stock still has enough available quantity.
+    Stocks are updated in the order of pk, the same order in which they are locked
+    by `allocate_stocks`, so concurrent allocations can't deadlock. When the stock
+    was allocated by another transaction in the meantime, the quantity left in it
+    is allocated and the rest is allocated in the next stocks.
+    If there is less quantity in stocks then rise InsufficientStock exception,
+    which rolls the updated stocks back.
+    """
+    check_reservations = is_reservation_enabled()
+    stocks_qs = (
+        Stock.objects.for_country_and_channel(country_code, channel_slug)
+        .filter(**filter_lookup)
+        .order_by("pk")
+    )
+    fields = ["product_variant", "pk", "quantity", "quantity_allocated"]
+    if check_reservations:
+        stocks_qs = stocks_qs.annotate_reserved_quantity()
+        fields.append("reserved_quantity")
+    stocks = list(stocks_qs.values(*fields))
+
+    quantity_reserved_for_stocks: Dict[int, int] = {}
+    quantity_available_for_stocks: Dict[int, int] = {}
+    for stock_data in stocks:
+        stock_pk = stock_data["pk"]
+        quantity_reserved_for_stocks[stock_pk] = stock_data.get("reserved_quantity", 0)
+        quantity_available_for_stocks[stock_pk] = (
+            stock_data["quantity"]
+            - stock_data["quantity_allocated"]
+            - quantity_reserved_for_stocks[stock_pk]
+        )
+
+    lines_info = list(order_lines_info)
+    quantity_left_for_lines = [line_info.quantity for line_info in lines_info]
+    variant_to_lines: Dict[int, List[int]] = defaultdict(list)
+    for index, line_info in enumerate(lines_info):
+        line_info.variant = cast(ProductVariant, line_info.variant)
+        variant_to_lines[line_info.variant.pk].append(index)
+
+    allocations: List[Allocation] = []
+    for stock_data in stocks:
+        stock_pk = stock_data["pk"]
+        line_indexes = [
+            index
+            for index in variant_to_lines[stock_data["product_variant"]]
+            if quantity_left_for_lines[index]
+        ]
+        quantity_required = sum(quantity_left_for_lines[i] for i in line_indexes)
+        quantity = min(quantity_required, quantity_available_for_stocks[stock_pk])
+        if quantity <= 0:
+            continue
+        result = _increase_stock_quantity_allocated(
+            stock_pk, quantity, check_reservations
+        )
+        if result is None:
+            # the stock was allocated by another transaction in the meantime,
+            # allocate the quantity which is still available in it
+            quantity = min(
+                quantity_required,
+                _get_stock_available_quantity_for_update(stock_pk, check_reservations),
+            )
+            if quantity > 0:
+                result = _increase_stock_quantity_allocated(
+                    stock_pk, quantity, check_reservations
+                )
+            if result is None:
+                quantity_available_for_stocks[stock_pk] = 0
+                continue
+
+        stock_quantity, stock_quantity_allocated = result
+        quantity_available_for_stocks[stock_pk] = (
+            stock_quantity
+            - stock_quantity_allocated
+            - quantity_reserved_for_stocks[stock_pk]
+        )
+        for index in line_indexes:
+            quantity_to_allocate = min(quantity_left_for_lines[index], quantity)
+            if quantity_to_allocate <= 0:
+                break
+            allocations.append(
+                Allocation(
+                    order_line=lines_info[index].line,
+                    stock_id=stock_pk,
+                    quantity_allocated=quantity_to_allocate,
                 )
+            )
+            quantity_left_for_lines[index] -= quantity_to_allocate
+            quantity -= quantity_to_allocate
+
+    insufficient_stock = [
+        InsufficientStockData(
+            variant=line_info.variant, order_line=line_info.line  # type: ignore
+        )
+        for line_info, quantity_left in zip(lines_info, quantity_left_for_lines)
+        if quantity_left
+    ]
+    if insufficient_stock:
+        raise InsufficientStock(insufficient_stock)
+
+    if allocations:
+        Allocation.objects.bulk_create(allocations)
+
+        out_of_stock_pks = {
+            allocation.stock_id
+            for allocation in allocations
+            if quantity_available_for_stocks[allocation.stock_id] <= 0
+        }
+        if out_of_stock_pks:
+            notify_stocks_on_commit(
+                manager.product_variant_out_of_stock,
+                Stock.objects.filter(pk__in=out_of_stock_pks),
+            )
+
+
+def _get_stock_available_quantity_for_update(
+    stock_pk: int, check_reservations: bool
+) -> int:
+    """Lock the stock and return its quantity that is not allocated nor reserved."""
+    stocks = Stock.objects.select_for_update().filter(pk=stock_pk)
+    fields = ["quantity", "quantity_allocated"]
+    if check_reservations:
+        stocks = stocks.annotate_reserved_quantity()
+        fields.append("reserved_quantity")
+    stock_data = stocks.values(*fields).first()
+    if stock_data is None:
+        return 0
+    return (
+        stock_data["quantity"]
+        - stock_data["quantity_allocated"]
+        - stock_data.get("reserved_quantity", 0)
+    )
+
+
+def _increase_stock_quantity_allocated(
+    stock_pk: int, quantity: int, check_reservations: bool
+) -> Optional[Tuple[int, int]]:
+    """Increase allocated quantity of the stock if enough quantity is available.
+
+    Return the quantity and the allocated quantity of the updated stock, or None
+    when the stock doesn't have enough available quantity.
+    """
+    stock_table = Stock._meta.db_table
+    available_quantity = "quantity - quantity_allocated"
+    params: Dict[str, Any] = {"pk": stock_pk, "quantity": quantity}
+    if check_reservations:
+        reservation_table = Reservation._meta.db_table
+        available_quantity += (
+            f" - COALESCE((SELECT SUM(quantity_reserved) FROM {reservation_table}"
+            f" WHERE stock_id = {stock_table}.id AND reserved_until > %(now)s), 0)"
+        )
+        params["now"] = timezone.now()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {stock_table}"
+            " SET quantity_allocated = quantity_allocated + %(quantity)s"
+            f" WHERE id = %(pk)s AND {available_quantity} >= %(quantity)s"
+            " RETURNING quantity, quantity_allocated",
+            params,
+        )
+        return cursor.fetchone()
 
 
 def _create_allocations(
@@ -134,6 +341,9 @@ def _create_allocations(
                     quantity_allocated=quantity_to_allocate,
                 )
             )
+            quantity_allocation_for_stocks[stock_data.pk] = (
+                quantity_allocated_in_stock + quantity_to_allocate
+            )
 
             quantity_allocated += quantity_to_allocate
             if quantity_allocated == quantity:
@@ -178,6 +388,7 @@ def deallocate_stock(
         line_to_allocations[allocation.order_line_id].append(allocation)
 
     allocations_to_update = []
+    stocks_quantity_allocated: Dict[int, int] = defaultdict(int)
     not_dellocated_lines = []
     for line_info in order_lines_data:
         order_line = line_info.line
@@ -194,6 +405,7 @@ def deallocate_stock(
                 )
                 quantity_dealocated += quantity_to_deallocate
                 allocations_to_update.append(allocation)
+                stocks_quantity_allocated[allocation.stock_id] -= quantity_to_deallocate
                 if quantity_dealocated == quantity:
                     break
         if not quantity_dealocated == quantity:
@@ -202,27 +414,24 @@ def deallocate_stock(
     if not_dellocated_lines:
         raise AllocationError(not_dellocated_lines)
 
-    allocations_before_update = list(
-        Allocation.objects.filter(
-            id__in=[a.id for a in allocations_to_update]
-        ).annotate_stock_available_quantity()
-    )
-
     Allocation.objects.bulk_update(allocations_to_update, ["quantity_allocated"])
-
-    for allocation_before_update in allocations_before_update:
-        available_stock_now = Allocation.objects.available_quantity_for_stock(
-            allocation_before_update.stock
-        )
-        if (
-            allocation_before_update.stock_available_quantity == 0
-            and available_stock_now > 0
-        ):
-            transaction.on_commit(
-                lambda: manager.product_variant_back_in_stock(
-                    allocation_before_update.stock
-                )
-            )
+    update_stocks_quantity_allocated(stocks_quantity_allocated)
+
+    # stocks are locked, so their quantities are the ones before the update
+    stocks = {
+        allocation.stock_id: allocation.stock for allocation in allocations_to_update
+    }
+    back_in_stock = [
+        stock
+        for stock in stocks.values()
+        if stock.quantity - stock.quantity_allocated <= 0
+        and stock.quantity
+        - stock.quantity_allocated
+        - stocks_quantity_allocated[stock.pk]
+        > 0
+    ]
+    if back_in_stock:
+        notify_stocks_on_commit(manager.product_variant_back_in_stock, back_in_stock)
 
 
 @traced_atomic_transaction()
@@ -262,6 +471,7 @@ def increase_stock(
             Allocation.objects.create(
                 order_line=order_line, stock=stock, quantity_allocated=quantity
             )
+        update_stocks_quantity_allocated({stock.pk: quantity})
 
 
 @traced_atomic_transaction()
@@ -278,9 +488,11 @@ def increase_allocations(
     # evaluate allocations query to trigger select_for_update lock
     allocation_pks_to_delete = [alloc.pk for alloc in allocations]
     allocation_quantity_map: Dict[int, list] = defaultdict(list)
+    stocks_quantity_allocated: Dict[int, int] = defaultdict(int)
 
     for alloc in allocations:
         allocation_quantity_map[alloc.order_line.pk].append(alloc.quantity_allocated)
+        stocks_quantity_allocated[alloc.stock_id] -= alloc.quantity_allocated
 
     for line_info in lines_info:
         allocated = sum(allocation_quantity_map[line_info.line.pk])
@@ -288,6 +500,7 @@ def increase_allocations(
         line_info.quantity += allocated
 
     Allocation.objects.filter(pk__in=allocation_pks_to_delete).delete()
+    update_stocks_quantity_allocated(stocks_quantity_allocated)
 
     allocate_stocks(
         lines_info,
@@ -324,9 +537,7 @@ def decrease_stock(
     try:
         deallocate_stock(order_lines_info, manager)
     except AllocationError as exc:
-        Allocation.objects.filter(order_line__in=exc.order_lines).update(
-            quantity_allocated=0
-        )
+        _clear_allocations(Allocation.objects.filter(order_line__in=exc.order_lines))
 
     stocks = (
         Stock.objects.select_for_update(of=("self",))
@@ -342,20 +553,9 @@ def decrease_stock(
             str(stock.warehouse_id)
         ] = stock
 
-    quantity_allocation_list = list(
-        Allocation.objects.filter(
-            stock__in=stocks,
-            quantity_allocated__gt=0,
-        )
-        .values("stock")
-        .annotate(Sum("quantity_allocated"))
-    )
-
-    quantity_allocation_for_stocks: Dict[int, int] = defaultdict(int)
-    for allocation in quantity_allocation_list:
-        quantity_allocation_for_stocks[allocation["stock"]] += allocation[
-            "quantity_allocated__sum"
-        ]
+    quantity_allocation_for_stocks: Dict[int, int] = {
+        stock.pk: stock.quantity_allocated for stock in stocks
+    }
     if update_stocks:
         _decrease_stocks_quantity(
             order_lines_info,
@@ -363,14 +563,11 @@ def decrease_stock(
             quantity_allocation_for_stocks,
         )
 
-        stock_ids = (s.id for s in stocks)
-        for stock in Stock.objects.filter(
-            id__in=stock_ids
-        ).annotate_available_quantity():
-            if stock.available_quantity <= 0:
-                transaction.on_commit(
-                    lambda: manager.product_variant_out_of_stock(stock)
-                )
+        out_of_stock = [
+            stock for stock in stocks if stock.quantity - stock.quantity_allocated <= 0
+        ]
+        if out_of_stock:
+            notify_stocks_on_commit(manager.product_variant_out_of_stock, out_of_stock)
 
 
 def _decrease_stocks_quantity(
@@ -432,10 +629,90 @@ def deallocate_stock_for_order(order: "Order", manager: PluginsManager):
         order_line__order=order, quantity_allocated__gt=0
     )
 
-    for allocation in allocations.annotate_stock_available_quantity():
-        if allocation.stock_available_quantity <= 0:
-            transaction.on_commit(
-                lambda: manager.product_variant_back_in_stock(allocation.stock)
-            )
+    back_in_stock = {
+        allocation.stock_id: allocation.stock
+        for allocation in allocations.select_related(
+            "stock"
+        ).annotate_stock_available_quantity()
+        if allocation.stock_available_quantity <= 0
+    }
+    if back_in_stock:
+        notify_stocks_on_commit(
+            manager.product_variant_back_in_stock, list(back_in_stock.values())
+        )
+
+    _clear_allocations(allocations)
+
+
+def notify_stocks_on_commit(notify: Callable[[Stock], Any], stocks: Iterable[Stock]):
+    """Call a plugin hook for each of the stocks after the transaction is committed.
 
+    Stocks are iterated in the callback, so a lazy queryset is evaluated outside
+    of the transaction.
+    """
+
+    def notify_stocks():
+        for stock in stocks:
+            notify(stock)
+
+    transaction.on_commit(notify_stocks)
+
+
+def _clear_allocations(allocations: QuerySet):
+    """Set allocated quantity of given allocations to zero."""
+    stocks_quantity_allocated: Dict[int, int] = defaultdict(int)
+    for stock_id, quantity_allocated in allocations.filter(
+        quantity_allocated__gt=0
+    ).values_list("stock_id", "quantity_allocated"):
+        stocks_quantity_allocated[stock_id] -= quantity_allocated
     allocations.update(quantity_allocated=0)
+    update_stocks_quantity_allocated(stocks_quantity_allocated)
+
+
+def update_stocks_quantity_allocated(stocks_quantity_allocated: Dict[int, int]):
+    """Change allocated quantity of stocks by given values, keyed by stock pk.
+
+    The values are added in a single query with an F() expression, so concurrent
+    changes of the same stock are not lost.
+    """
+    changes = {
+        stock_pk: quantity
+        for stock_pk, quantity in stocks_quantity_allocated.items()
+        if quantity
+    }
+    if not changes:
+        return
+    Stock.objects.filter(pk__in=changes.keys()).update(
+        quantity_allocated=F("quantity_allocated")
+        + Case(
+            *[
+                When(pk=stock_pk, then=Value(quantity))
+                for stock_pk, quantity in changes.items()
+            ],
+            output_field=IntegerField(),
+        )
+    )
+
+
+def recalculate_stocks_quantity_allocated(stocks: Optional[QuerySet] = None) -> int:
+    """Set allocated quantity of stocks to the sum of their allocations.
+
+    Return the number of stocks, which allocated quantity was out of sync.
+    """
+    if stocks is None:
+        stocks = Stock.objects.all()
+    allocated = Coalesce(
+        Subquery(
+            Allocation.objects.filter(stock_id=OuterRef("pk"))
+            .values("stock_id")
+            .annotate(quantity_allocated_sum=Sum("quantity_allocated"))
+            .values("quantity_allocated_sum"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+    return (
+        stocks.annotate(allocations_quantity=allocated)
+        .exclude(quantity_allocated=F("allocations_quantity"))
+        .update(quantity_allocated=allocated)
+    )
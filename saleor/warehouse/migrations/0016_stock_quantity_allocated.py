@@ -0,0 +1,33 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def update_stocks_quantity_allocated(apps, _schema_editor):
+    Stock = apps.get_model("warehouse", "Stock")
+    Allocation = apps.get_model("warehouse", "Allocation")
+    allocated = (
+        Allocation.objects.filter(stock_id=OuterRef("pk"))
+        .values("stock_id")
+        .annotate(quantity_allocated_sum=Sum("quantity_allocated"))
+        .values("quantity_allocated_sum")
+    )
+    Stock.objects.update(quantity_allocated=Coalesce(Subquery(allocated), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("warehouse", "0015_auto_20210713_0904"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="stock",
+            name="quantity_allocated",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(
+            update_stocks_quantity_allocated, migrations.RunPython.noop
+        ),
+    ]
@@ -1,16 +1,17 @@
 import itertools
 import uuid
-from typing import Set
+from typing import Optional, Set
 
 from django.db import models
 from django.db.models import Count, Exists, F, OuterRef, Prefetch, Q, Sum
 from django.db.models.expressions import Subquery
 from django.db.models.functions import Coalesce
 from django.db.models.query import QuerySet
+from django.utils import timezone
 
 from ..account.models import Address
 from ..channel.models import Channel
-from ..checkout.models import CheckoutLine
+from ..checkout.models import Checkout, CheckoutLine
 from ..core.models import ModelWithMetadata
 from ..order.models import OrderLine
 from ..product.models import Product, ProductVariant
@@ -133,16 +134,24 @@ class Warehouse(ModelWithMetadata):
 
 class StockQuerySet(models.QuerySet):
     def annotate_available_quantity(self):
-        return self.annotate(
-            available_quantity=F("quantity")
-            - Coalesce(
-                Sum(
-                    "allocations__quantity_allocated",
-                    filter=Q(allocations__quantity_allocated__gt=0),
-                ),
-                0,
-            )
+        return self.annotate(available_quantity=F("quantity") - F("quantity_allocated"))
+
+    def annotate_reserved_quantity(self, checkout: Optional[Checkout] = None):
+        """Annotate stocks with the quantity of not expired reservations.
+
+        Reservations of the given checkout are not included, so the checkout can
+        change the quantity of its own lines.
+        """
+        reservations = Reservation.objects.not_expired().filter(stock_id=OuterRef("pk"))
+        if checkout is not None:
+            reservations = reservations.exclude(checkout_line__checkout=checkout)
+        reserved_quantity = (
+            reservations.order_by()
+            .values("stock_id")
+            .annotate(quantity=Sum("quantity_reserved"))
+            .values("quantity")
         )
+        return self.annotate(reserved_quantity=Coalesce(Subquery(reserved_quantity), 0))
 
     def for_channel(self, channel_slug: str):
         ShippingZoneChannel = Channel.shipping_zones.through  # type: ignore
@@ -200,6 +209,8 @@ class Stock(models.Model):
         ProductVariant, null=False, on_delete=models.CASCADE, related_name="stocks"
     )
     quantity = models.PositiveIntegerField(default=0)
+    # sum of `Allocation.quantity_allocated` of the stock, updated with allocations
+    quantity_allocated = models.PositiveIntegerField(default=0)
 
     objects = models.Manager.from_queryset(StockQuerySet)()
 
@@ -223,17 +234,14 @@ class AllocationQueryset(models.QuerySet):
     def annotate_stock_available_quantity(self):
         return self.annotate(
             stock_available_quantity=F("stock__quantity")
-            - Coalesce(Sum("stock__allocations__quantity_allocated"), 0)
+            - F("stock__quantity_allocated")
         )
 
     def available_quantity_for_stock(self, stock: "Stock"):
-        allocated_quantity = (
-            self.filter(stock=stock).aggregate(Sum("quantity_allocated"))[
-                "quantity_allocated__sum"
-            ]
-            or 0
-        )
-        return max(stock.quantity - allocated_quantity, 0)
+        quantities = Stock.objects.filter(pk=stock.pk).values(
+            "quantity", "quantity_allocated"
+        )[0]
+        return max(quantities["quantity"] - quantities["quantity_allocated"], 0)
 
 
 class Allocation(models.Model):
@@ -258,3 +266,34 @@ class Allocation(models.Model):
     class Meta:
         unique_together = [["order_line", "stock"]]
         ordering = ("pk",)
+
+
+class ReservationQuerySet(models.QuerySet):
+    def not_expired(self):
+        return self.filter(reserved_until__gt=timezone.now())
+
+
+class Reservation(models.Model):
+    checkout_line = models.ForeignKey(
+        CheckoutLine,
+        null=False,
+        blank=False,
+        on_delete=models.CASCADE,
+        related_name="reservations",
+    )
+    stock = models.ForeignKey(
+        Stock,
+        null=False,
+        blank=False,
+        on_delete=models.CASCADE,
+        related_name="reservations",
+    )
+    quantity_reserved = models.PositiveIntegerField(default=0)
+    reserved_until = models.DateTimeField()
+
+    objects = models.Manager.from_queryset(ReservationQuerySet)()
+
+    class Meta:
+        unique_together = [["checkout_line", "stock"]]
+        ordering = ("pk",)
+        indexes = [models.Index(fields=["reserved_until"])]
@@ -0,0 +1,102 @@
+from collections import defaultdict
+from datetime import timedelta
+from typing import TYPE_CHECKING, Dict, Iterable, List
+
+from django.conf import settings
+from django.db.models import Sum
+from django.utils import timezone
+
+from ..core.exceptions import InsufficientStock, InsufficientStockData
+from ..core.tracing import traced_atomic_transaction
+from .models import Reservation, Stock
+
+if TYPE_CHECKING:
+    from ..checkout.models import CheckoutLine
+
+
+def is_reservation_enabled() -> bool:
+    return settings.RESERVE_STOCK_DURATION > 0
+
+
+def get_reservation_length() -> timedelta:
+    return timedelta(minutes=settings.RESERVE_STOCK_DURATION)
+
+
+@traced_atomic_transaction()
+def reserve_stocks(
+    checkout_lines: Iterable["CheckoutLine"], country_code: str, channel_slug: str
+):
+    """Reserve stocks for given `checkout_lines` in given country.
+
+    Previous reservations of the lines are replaced. Stocks are locked for update
+    and the quantity of each line is reserved in the first stocks with enough
+    quantity that is neither allocated nor reserved by other checkouts.
+    If there is less quantity available than required raise InsufficientStock
+    exception.
+    """
+    # reservations are only applied to lines with variants with track inventory
+    # set to True
+    checkout_lines = [line for line in checkout_lines if line.variant.track_inventory]
+    if not checkout_lines:
+        return
+
+    Reservation.objects.filter(checkout_line__in=checkout_lines).delete()
+
+    variants = [line.variant for line in checkout_lines]
+    stocks = list(
+        Stock.objects.select_for_update(of=("self",))
+        .for_country_and_channel(country_code, channel_slug)
+        .filter(product_variant__in=variants)
+        .order_by("pk")
+        .values("product_variant", "pk", "quantity", "quantity_allocated")
+    )
+    quantity_reserved_for_stocks: Dict[int, int] = dict(
+        Reservation.objects.not_expired()
+        .filter(stock_id__in=[stock["pk"] for stock in stocks])
+        .order_by()
+        .values("stock_id")
+        .annotate(quantity=Sum("quantity_reserved"))
+        .values_list("stock_id", "quantity")
+    )
+
+    variant_to_stocks: Dict[int, List[dict]] = defaultdict(list)
+    for stock in stocks:
+        variant_to_stocks[stock["product_variant"]].append(stock)
+
+    reserved_until = timezone.now() + get_reservation_length()
+    insufficient_stock: List[InsufficientStockData] = []
+    reservations: List[Reservation] = []
+    for line in checkout_lines:
+        quantity_to_reserve = line.quantity
+        for stock in variant_to_stocks[line.variant.pk]:
+            quantity_reserved = quantity_reserved_for_stocks.get(stock["pk"], 0)
+            quantity_available = (
+                stock["quantity"] - stock["quantity_allocated"] - quantity_reserved
+            )
+            quantity = min(quantity_to_reserve, quantity_available)
+            if quantity > 0:
+                reservations.append(
+                    Reservation(
+                        checkout_line=line,
+                        stock_id=stock["pk"],
+                        quantity_reserved=quantity,
+                        reserved_until=reserved_until,
+                    )
+                )
+                quantity_reserved_for_stocks[stock["pk"]] = quantity_reserved + quantity
+                quantity_to_reserve -= quantity
+            if not quantity_to_reserve:
+                break
+
+        if quantity_to_reserve:
+            insufficient_stock.append(
+                InsufficientStockData(
+                    variant=line.variant,
+                    available_quantity=line.quantity - quantity_to_reserve,
+                )
+            )
+
+    if insufficient_stock:
+        raise InsufficientStock(insufficient_stock)
+
+    Reservation.objects.bulk_create(reservations)
@@ -1,7 +1,9 @@
 from celery.utils.log import get_task_logger
+from django.conf import settings
+from django.utils import timezone
 
 from ..celeryconf import app
-from .models import Allocation
+from .models import Allocation, Reservation
 
 task_logger = get_task_logger(__name__)
 
@@ -11,3 +13,20 @@ def delete_empty_allocations_task():
     count, _ = Allocation.objects.filter(quantity_allocated=0).delete()
     if count:
         task_logger.debug("Removed %s allocations", count)
+
+
+@app.task
+def delete_expired_reservations_task():
+    batch_size = settings.EXPIRED_RESERVATIONS_DELETE_BATCH_SIZE
+    expired_reservations = Reservation.objects.filter(
+        reserved_until__lte=timezone.now()
+    )
+    total_count = 0
+    while True:
+        pks = list(expired_reservations.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            break
+        count, _ = Reservation.objects.filter(pk__in=pks).delete()
+        total_count += count
+    if total_count:
+        task_logger.debug("Removed %s expired reservations", total_count)
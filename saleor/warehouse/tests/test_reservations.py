@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+from ...checkout.models import Checkout
+from ...core.exceptions import InsufficientStock
+from ..models import Reservation
+from ..reservations import reserve_stocks
+from ..tasks import delete_expired_reservations_task
+
+COUNTRY_CODE = "US"
+
+
+@pytest.fixture
+def checkout_line_with_many_stocks(checkout, variant_with_many_stocks):
+    return checkout.lines.create(variant=variant_with_many_stocks, quantity=5)
+
+
+@pytest.fixture
+def other_checkout_line(channel_USD, variant_with_many_stocks):
+    checkout = Checkout.objects.create(
+        currency=channel_USD.currency_code, channel=channel_USD
+    )
+    return checkout.lines.create(variant=variant_with_many_stocks, quantity=1)
+
+
+@override_settings(RESERVE_STOCK_DURATION=10)
+def test_reserve_stocks(checkout_line_with_many_stocks, channel_USD):
+    # given
+    line = checkout_line_with_many_stocks
+    stocks = list(line.variant.stocks.order_by("pk"))
+
+    # when
+    reserve_stocks([line], COUNTRY_CODE, channel_USD.slug)
+
+    # then
+    reservations = line.reservations.order_by("stock_id")
+    assert [(r.stock, r.quantity_reserved) for r in reservations] == [
+        (stocks[0], 4),
+        (stocks[1], 1),
+    ]
+    reserved_until = timezone.now() + timedelta(minutes=10)
+    assert all(r.reserved_until <= reserved_until for r in reservations)
+
+
+@override_settings(RESERVE_STOCK_DURATION=10)
+def test_reserve_stocks_replaces_line_reservations(
+    checkout_line_with_many_stocks, channel_USD
+):
+    # given
+    line = checkout_line_with_many_stocks
+    reserve_stocks([line], COUNTRY_CODE, channel_USD.slug)
+    line.quantity = 2
+
+    # when
+    reserve_stocks([line], COUNTRY_CODE, channel_USD.slug)
+
+    # then
+    reservation = line.reservations.get()
+    assert reservation.quantity_reserved == 2
+
+
+@override_settings(RESERVE_STOCK_DURATION=10)
+def test_reserve_stocks_with_other_checkout_reservations(
+    checkout_line_with_many_stocks, other_checkout_line, channel_USD
+):
+    # given
+    reserve_stocks([other_checkout_line], COUNTRY_CODE, channel_USD.slug)
+    line = checkout_line_with_many_stocks
+    line.quantity = 7
+
+    # when
+    with pytest.raises(InsufficientStock) as exc:
+        reserve_stocks([line], COUNTRY_CODE, channel_USD.slug)
+
+    # then
+    assert exc.value.items[0].available_quantity == 6
+    assert not line.reservations.exists()
+
+
+@override_settings(RESERVE_STOCK_DURATION=10)
+def test_reserve_stocks_ignores_expired_reservations(
+    checkout_line_with_many_stocks, other_checkout_line, channel_USD
+):
+    # given
+    reserve_stocks([other_checkout_line], COUNTRY_CODE, channel_USD.slug)
+    other_checkout_line.reservations.update(reserved_until=timezone.now())
+    line = checkout_line_with_many_stocks
+    line.quantity = 7
+
+    # when
+    reserve_stocks([line], COUNTRY_CODE, channel_USD.slug)
+
+    # then
+    assert sum(r.quantity_reserved for r in line.reservations.all()) == 7
+
+
+@override_settings(RESERVE_STOCK_DURATION=10, EXPIRED_RESERVATIONS_DELETE_BATCH_SIZE=1)
+def test_delete_expired_reservations_task(
+    checkout_line_with_many_stocks, other_checkout_line, channel_USD
+):
+    # given
+    line = checkout_line_with_many_stocks
+    reserve_stocks([line, other_checkout_line], COUNTRY_CODE, channel_USD.slug)
+    line.reservations.update(reserved_until=timezone.now())
+
+    # when
+    delete_expired_reservations_task()
+
+    # then
+    assert not line.reservations.exists()
+    assert Reservation.objects.get().checkout_line == other_checkout_line
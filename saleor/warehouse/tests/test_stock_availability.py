@@ -1,4 +1,5 @@
 import pytest
+from django.test import override_settings
 
 from ...core.exceptions import InsufficientStock
 from ..availability import (
@@ -109,3 +110,58 @@ def test_check_stock_quantity_bulk_no_channel_shipping_zones(
         check_stock_quantity_bulk(
             [variant_with_many_stocks], country_code, [available_quantity], channel_USD
         )
+
+
+@override_settings(RESERVE_STOCK_DURATION=10)
+def test_check_stock_quantity_with_reservations(
+    variant_with_many_stocks, checkout_line_with_reservation_in_many_stocks, channel_USD
+):
+    with pytest.raises(InsufficientStock):
+        check_stock_quantity(
+            variant_with_many_stocks, COUNTRY_CODE, channel_USD.slug, 5
+        )
+
+
+@override_settings(RESERVE_STOCK_DURATION=10)
+def test_check_stock_quantity_with_own_reservations(
+    variant_with_many_stocks, checkout_line_with_reservation_in_many_stocks, channel_USD
+):
+    checkout = checkout_line_with_reservation_in_many_stocks.checkout
+    assert (
+        check_stock_quantity(
+            variant_with_many_stocks, COUNTRY_CODE, channel_USD.slug, 7, checkout
+        )
+        is None
+    )
+
+
+def test_check_stock_quantity_with_reservations_disabled(
+    variant_with_many_stocks, checkout_line_with_reservation_in_many_stocks, channel_USD
+):
+    assert (
+        check_stock_quantity(
+            variant_with_many_stocks, COUNTRY_CODE, channel_USD.slug, 7
+        )
+        is None
+    )
+
+
+@override_settings(RESERVE_STOCK_DURATION=10)
+def test_check_stock_quantity_bulk_with_reservations(
+    variant_with_many_stocks, checkout_line_with_reservation_in_many_stocks, channel_USD
+):
+    with pytest.raises(InsufficientStock) as exc:
+        check_stock_quantity_bulk(
+            [variant_with_many_stocks], COUNTRY_CODE, [5], channel_USD.slug
+        )
+
+    assert exc.value.items[0].available_quantity == 4
+
+    checkout = checkout_line_with_reservation_in_many_stocks.checkout
+    check_stock_quantity_bulk(
+        [variant_with_many_stocks],
+        COUNTRY_CODE,
+        [7],
+        channel_USD.slug,
+        checkout=checkout,
+    )
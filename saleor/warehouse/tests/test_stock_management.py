@@ -1,22 +1,27 @@
 from unittest import mock
 
 import pytest
+from django.core.management import call_command
 from django.db.models import Sum
 from django.db.models.functions import Coalesce
+from django.test import override_settings
 
 from ...core.exceptions import InsufficientStock
 from ...order import OrderLineData
 from ...order.models import OrderLine
 from ...plugins.manager import get_plugins_manager
+from ...product.models import ProductVariant
 from ...tests.utils import flush_post_commit_hooks
 from ...warehouse.models import Stock
 from ..management import (
+    _increase_stock_quantity_allocated,
     allocate_stocks,
     deallocate_stock,
     deallocate_stock_for_order,
     decrease_stock,
     increase_allocations,
     increase_stock,
+    recalculate_stocks_quantity_allocated,
 )
 from ..models import Allocation
 
@@ -35,7 +40,7 @@ def test_allocate_stocks(order_line, stock, channel_USD):
 
     stock.refresh_from_db()
     assert stock.quantity == 100
-    assert stock.quantity == 100
+    assert stock.quantity_allocated == 50
     allocation = Allocation.objects.get(order_line=order_line, stock=stock)
     assert allocation.quantity_allocated == 50
 
@@ -206,7 +211,8 @@ def test_allocate_stock_insufficient_stocks_for_multiple_lines(
 def test_deallocate_stock(allocation):
     stock = allocation.stock
     stock.quantity = 100
-    stock.save(update_fields=["quantity"])
+    stock.quantity_allocated = 80
+    stock.save(update_fields=["quantity", "quantity_allocated"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
 
@@ -221,6 +227,7 @@ def test_deallocate_stock(allocation):
 
     stock.refresh_from_db()
     assert stock.quantity == 100
+    assert stock.quantity_allocated == 0
     allocation.refresh_from_db()
     assert allocation.quantity_allocated == 0
 
@@ -228,7 +235,8 @@ def test_deallocate_stock(allocation):
 def test_deallocate_stock_partially(allocation):
     stock = allocation.stock
     stock.quantity = 100
-    stock.save(update_fields=["quantity"])
+    stock.quantity_allocated = 80
+    stock.save(update_fields=["quantity", "quantity_allocated"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
 
@@ -243,6 +251,7 @@ def test_deallocate_stock_partially(allocation):
 
     stock.refresh_from_db()
     assert stock.quantity == 100
+    assert stock.quantity_allocated == 30
     allocation.refresh_from_db()
     assert allocation.quantity_allocated == 30
 
@@ -280,7 +289,8 @@ def test_deallocate_stock_many_allocations_partially(
 def test_increase_stock_without_allocate(allocation):
     stock = allocation.stock
     stock.quantity = 100
-    stock.save(update_fields=["quantity"])
+    stock.quantity_allocated = 80
+    stock.save(update_fields=["quantity", "quantity_allocated"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
 
@@ -295,7 +305,8 @@ def test_increase_stock_without_allocate(allocation):
 def test_increase_stock_with_allocate(allocation):
     stock = allocation.stock
     stock.quantity = 100
-    stock.save(update_fields=["quantity"])
+    stock.quantity_allocated = 80
+    stock.save(update_fields=["quantity", "quantity_allocated"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
 
@@ -303,6 +314,7 @@ def test_increase_stock_with_allocate(allocation):
 
     stock.refresh_from_db()
     assert stock.quantity == 150
+    assert stock.quantity_allocated == 130
     allocation.refresh_from_db()
     assert allocation.quantity_allocated == 130
 
@@ -316,6 +328,7 @@ def test_increase_stock_with_new_allocation(order_line, stock):
 
     stock.refresh_from_db()
     assert stock.quantity == 150
+    assert stock.quantity_allocated == 50
     allocation = Allocation.objects.get(order_line=order_line, stock=stock)
     assert allocation.quantity_allocated == 50
 
@@ -331,8 +344,9 @@ def test_increase_allocations(quantity, allocation):
     )
     stock = allocation.stock
     stock.quantity = 100
-    stock.save(update_fields=["quantity"])
     initially_allocated = 80
+    stock.quantity_allocated = initially_allocated
+    stock.save(update_fields=["quantity", "quantity_allocated"])
     allocation.quantity_allocated = initially_allocated
     allocation.save(update_fields=["quantity_allocated"])
 
@@ -342,6 +356,7 @@ def test_increase_allocations(quantity, allocation):
 
     stock.refresh_from_db()
     assert stock.quantity == 100
+    assert stock.quantity_allocated == initially_allocated + quantity
     assert (
         order_line.allocations.all().aggregate(Sum("quantity_allocated"))[
             "quantity_allocated__sum"
@@ -360,8 +375,9 @@ def test_increase_allocation_insufficient_stock(allocation):
     )
     stock = allocation.stock
     stock.quantity = 100
-    stock.save(update_fields=["quantity"])
     initially_allocated = 80
+    stock.quantity_allocated = initially_allocated
+    stock.save(update_fields=["quantity", "quantity_allocated"])
     allocation.quantity_allocated = initially_allocated
     allocation.save(update_fields=["quantity_allocated"])
 
@@ -401,7 +417,8 @@ def test_increase_stock_with_back_in_stock_webhook_triggered_without_allocation(
 def test_decrease_stock(allocation):
     stock = allocation.stock
     stock.quantity = 100
-    stock.save(update_fields=["quantity"])
+    stock.quantity_allocated = 80
+    stock.save(update_fields=["quantity", "quantity_allocated"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
     warehouse_pk = allocation.stock.warehouse.pk
@@ -420,6 +437,7 @@ def test_decrease_stock(allocation):
 
     stock.refresh_from_db()
     assert stock.quantity == 50
+    assert stock.quantity_allocated == 30
     allocation.refresh_from_db()
     assert allocation.quantity_allocated == 30
 
@@ -428,7 +446,8 @@ def test_decrease_stock(allocation):
 def test_decrease_stock_without_stock_update(quantity, expected_allocated, allocation):
     stock = allocation.stock
     stock.quantity = 100
-    stock.save(update_fields=["quantity"])
+    stock.quantity_allocated = 80
+    stock.save(update_fields=["quantity", "quantity_allocated"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
     warehouse_pk = allocation.stock.warehouse.pk
@@ -466,6 +485,7 @@ def test_decrease_stock_multiple_lines(allocations):
     allocation_2.quantity_allocated = 80
     allocation_2.save(update_fields=["quantity_allocated"])
     warehouse_pk_2 = allocation_2.stock.warehouse.pk
+    recalculate_stocks_quantity_allocated()
 
     decrease_stock(
         [
@@ -494,7 +514,8 @@ def test_decrease_stock_multiple_lines(allocations):
 def test_decrease_stock_partially(allocation):
     stock = allocation.stock
     stock.quantity = 100
-    stock.save(update_fields=["quantity"])
+    stock.quantity_allocated = 80
+    stock.save(update_fields=["quantity", "quantity_allocated"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
     warehouse_pk = allocation.stock.warehouse.pk
@@ -600,7 +621,8 @@ def test_decrease_stock_more_then_allocated(
 def test_decrease_stock_insufficient_stock(allocation):
     stock = allocation.stock
     stock.quantity = 20
-    stock.save(update_fields=["quantity"])
+    stock.quantity_allocated = 80
+    stock.save(update_fields=["quantity", "quantity_allocated"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
     warehouse_pk = allocation.stock.warehouse.pk
@@ -635,6 +657,7 @@ def test_deallocate_stock_for_order(
     allocations = order_line.allocations.all()
     assert allocations[0].quantity_allocated == 0
     assert allocations[1].quantity_allocated == 0
+    assert not order_line.variant.stocks.filter(quantity_allocated__gt=0).exists()
 
 
 @mock.patch("saleor.plugins.manager.PluginsManager.product_variant_back_in_stock")
@@ -677,7 +700,8 @@ def test_decrease_stock_with_out_of_stock_webhook_triggered(
 ):
     stock = allocation.stock
     stock.quantity = 50
-    stock.save(update_fields=["quantity"])
+    stock.quantity_allocated = 50
+    stock.save(update_fields=["quantity", "quantity_allocated"])
     allocation.quantity_allocated = 50
     allocation.save(update_fields=["quantity_allocated"])
     warehouse_pk = allocation.stock.warehouse.pk
@@ -697,3 +721,286 @@ def test_decrease_stock_with_out_of_stock_webhook_triggered(
     flush_post_commit_hooks()
 
     product_variant_out_of_stock_webhook_mock.assert_called_once()
+
+
+@mock.patch("saleor.plugins.manager.PluginsManager.product_variant_out_of_stock")
+def test_allocate_stocks_with_out_of_stock_webhook_triggered(
+    product_variant_out_of_stock_webhook_mock,
+    order_line,
+    variant_with_many_stocks,
+    channel_USD,
+):
+    # given
+    stocks = list(variant_with_many_stocks.stocks.all())
+    quantity = sum(stock.quantity for stock in stocks)
+    line_data = OrderLineData(
+        line=order_line, variant=order_line.variant, quantity=quantity
+    )
+
+    # when
+    allocate_stocks(
+        [line_data], COUNTRY_CODE, channel_USD.slug, manager=get_plugins_manager()
+    )
+    flush_post_commit_hooks()
+
+    # then
+    notified_stocks = [
+        call.args[0]
+        for call in product_variant_out_of_stock_webhook_mock.call_args_list
+    ]
+    assert sorted(notified_stocks, key=lambda stock: stock.pk) == stocks
+
+
+def test_allocate_stocks_multiple_lines_with_the_same_variant(
+    order_line, variant_with_many_stocks, channel_USD
+):
+    # given
+    quantity = sum(stock.quantity for stock in variant_with_many_stocks.stocks.all())
+    order_line_2 = OrderLine.objects.get(pk=order_line.pk)
+    order_line_2.pk = None
+    order_line_2.save()
+    lines_data = [
+        OrderLineData(line=line, variant=line.variant, quantity=quantity)
+        for line in [order_line, order_line_2]
+    ]
+
+    # when
+    with pytest.raises(InsufficientStock):
+        allocate_stocks(
+            lines_data, COUNTRY_CODE, channel_USD.slug, manager=get_plugins_manager()
+        )
+
+    # then
+    assert not Allocation.objects.filter(
+        order_line__in=[order_line, order_line_2]
+    ).exists()
+
+
+@mock.patch("saleor.plugins.manager.PluginsManager.product_variant_back_in_stock")
+def test_deallocate_stock_with_back_in_stock_webhook_triggered(
+    product_variant_back_in_stock_webhook_mock,
+    order_line_with_allocation_in_many_stocks,
+):
+    # given
+    order_line = order_line_with_allocation_in_many_stocks
+    stocks = list(order_line.variant.stocks.order_by("pk"))
+    for stock in stocks:
+        stock.quantity = stock.quantity_allocated
+    Stock.objects.bulk_update(stocks, ["quantity"])
+
+    # when
+    deallocate_stock(
+        [OrderLineData(line=order_line, quantity=3, variant=order_line.variant)],
+        manager=get_plugins_manager(),
+    )
+    flush_post_commit_hooks()
+
+    # then
+    notified_stocks = [
+        call.args[0]
+        for call in product_variant_back_in_stock_webhook_mock.call_args_list
+    ]
+    assert sorted(notified_stocks, key=lambda stock: stock.pk) == stocks
+
+
+def test_recalculate_stocks_quantity_allocated(allocation):
+    # given
+    stock = allocation.stock
+    stock.quantity_allocated = 100
+    stock.save(update_fields=["quantity_allocated"])
+
+    # when
+    updated_count = recalculate_stocks_quantity_allocated()
+
+    # then
+    stock.refresh_from_db()
+    assert updated_count == 1
+    assert stock.quantity_allocated == allocation.quantity_allocated
+    assert recalculate_stocks_quantity_allocated() == 0
+
+
+def test_recalculate_stocks_quantity_allocated_without_allocations(stock):
+    # given
+    stock.quantity_allocated = 10
+    stock.save(update_fields=["quantity_allocated"])
+
+    # when
+    recalculate_stocks_quantity_allocated()
+
+    # then
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == 0
+
+
+def test_update_stocks_quantity_allocated_command(allocation):
+    # given
+    stock = allocation.stock
+    stock.quantity_allocated = 0
+    stock.save(update_fields=["quantity_allocated"])
+
+    # when
+    call_command("update_stocks_quantity_allocated")
+
+    # then
+    stock.refresh_from_db()
+    assert stock.quantity_allocated == allocation.quantity_allocated
+
+
+@override_settings(LOCK_FREE_STOCK_ALLOCATION=True)
+def test_allocate_stocks_without_locks(
+    order_line, variant_with_many_stocks, channel_USD
+):
+    # given
+    stocks = list(variant_with_many_stocks.stocks.order_by("pk"))
+    line_data = OrderLineData(line=order_line, variant=order_line.variant, quantity=5)
+
+    # when
+    allocate_stocks(
+        [line_data], COUNTRY_CODE, channel_USD.slug, manager=get_plugins_manager()
+    )
+
+    # then
+    allocations = Allocation.objects.filter(order_line=order_line).order_by("stock")
+    assert [
+        (allocation.stock, allocation.quantity_allocated) for allocation in allocations
+    ] == [(stocks[0], 4), (stocks[1], 1)]
+    for stock in stocks:
+        stock.refresh_from_db()
+    assert [stock.quantity_allocated for stock in stocks] == [4, 1]
+
+
+@override_settings(LOCK_FREE_STOCK_ALLOCATION=True)
+def test_allocate_stocks_without_locks_insufficient_stocks(
+    order_line, order_line_with_allocation_in_many_stocks, channel_USD
+):
+    # given
+    stocks = list(order_line.variant.stocks.order_by("pk"))
+    line_data = OrderLineData(line=order_line, variant=order_line.variant, quantity=5)
+
+    # when
+    with pytest.raises(InsufficientStock):
+        allocate_stocks(
+            [line_data], COUNTRY_CODE, channel_USD.slug, manager=get_plugins_manager()
+        )
+
+    # then
+    assert not Allocation.objects.filter(order_line=order_line).exists()
+    for stock in stocks:
+        stock.refresh_from_db()
+    assert [stock.quantity_allocated for stock in stocks] == [2, 1]
+
+
+@override_settings(LOCK_FREE_STOCK_ALLOCATION=True)
+def test_allocate_stocks_without_locks_after_concurrent_allocation(
+    order_line, variant_with_many_stocks, channel_USD
+):
+    # given
+    stocks = list(variant_with_many_stocks.stocks.order_by("pk"))
+    line_data = OrderLineData(line=order_line, variant=order_line.variant, quantity=3)
+    increase_stock_quantity_allocated = _increase_stock_quantity_allocated
+    concurrent_allocations = {stocks[0].pk: 2}
+
+    def allocate_after_concurrent_allocation(stock_pk, quantity, check_reservations):
+        if stock_pk in concurrent_allocations:
+            # allocation of another order committed after stocks were read
+            Stock.objects.filter(pk=stock_pk).update(
+                quantity_allocated=concurrent_allocations.pop(stock_pk)
+            )
+        return increase_stock_quantity_allocated(stock_pk, quantity, check_reservations)
+
+    # when
+    with mock.patch(
+        "saleor.warehouse.management._increase_stock_quantity_allocated",
+        side_effect=allocate_after_concurrent_allocation,
+    ):
+        allocate_stocks(
+            [line_data], COUNTRY_CODE, channel_USD.slug, manager=get_plugins_manager()
+        )
+
+    # then
+    allocations = Allocation.objects.filter(order_line=order_line).order_by("stock")
+    assert [
+        (allocation.stock, allocation.quantity_allocated) for allocation in allocations
+    ] == [(stocks[0], 2), (stocks[1], 1)]
+    for stock in stocks:
+        stock.refresh_from_db()
+    assert [stock.quantity_allocated for stock in stocks] == [4, 1]
+
+
+@override_settings(LOCK_FREE_STOCK_ALLOCATION=True)
+def test_allocate_stocks_without_locks_updates_stocks_in_pk_order(
+    order_line, variant_with_many_stocks, channel_USD
+):
+    # given
+    stocks = list(variant_with_many_stocks.stocks.order_by("pk"))
+    variant_2 = ProductVariant.objects.create(
+        product=variant_with_many_stocks.product, sku="SKU_2"
+    )
+    stock_2 = Stock.objects.create(
+        warehouse=stocks[0].warehouse, product_variant=variant_2, quantity=5
+    )
+    order_line_2 = OrderLine.objects.get(pk=order_line.pk)
+    order_line_2.pk = None
+    order_line_2.variant = variant_2
+    order_line_2.save()
+    # the line of the stock with the highest pk goes first
+    lines_data = [
+        OrderLineData(line=order_line_2, variant=variant_2, quantity=2),
+        OrderLineData(line=order_line, variant=order_line.variant, quantity=5),
+    ]
+
+    # when
+    with mock.patch(
+        "saleor.warehouse.management._increase_stock_quantity_allocated",
+        wraps=_increase_stock_quantity_allocated,
+    ) as increase_stock_quantity_allocated_mock:
+        allocate_stocks(
+            lines_data, COUNTRY_CODE, channel_USD.slug, manager=get_plugins_manager()
+        )
+
+    # then
+    updated_stock_pks = [
+        call.args[0] for call in increase_stock_quantity_allocated_mock.call_args_list
+    ]
+    assert updated_stock_pks == [stocks[0].pk, stocks[1].pk, stock_2.pk]
+    stock_2.refresh_from_db()
+    assert stock_2.quantity_allocated == 2
+
+
+@override_settings(LOCK_FREE_STOCK_ALLOCATION=True, RESERVE_STOCK_DURATION=5)
+def test_allocate_stocks_without_locks_with_reservations(
+    order_line, checkout_line_with_reservation_in_many_stocks, channel_USD
+):
+    # given
+    line_data = OrderLineData(line=order_line, variant=order_line.variant, quantity=5)
+
+    # when
+    with pytest.raises(InsufficientStock):
+        allocate_stocks(
+            [line_data], COUNTRY_CODE, channel_USD.slug, manager=get_plugins_manager()
+        )
+
+    # then
+    assert not Allocation.objects.filter(order_line=order_line).exists()
+
+
+@override_settings(LOCK_FREE_STOCK_ALLOCATION=True)
+@mock.patch("saleor.plugins.manager.PluginsManager.product_variant_out_of_stock")
+def test_allocate_stocks_without_locks_with_out_of_stock_webhook_triggered(
+    product_variant_out_of_stock_webhook_mock,
+    order_line,
+    variant_with_many_stocks,
+    channel_USD,
+):
+    # given
+    stocks = list(variant_with_many_stocks.stocks.order_by("pk"))
+    line_data = OrderLineData(line=order_line, variant=order_line.variant, quantity=5)
+
+    # when
+    allocate_stocks(
+        [line_data], COUNTRY_CODE, channel_USD.slug, manager=get_plugins_manager()
+    )
+    flush_post_commit_hooks()
+
+    # then
+    product_variant_out_of_stock_webhook_mock.assert_called_once_with(stocks[0])